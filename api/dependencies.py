@@ -0,0 +1,33 @@
+"""
+FastAPI dependencies shared by the routes.
+
+Kept out of database/ so the DB layer, which the Celery worker and the
+CLI scripts import, doesn't depend on the web framework.
+"""
+from collections.abc import Generator
+from fastapi import Request
+from sqlalchemy.orm import Session
+from database.db import READ_METHODS, get_read_session, get_session_no_commit
+
+
+def get_db(request: Request) -> Generator[Session]:
+    """
+    Dependency for FastAPI routes to get a database session.
+
+    GET and HEAD requests get a replica session (see get_read_session),
+    every other method the primary, so writes never reach the replica.
+
+    Usage in FastAPI:
+        @app.get("/items/")
+        def read_items(db: Session = Depends(get_db)):
+            items = db.query(Item).all()
+            return items
+    Yields:
+        Session: Database session
+    """
+    if request.method in READ_METHODS:
+        with get_read_session() as session:
+            yield session
+    else:
+        with get_session_no_commit() as session:
+            yield session
@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from config import get_settings
-from api.routes import sources, articles, ingestion
+from api.routes import sources, articles, ingestion, stories
 from auth import routes as auth_routes
 
 settings = get_settings()
@@ -19,6 +19,7 @@ def read_root():
 # Include API routes
 app.include_router(sources.router)
 app.include_router(articles.router)
+app.include_router(stories.router)
 app.include_router(ingestion.router)
 app.include_router(auth_routes.router)
 
@@ -1,31 +1,131 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from database import utils as db_utils
-from typing import Optional
-from database.schemas import ArticleResponse, ArticleDetail, SourceStats
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+from database.schemas import (
+    ArticleResponse,
+    ArticleDetail,
+    SourceStats,
+    DuplicatePair,
+    SearchResult,
+    SimilarArticle,
+    TimelinePoint,
+)
 from sqlalchemy.orm import Session
-from database.db import get_db
+from api.dependencies import get_db
+from database.pagination import NEXT_CURSOR_HEADER, decode_cursor, decode_search_cursor, encode_search_cursor, paginate
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 @router.get("/", response_model=list[ArticleResponse], status_code=200)
-def get_articles(limit: int =  Query(default=20, ge=1, le=500), 
+def get_articles(response: Response,
+                 limit: int =  Query(default=20, ge=1, le=500), 
                  days: int = Query(default=7, ge=1, le=30), 
                  source_name: str | None = None, 
+                 title_like: str | None = Query(default=None, min_length=3, max_length=200,
+                                                description="Part of the title, typos allowed (best match first)"),
+                 author: str | None = Query(default=None, min_length=3, max_length=200,
+                                            description="Author name, typos allowed (best match first)"),
+                 cursor: str | None = Query(default=None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
                  db: Session = Depends(get_db)):
     
-    """Endpoint to retrieve all articles."""
-    if not source_name:
-        return db_utils.get_recent_articles(db, limit)
+    """Endpoint to retrieve all articles, newest first (or best match first with title_like/author), one page at a time."""
+    fuzzy = bool(title_like or author)
+    try:
+        if cursor:
+            after = decode_search_cursor(cursor) if fuzzy else decode_cursor(cursor)
+        else:
+            after = None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # One extra row tells whether there is a next page
+    cursor_for = None
+    if fuzzy:
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days) if source_name else None
+        articles = db_utils.lookup_articles(db, title_like, author, limit + 1, after, source_name, since)
+        cursor_for = lambda row: encode_search_cursor(row['similarity'], row['id'])
+    elif not source_name:
+        articles = db_utils.get_recent_articles(db, limit + 1, after)
     else:
-        return db_utils.get_articles_by_source(db, source_name, days, limit)
+        articles = db_utils.get_articles_by_source(db, source_name, days, limit + 1, after)
+
+    articles, next_cursor = paginate(articles, limit, cursor_for)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return articles
     
     
+@router.get("/search", response_model=list[SearchResult])
+def search_articles(response: Response,
+                    q: str = Query(min_length=1, max_length=200, description='Words, "quoted phrases", OR, -excluded'),
+                    limit: int = Query(default=20, ge=1, le=100),
+                    source_name: str | None = None,
+                    political_leaning: str | None = None,
+                    published_after: datetime | None = None,
+                    published_before: datetime | None = None,
+                    sort: Literal['relevance', 'newest'] = 'relevance',
+                    cursor: str | None = Query(default=None, description=f"Value of the previous page's {NEXT_CURSOR_HEADER} header"),
+                    db: Session = Depends(get_db)):
+    """Endpoint to search articles by title, description and content, best match or newest first."""
+    by_relevance = sort == 'relevance'
+    try:
+        if cursor:
+            after = decode_search_cursor(cursor) if by_relevance else decode_cursor(cursor)
+        else:
+            after = None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # One extra row tells whether there is a next page
+    results = db_utils.search_articles(
+        db, q, limit + 1, after, source_name,
+        political_leaning.lower() if political_leaning else None,
+        published_after, published_before, sort,
+    )
+
+    cursor_for = (lambda row: encode_search_cursor(row['rank'], row['id'])) if by_relevance else None
+    results, next_cursor = paginate(results, limit, cursor_for)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return results
+
+
 @router.get("/stats", response_model=list[SourceStats])
 def get_article_stats(db: Session = Depends(get_db)):
     """Endpoint to retrieve article statistics."""
     return db_utils.get_source_stats(db)
 
 
+@router.get("/timeline", response_model=list[TimelinePoint])
+def get_article_timeline(granularity: Literal['hour', 'day'] = 'day',
+                         days: int = Query(default=7, ge=1, le=365),
+                         source_name: str | None = None,
+                         db: Session = Depends(get_db)):
+    """Endpoint to retrieve the number of articles published per hour or day."""
+    return db_utils.get_article_timeline(db, granularity, days, source_name)
+
+
+@router.get("/duplicates", response_model=list[DuplicatePair])
+def get_duplicate_articles(days: int = Query(default=7, ge=1, le=30),
+                           min_similarity: float | None = Query(default=None, ge=0, le=1),
+                           limit: int = Query(default=100, ge=1, le=500),
+                           db: Session = Depends(get_db)):
+    """Endpoint to retrieve near-duplicate article pairs, most similar first."""
+    return db_utils.get_near_duplicate_pairs(db, days, min_similarity, limit)
+
+
+@router.get("/{article_id}/similar", response_model=list[SimilarArticle])
+def get_similar_articles(article_id: int,
+                         limit: int = Query(default=20, ge=1, le=100),
+                         db: Session = Depends(get_db)):
+    """Endpoint to retrieve the near-duplicates of a specific article."""
+    similar = db_utils.get_similar_articles(db, article_id, limit)
+    if not similar and not db_utils.get_article_by_id(db, article_id):
+        raise HTTPException(status_code=404, detail="Article not found")
+    return similar
+
+
 @router.get("/{article_id}", response_model=ArticleDetail, status_code=200)
 def get_article(article_id: int, db: Session = Depends(get_db)):
     """Endpoint to retrieve a specific article by ID."""
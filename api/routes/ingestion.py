@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from ingestion import feed_parser as fp, validate_feeds as vf
-from database.schemas import SourceResponse, SourceCreate, SourceUpdate, ScrapeResponse
+from database.schemas import SourceResponse, SourceCreate, SourceUpdate, ScrapeResponse, SourceBulkCreate, SourceBulkResponse
 from database import utils as db_utils
 from sqlalchemy.orm import Session
-from database.db import get_db
+from api.dependencies import get_db
+from database.urls import normalize_url
 from worker.tasks import scrape_all_sources_task, scrape_source_by_id_task
 from auth.dependencies import get_current_user
 
@@ -43,11 +44,69 @@ def create_source(source_data: SourceCreate, background_tasks: BackgroundTasks,
     return {"message": f"Source {new_source['name']} added successfully", "status": "created"}
 
 
-
-
-
-
-
-
-
-
+@router.post("/sources/bulk", status_code=201, response_model=SourceBulkResponse)
+def create_sources_bulk(payload: SourceBulkCreate, db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """
+    Endpoint to validate and create many sources in one transaction.
+    
+    Feed URLs are checked concurrently; sources with a taken or repeated
+    name or feed URL, or (unless validate_feeds is false) a broken feed,
+    are returned in `rejected` and everything else is inserted together.
+    """
+    rejected = []
+    candidates = []
+    seen_names = set()
+    seen_urls = set()
+    taken = db_utils.get_existing_source_names(db, [s.name for s in payload.sources])
+    taken_urls = db_utils.get_existing_source_urls(db, [s.url for s in payload.sources])
+    # Nothing is written yet: end the lookups' transaction, or the pooled
+    # connection would sit idle in transaction through check_feeds (minutes
+    # for hundreds of slow feeds). A name taken meanwhile is still caught by
+    # create_sources' ON CONFLICT below.
+    db.rollback()
+
+    for source in payload.sources:
+        url_key = normalize_url(source.url)
+        if source.name in taken:
+            reason = "Name already exists"
+        elif source.url in taken_urls:
+            reason = "URL already exists"
+        elif source.name in seen_names:
+            reason = "Duplicate name in request"
+        elif url_key in seen_urls:
+            reason = "Duplicate URL in request"
+        else:
+            seen_names.add(source.name)
+            seen_urls.add(url_key)
+            candidates.append(source.model_dump())
+            continue
+        rejected.append({'name': source.name, 'url': source.url, 'reason': reason})
+
+    if payload.validate_feeds and candidates:
+        checks = vf.check_feeds([source['url'] for source in candidates])
+        valid = []
+        for source, check in zip(candidates, checks):
+            if check['valid']:
+                valid.append(source)
+            else:
+                rejected.append({
+                    'name': source['name'],
+                    'url': source['url'],
+                    'reason': check['reason'],
+                    'latency_ms': check['latency_ms'],
+                })
+        candidates = valid
+
+    created = db_utils.create_sources(db, candidates) if candidates else []
+    db.commit()
+
+    # Names taken by a concurrent request between the check and the insert
+    created_names = {source['name'] for source in created}
+    for source in candidates:
+        if source['name'] not in created_names:
+            rejected.append({'name': source['name'], 'url': source['url'], 'reason': "Name already exists"})
+
+    for source in created:
+        vf.log_source_creation(source)
+
+    return {'created': created, 'rejected': rejected}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from database import utils as db_utils
 from database.schemas import SourceResponse, SourceCreate, SourceUpdate
 from sqlalchemy.orm import Session
-from database.db import get_db
+from api.dependencies import get_db
 
 router = APIRouter(prefix="/sources", tags=["Sources"])
 
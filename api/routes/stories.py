@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, Query
+from database import utils as db_utils
+from database.schemas import StoryResponse
+from sqlalchemy.orm import Session
+from api.dependencies import get_db
+
+router = APIRouter(prefix="/stories", tags=["Stories"])
+
+
+@router.get("/", response_model=list[StoryResponse], status_code=200)
+def get_stories(days: int = Query(default=2, ge=1, le=30),
+                min_sources: int = Query(default=2, ge=1, le=50),
+                limit: int = Query(default=50, ge=1, le=200),
+                db: Session = Depends(get_db)):
+    """Endpoint to retrieve recent stories with the sources that covered them."""
+    return db_utils.get_stories(db, days, min_sources, limit)
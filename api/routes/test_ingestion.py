@@ -0,0 +1,103 @@
+"""Test bulk source onboarding (POST /ingestion/sources/bulk) without a database."""
+from sqlalchemy.dialects import postgresql
+import pytest
+from api.routes import ingestion
+from database.schemas import SourceBulkCreate
+from database.utils import create_sources
+
+
+class FakeSession:
+    def __init__(self, events=None):
+        self.events = [] if events is None else events
+
+    def commit(self):
+        self.events.append('commit')
+
+    def rollback(self):
+        self.events.append('rollback')
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """Existing sources, and create_sources that skips names already taken (as ON CONFLICT does)."""
+    existing = {'BBC News': 'https://feeds.bbci.co.uk/news/rss.xml'}
+    inserted = []
+
+    def fake_create_sources(db, sources):
+        created = []
+        for n, source in enumerate(sources, 100):
+            if source['name'] in existing:
+                continue
+            existing[source['name']] = source['url']
+            created.append({'id': n, **source})
+        inserted.extend(sources)
+        return created
+
+    monkeypatch.setattr(ingestion.db_utils, 'get_existing_source_names',
+                        lambda db, names: {name for name in names if name in existing})
+    monkeypatch.setattr(ingestion.db_utils, 'get_existing_source_urls',
+                        lambda db, urls: {url for url in urls if url in existing.values()})
+    monkeypatch.setattr(ingestion.db_utils, 'create_sources', fake_create_sources)
+    monkeypatch.setattr(ingestion.vf, 'check_feeds', lambda urls: [{'valid': True} for _ in urls])
+    return {'existing': existing, 'inserted': inserted}
+
+
+def bulk(*sources, validate_feeds=False, db=None):
+    payload = SourceBulkCreate(sources=[{'name': name, 'url': url} for name, url in sources],
+                               validate_feeds=validate_feeds)
+    return ingestion.create_sources_bulk(payload, db or FakeSession(), current_user={'id': 1})
+
+
+def reasons(result):
+    return {source['name']: source['reason'] for source in result['rejected']}
+
+
+def test_duplicates_in_request_are_rejected(stored):
+    result = bulk(
+        ('Reuters', 'https://feeds.reuters.com/world'),
+        ('Reuters', 'https://feeds.reuters.com/business'),
+        ('Reuters World', 'https://FEEDS.reuters.com/world'),   # Same feed, different spelling
+    )
+    assert [source['name'] for source in result['created']] == ['Reuters']
+    assert reasons(result) == {'Reuters': "Duplicate name in request", 'Reuters World': "Duplicate URL in request"}
+    assert len(stored['inserted']) == 1
+
+
+def test_existing_names_and_urls_are_rejected(stored):
+    result = bulk(
+        ('BBC News', 'https://example.com/bbc'),
+        ('BBC World', 'https://feeds.bbci.co.uk/news/rss.xml'),
+        ('AP', 'https://feeds.apnews.com/top'),
+    )
+    assert [source['name'] for source in result['created']] == ['AP']
+    assert reasons(result) == {'BBC News': "Name already exists", 'BBC World': "URL already exists"}
+
+
+def test_name_taken_concurrently_is_rejected_not_an_error(stored, monkeypatch):
+    # The name check passes, then another request inserts the same name before ours
+    monkeypatch.setattr(ingestion.db_utils, 'get_existing_source_names', lambda db, names: set())
+    result = bulk(('BBC News', 'https://example.com/bbc-mirror'), ('AP', 'https://feeds.apnews.com/top'))
+    assert [source['name'] for source in result['created']] == ['AP']
+    assert reasons(result) == {'BBC News': "Name already exists"}
+
+
+def test_no_transaction_is_held_while_feeds_are_checked(stored, monkeypatch):
+    events = []
+    monkeypatch.setattr(ingestion.vf, 'check_feeds',
+                        lambda urls: events.append('check_feeds') or [{'valid': True} for _ in urls])
+    result = bulk(('AP', 'https://feeds.apnews.com/top'), validate_feeds=True, db=FakeSession(events))
+    assert [source['name'] for source in result['created']] == ['AP']
+    assert events == ['rollback', 'check_feeds', 'commit']
+
+
+def test_create_sources_skips_conflicting_names():
+    class RecordingSession:
+        def execute(self, statement):
+            self.sql = str(statement.compile(dialect=postgresql.dialect()))
+            raise RuntimeError("stop")
+
+    db = RecordingSession()
+    with pytest.raises(RuntimeError):
+        create_sources(db, [{'name': 'AP', 'url': 'https://feeds.apnews.com/top'}])
+    assert 'ON CONFLICT (name) DO NOTHING' in db.sql
+    assert 'RETURNING sources.id' in db.sql
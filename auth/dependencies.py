@@ -2,7 +2,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from auth.jwt_handler import verify_access_token
 from database import utils as db_utils
-from database.db import get_db
+from api.dependencies import get_db
 from sqlalchemy.orm import Session
 from config import get_settings
 import logging
@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from database import utils as db_utils
 from auth.schemas import UserCreate, UserResponse, TokenResponse
 from sqlalchemy.orm import Session
-from database.db import get_db
+from api.dependencies import get_db
 from auth.jwt_handler import create_access_token
 from auth.utils import hash_password, authenticate_user
 
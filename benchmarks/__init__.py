@@ -0,0 +1,6 @@
+"""
+Benchmarks for Kirikou hot paths.
+
+Run a benchmark as a module from the project root, e.g.:
+    python -m benchmarks.bench_dates
+"""
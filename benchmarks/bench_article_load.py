@@ -0,0 +1,98 @@
+"""
+Benchmark: article loading, executemany INSERT vs. COPY + merge.
+
+Loads synthetic articles through both paths of save_articles_batch and
+reports rows/second for a fresh load (every row new) and a reload
+(every row a duplicate, the common case for a feed polled again).
+
+Needs the database from DATABASE_URL. Rows go to a dedicated
+"Benchmark Source" and are deleted again after every measurement.
+
+Usage:
+    python -m benchmarks.bench_article_load
+    python -m benchmarks.bench_article_load --sizes 1000 10000 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import text
+from database.db import get_session
+from database.utils import delete_articles_by_source, save_articles_batch
+
+BENCH_SOURCE = "Benchmark Source"
+
+
+def build_articles(count: int, run: str) -> list[dict]:
+    """Synthetic articles with unique URLs (per run)."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            'title': f"Benchmark story {i}",
+            'description': "Lorem ipsum dolor sit amet, " * 10,
+            'author': "Reporter",
+            'published_at': now - timedelta(minutes=i),
+            'url': f"https://bench.example/{run}/story/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def get_bench_source_id() -> int:
+    """Create (or find) the source the benchmark rows belong to."""
+    with get_session() as session:
+        return session.execute(text("""
+            INSERT INTO sources (name, url) VALUES (:name, 'https://bench.example/rss')
+            ON CONFLICT (name) DO UPDATE SET url = EXCLUDED.url
+            RETURNING id
+        """), {'name': BENCH_SOURCE}).scalar_one()
+
+
+def cleanup(source_id: int):
+    delete_articles_by_source(source_id)
+
+
+def measure(articles: list[dict], source_id: int, method: str) -> tuple[float, float, int]:
+    """Return (fresh seconds, reload seconds, rows inserted)."""
+    start = time.perf_counter()
+    inserted = save_articles_batch(articles, source_id, method=method)
+    fresh = time.perf_counter() - start
+
+    start = time.perf_counter()
+    save_articles_batch(articles, source_id, method=method)
+    reload = time.perf_counter() - start
+
+    cleanup(source_id)
+    return fresh, reload, inserted
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = arg_parser.parse_args()
+
+    source_id = get_bench_source_id()
+    cleanup(source_id)
+
+    print("=" * 70)
+    print("Article loading (rows/second, fresh load and all-duplicate reload)")
+    print("=" * 70)
+    print(f"  {'rows':>8}  {'method':8}  {'fresh s':>9}  {'rows/s':>10}  {'reload s':>9}  {'rows/s':>10}")
+
+    try:
+        for size in args.sizes:
+            for method in ('insert', 'copy'):
+                articles = build_articles(size, f"{method}-{size}")
+                fresh, reload, inserted = measure(articles, source_id, method)
+                assert inserted == size, f"{method} inserted {inserted} of {size} rows"
+                print(f"  {size:>8}  {method:8}  {fresh:>9.2f}  {size / fresh:>10.0f}  "
+                      f"{reload:>9.2f}  {size / reload:>10.0f}")
+    finally:
+        cleanup(source_id)
+        with get_session() as session:
+            session.execute(text("DELETE FROM sources WHERE id = :id"), {'id': source_id})
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
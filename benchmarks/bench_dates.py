@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: feed timestamp parsing.
+
+Compares the old path (dateutil on every entry) with
+ingestion.dates.parse_feed_date (fast paths + memoization) on a corpus
+of feed timestamps, one per line. The stored corpus is synthetic (see
+its header); record a real one with --record before quoting results.
+
+Usage:
+    python -m benchmarks.bench_dates                # Use the stored corpus
+    python -m benchmarks.bench_dates --record       # Re-record it from live sources first
+    python -m benchmarks.bench_dates --runs 24      # Simulate 24 hourly scrapes
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from dateutil import parser as date_parser
+from ingestion.dates import parse_feed_date
+
+CORPUS_PATH = Path(__file__).parent / "data" / "feed_timestamps.txt"
+
+
+def record_corpus(path: Path) -> int:
+    """Fetch every source's feed and store the raw published/updated strings."""
+    import feedparser
+    from database.utils import get_all_sources_standalone
+    from ingestion.feed_parser import download_feed
+
+    lines = []
+    sources = get_all_sources_standalone()
+    for source in sources:
+        response = download_feed(source['url'])
+        if not response or not response['content']:
+            continue
+        for entry in feedparser.parse(response['content']).entries:
+            value = entry.get('published') or entry.get('updated')
+            if value:
+                lines.append(value)
+
+    header = f"# Recorded from {len(sources)} sources' live feeds on {datetime.now(timezone.utc):%Y-%m-%d}\n"
+    path.write_text(header + "\n".join(lines) + "\n")
+    return len(lines)
+
+
+def load_corpus(path: Path) -> list[str]:
+    """Read the corpus (one timestamp per line, '#' comments allowed)."""
+    return [
+        line.strip() for line in path.read_text().splitlines()
+        if line.strip() and not line.startswith('#')
+    ]
+
+
+def bench(label: str, parse, corpus: list[str], runs: int) -> float:
+    """Parse the whole corpus `runs` times and return entries/sec."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        for value in corpus:
+            parse(value)
+    elapsed = time.perf_counter() - start
+    rate = len(corpus) * runs / elapsed
+    print(f"  {label:32} {rate:>12,.0f} entries/sec  ({elapsed:.3f}s)")
+    return rate
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--record', action='store_true', help="re-record the corpus from live sources")
+    arg_parser.add_argument('--runs', type=int, default=10, help="passes over the corpus (one per simulated scrape)")
+    args = arg_parser.parse_args()
+
+    if args.record:
+        count = record_corpus(CORPUS_PATH)
+        print(f"Recorded {count} timestamps to {CORPUS_PATH}")
+
+    corpus = load_corpus(CORPUS_PATH)
+
+    print("=" * 70)
+    print(f"Feed date parsing - {len(corpus)} timestamps x {args.runs} runs")
+    print("=" * 70)
+
+    before = bench("dateutil.parser.parse (before)", date_parser.parse, corpus, args.runs)
+
+    parse_feed_date.cache_clear()
+    after_cold = bench("parse_feed_date, 1 run (cold)", parse_feed_date, corpus, 1)
+
+    parse_feed_date.cache_clear()
+    after = bench("parse_feed_date (after)", parse_feed_date, corpus, args.runs)
+
+    print("-" * 70)
+    print(f"  Speedup, cold cache:  {after_cold / before:.1f}x")
+    print(f"  Speedup, steady:      {after / before:.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: near-duplicate detection, MinHash/LSH vs. the title self-join.
+
+Builds a synthetic corpus where ~10% of the stories are re-published by
+1-3 other "outlets": some with the same title, most slightly reworded
+(a word swapped, dropped or added, the description partly rewritten).
+
+- MinHash/LSH: shingles, signatures, LSH candidate pairs and scoring
+  in memory, exactly as database/near_duplicates.py does per batch
+- SQL: the old exact-title self-join, on a temporary table with a title
+  index (skipped with --no-db)
+
+Reports the time of each and the share of the true duplicate pairs it finds.
+
+Usage:
+    python -m benchmarks.bench_near_duplicates
+    python -m benchmarks.bench_near_duplicates --sizes 100000 1000000
+    python -m benchmarks.bench_near_duplicates --no-db
+"""
+import argparse
+import io
+import random
+import string
+import time
+from config import get_settings
+from database.minhash import (
+    article_text,
+    band_hashes,
+    candidate_pairs,
+    make_permutations,
+    minhash_signatures,
+    pair_similarities,
+    shingles,
+)
+
+settings = get_settings()
+
+DUPLICATE_SHARE = 0.1
+EXACT_TITLE_SHARE = 0.3  # Re-publications that keep the title unchanged
+
+
+def build_corpus(count: int, seed: int = 42) -> tuple[list[tuple[str, str]], set]:
+    """
+    Synthetic (title, description) articles and their true duplicate pairs.
+
+    Returns:
+        (articles, set of (i, j) index pairs with i < j)
+    """
+    rng = random.Random(seed)
+    vocabulary = [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(20000)
+    ]
+
+    def reword(words: list[str], changes: int) -> list[str]:
+        words = list(words)
+        for _ in range(changes):
+            action, position = rng.random(), rng.randrange(len(words))
+            if action < 0.5:
+                words[position] = rng.choice(vocabulary)
+            elif action < 0.75 and len(words) > 4:
+                del words[position]
+            else:
+                words.insert(position, rng.choice(vocabulary))
+        return words
+
+    articles: list[tuple[str, str]] = []
+    truth: set = set()
+    while len(articles) < count:
+        title = rng.choices(vocabulary, k=rng.randint(7, 12))
+        description = rng.choices(vocabulary, k=rng.randint(18, 30))
+        group = [len(articles)]
+        articles.append((' '.join(title).capitalize(), ' '.join(description)))
+
+        if rng.random() < DUPLICATE_SHARE:
+            for _ in range(rng.randint(1, 3)):
+                if len(articles) >= count:
+                    break
+                copy_title = title if rng.random() < EXACT_TITLE_SHARE else reword(title, 1)
+                group.append(len(articles))
+                articles.append((' '.join(copy_title).capitalize(), ' '.join(reword(description, 3))))
+
+        truth.update((i, j) for n, i in enumerate(group) for j in group[n + 1:])
+
+    return articles, truth
+
+
+def run_minhash(articles: list[tuple[str, str]]) -> tuple[float, set]:
+    """Return (seconds, pairs at or above the near-duplicate threshold)."""
+    start = time.perf_counter()
+    shingle_sets = [shingles(article_text(title, description)) for title, description in articles]
+    signatures = minhash_signatures(shingle_sets, make_permutations(settings.minhash_num_perm))
+    bands = band_hashes(signatures, settings.minhash_bands)
+    pairs = candidate_pairs(bands, settings.near_duplicate_max_bucket)
+    scores = pair_similarities(signatures, pairs)
+    found = pairs[scores >= settings.near_duplicate_threshold]
+    elapsed = time.perf_counter() - start
+    return elapsed, set(map(tuple, found.tolist()))
+
+
+def run_self_join(articles: list[tuple[str, str]]) -> tuple[float, float, set]:
+    """Return (load seconds, query seconds, pairs with an identical title)."""
+    from database.db import get_session_no_commit
+
+    with get_session_no_commit() as session:
+        cursor = session.connection().connection.cursor()
+        start = time.perf_counter()
+        cursor.execute("CREATE TEMP TABLE bench_articles (id INTEGER, title TEXT, description TEXT)")
+        buffer = io.StringIO(''.join(f"{i}\t{title}\t{description}\n"
+                                     for i, (title, description) in enumerate(articles)))
+        cursor.copy_expert("COPY bench_articles FROM STDIN", buffer)
+        cursor.execute("CREATE INDEX ON bench_articles(title)")
+        cursor.execute("ANALYZE bench_articles")
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cursor.execute("""
+            SELECT a1.id, a2.id
+            FROM bench_articles a1
+            JOIN bench_articles a2 ON a1.title = a2.title AND a1.id < a2.id
+        """)
+        found = set(cursor.fetchall())
+        query = time.perf_counter() - start
+        cursor.execute("DROP TABLE bench_articles")
+    return load, query, found
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    arg_parser.add_argument('--no-db', action='store_true', help="Skip the SQL self-join")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print(f"Near-duplicate detection (MinHash {settings.minhash_num_perm} perm / "
+          f"{settings.minhash_bands} bands, threshold {settings.near_duplicate_threshold})")
+    print("=" * 70)
+    print(f"  {'articles':>9}  {'method':14}  {'seconds':>9}  {'pairs':>8}  {'recall':>7}  {'per 1k':>8}")
+
+    for size in args.sizes:
+        articles, truth = build_corpus(size)
+
+        seconds, found = run_minhash(articles)
+        recall = len(found & truth) / len(truth)
+        print(f"  {size:>9}  {'minhash/lsh':14}  {seconds:>9.2f}  {len(found):>8}  "
+              f"{recall:>7.1%}  {seconds / size * 1000:>7.3f}s")
+
+        if not args.no_db:
+            load, query, found = run_self_join(articles)
+            recall = len(found & truth) / len(truth)
+            print(f"  {size:>9}  {'sql self-join':14}  {query:>9.2f}  {len(found):>8}  "
+                  f"{recall:>7.1%}  {query / size * 1000:>7.3f}s  (+{load:.1f}s load/index)")
+
+    print("=" * 70)
+    print("recall = share of the true duplicate pairs found; the self-join only")
+    print("finds re-publications whose title is unchanged.")
+
+
+if __name__ == "__main__":
+    main()
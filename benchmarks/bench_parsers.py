@@ -0,0 +1,80 @@
+"""
+Benchmark: feedparser vs. the streaming parser.
+
+Builds synthetic RSS feeds of growing size and reports, for each
+backend, CPU time per entry and peak Python memory (tracemalloc).
+
+Usage:
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --sizes 100 1000 10000
+"""
+import argparse
+import time
+import tracemalloc
+import feedparser
+from ingestion.stream_parser import CHUNK_SIZE, iter_entries
+
+
+def build_feed(entries: int, summary_bytes: int = 500) -> bytes:
+    """Build an RSS 2.0 feed with `entries` items."""
+    items = b''.join(
+        b'<item><title>Story %d</title><link>https://example.com/story/%d</link>'
+        b'<guid>https://example.com/story/%d</guid><dc:creator>Reporter</dc:creator>'
+        b'<pubDate>Fri, 16 Oct 2026 21:14:07 GMT</pubDate>'
+        b'<description>%s</description></item>' % (i, i, i, b'x' * summary_bytes)
+        for i in range(entries)
+    )
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>'
+        b'<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        b'<title>Synthetic</title>' + items + b'</channel></rss>'
+    )
+
+
+def run_feedparser(content: bytes) -> int:
+    return len(feedparser.parse(content).entries)
+
+
+def run_stream(content: bytes) -> int:
+    # Chunks as a streamed response's iter_content hands them over
+    chunks = (content[start:start + CHUNK_SIZE] for start in range(0, len(content), CHUNK_SIZE))
+    return sum(1 for _ in iter_entries(chunks))
+
+
+def measure(parse, content: bytes) -> tuple[int, float, float]:
+    """Return (entries, seconds, peak MB) for one parse."""
+    # Time and memory in separate runs: tracemalloc slows allocation down
+    start = time.perf_counter()
+    count = parse(content)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse(content)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("Feed parsing backends (CPU per entry, peak memory)")
+    print("=" * 70)
+    print(f"  {'entries':>8}  {'backend':10}  {'µs/entry':>10}  {'peak MB':>9}  {'feed MB':>8}")
+
+    for size in args.sizes:
+        content = build_feed(size)
+        for label, parse in (('feedparser', run_feedparser), ('stream', run_stream)):
+            count, elapsed, peak = measure(parse, content)
+            print(f"  {count:>8}  {label:10}  {elapsed / count * 1e6:>10.1f}  "
+                  f"{peak:>9.2f}  {len(content) / 1e6:>8.2f}")
+
+    print("=" * 70)
+    print("Note: peak MB excludes the raw feed body itself (allocated before measuring).")
+
+
+if __name__ == "__main__":
+    main()
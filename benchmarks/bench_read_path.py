@@ -0,0 +1,178 @@
+"""
+Benchmark: API read helpers, ORM entities vs. projected Core selects.
+
+Compares the previous implementations of the /articles read helpers
+(whole Article entities, with content and description, source loaded by
+joinedload or lazily per row) with the current ones in database/utils.py
+(only the response columns, read as row mappings). Per request it
+reports the latency, the peak Python memory allocated (tracemalloc) and
+the number of SQL statements.
+
+Needs the database from DATABASE_URL. Articles (with a realistic ~5 KB
+of content each) go to dedicated "Benchmark Source N" sources and are
+deleted again at the end.
+
+Usage:
+    python -m benchmarks.bench_read_path
+    python -m benchmarks.bench_read_path --articles 20000 --requests 200
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, text
+from sqlalchemy.orm import joinedload
+from database.db import engine, get_session, get_session_no_commit
+from database.models import Article, Source
+from database.utils import (
+    delete_source,
+    get_article_by_id,
+    get_articles_by_source,
+    get_recent_articles,
+    save_articles_batch,
+)
+
+BENCH_SOURCES = 5
+BENCH_SOURCE = "Benchmark Source"
+
+
+# Previous implementations, kept here for comparison
+
+def legacy_recent_articles(db, limit):
+    articles = db.query(Article)\
+        .options(joinedload(Article.source))\
+        .order_by(Article.published_at.desc())\
+        .limit(limit)\
+        .all()
+    return [
+        {'id': a.id, 'title': a.title, 'url': a.url, 'published_at': a.published_at,
+         'source': {'id': a.source.id, 'name': a.source.name, 'political_leaning': a.source.political_leaning}}
+        for a in articles
+    ]
+
+
+def legacy_articles_by_source(db, source_name, days, limit):
+    cutoff_date = datetime.now() - timedelta(days=days)
+    articles = db.query(Article)\
+        .join(Source)\
+        .filter(Source.name == source_name, Article.published_at >= cutoff_date)\
+        .order_by(Article.published_at.desc())\
+        .limit(limit)\
+        .all()
+    return [
+        {'id': a.id, 'title': a.title, 'url': a.url, 'published_at': a.published_at,
+         'source': {'id': a.source.id, 'name': a.source.name, 'political_leaning': a.source.political_leaning}}
+        for a in articles
+    ]
+
+
+def legacy_article_by_id(db, article_id):
+    a = db.query(Article).options(joinedload(Article.source)).filter(Article.id == article_id).first()
+    return {'id': a.id, 'title': a.title, 'url': a.url, 'published_at': a.published_at,
+            'description': a.description, 'author': a.author, 'scraped_at': a.scraped_at,
+            'source': {'id': a.source.id, 'name': a.source.name, 'political_leaning': a.source.political_leaning}}
+
+
+def seed(count: int) -> tuple[list[int], int]:
+    """Create the benchmark sources and their articles; return (source IDs, one article ID)."""
+    now = datetime.now(timezone.utc)
+    source_ids = []
+    with get_session() as session:
+        for n in range(BENCH_SOURCES):
+            source_ids.append(session.execute(text("""
+                INSERT INTO sources (name, url) VALUES (:name, 'https://bench.example/rss')
+                ON CONFLICT (name) DO UPDATE SET url = EXCLUDED.url
+                RETURNING id
+            """), {'name': f"{BENCH_SOURCE} {n}"}).scalar_one())
+
+    for n, source_id in enumerate(source_ids):
+        save_articles_batch([
+            {
+                'title': f"Benchmark story {i} of source {n}",
+                'description': "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 10,
+                'content': "Sed ut perspiciatis unde omnis iste natus error sit voluptatem. " * 80,
+                'author': "Reporter",
+                'published_at': now - timedelta(seconds=i * BENCH_SOURCES + n),
+                'url': f"https://bench.example/read/{n}/{i}",
+            }
+            for i in range(count // BENCH_SOURCES)
+        ], source_id)
+
+    with get_session() as session:
+        article_id = session.execute(
+            text("SELECT id FROM articles WHERE source_id = :id LIMIT 1"), {'id': source_ids[0]}
+        ).scalar_one()
+    return source_ids, article_id
+
+
+def cleanup(source_ids: list[int]):
+    for source_id in source_ids:
+        delete_source(source_id)
+
+
+def measure(call, requests: int) -> tuple[float, float, float]:
+    """Return (median ms, peak KB allocated, SQL statements) per request."""
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    latencies = []
+    for _ in range(requests):
+        with get_session_no_commit() as session:
+            start = time.perf_counter()
+            call(session)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Allocations and statements on separate runs (tracemalloc slows everything down)
+    event.listen(engine, 'before_cursor_execute', count)
+    peaks = []
+    try:
+        for _ in range(min(requests, 20)):
+            with get_session_no_commit() as session:
+                tracemalloc.start()
+                call(session)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+                tracemalloc.stop()
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+    return statistics.median(latencies), statistics.median(peaks), statements / len(peaks)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--articles', type=int, default=20000)
+    arg_parser.add_argument('--requests', type=int, default=100)
+    arg_parser.add_argument('--limit', type=int, default=500)
+    args = arg_parser.parse_args()
+
+    source_ids, article_id = seed(args.articles)
+    source_name = f"{BENCH_SOURCE} 0"
+    cases = [
+        ("GET /articles", lambda db: legacy_recent_articles(db, args.limit),
+         lambda db: get_recent_articles(db, args.limit)),
+        ("GET /articles?source_name", lambda db: legacy_articles_by_source(db, source_name, 30, args.limit),
+         lambda db: get_articles_by_source(db, source_name, 30, args.limit)),
+        ("GET /articles/{id}", lambda db: legacy_article_by_id(db, article_id),
+         lambda db: get_article_by_id(db, article_id)),
+    ]
+
+    print("=" * 70)
+    print(f"Read path per request ({args.articles} articles, limit {args.limit}, median of {args.requests})")
+    print("=" * 70)
+    print(f"  {'endpoint':28}  {'version':7}  {'ms':>8}  {'peak KB':>9}  {'queries':>7}")
+    try:
+        for name, before, after in cases:
+            for version, call in (('before', before), ('after', after)):
+                ms, peak, queries = measure(call, args.requests)
+                print(f"  {name:28}  {version:7}  {ms:>8.2f}  {peak:>9.0f}  {queries:>7.1f}")
+    finally:
+        cleanup(source_ids)
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
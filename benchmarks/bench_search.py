@@ -0,0 +1,223 @@
+"""
+Benchmark: GET /articles/search and fuzzy GET /articles?title_like=&author=
+latency on a large synthetic corpus.
+
+Loads synthetic articles (default 1,000,000) through the regular COPY
+loader into dedicated "Benchmark Source N" sources, so the generated
+search_vector column and the GIN indexes are filled exactly as in
+production. Words are drawn from a Zipf distribution over a 30k-word
+vocabulary, so queries range from very common to rare terms; a known
+phrase is planted in one title in a thousand. Each article has one of
+2,000 synthetic authors.
+
+Each case runs database.utils.search_articles or lookup_articles (the
+endpoints' queries) --repeats times and reports the median and p95
+latency. The plans of the common-term search and of a misspelled title
+lookup are printed to show the GIN indexes (Bitmap Index Scans on
+idx_articles_search / idx_articles_title_trgm) doing the matching.
+
+Usage:
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --articles 2000000 --repeats 50
+    python -m benchmarks.bench_search --keep       # Leave the corpus in place
+"""
+import argparse
+import statistics
+import string
+import time
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import text
+from config import get_settings
+from database.db import get_session, get_session_no_commit
+from database.urls import url_hash
+from database.utils import (
+    delete_source, lookup_articles, lookup_articles_query, save_article_rows, search_articles, search_articles_query,
+)
+
+BENCH_SOURCE = "Benchmark Source"
+LEANINGS = ['left', 'center-left', 'center', 'center-right', 'right']
+VOCABULARY = 30000
+PLANTED_PHRASE = "solar tariff dispute"
+LOAD_CHUNK = 50000
+AUTHORS = 2000
+
+settings = get_settings()
+
+
+def make_vocabulary(rng: np.random.Generator) -> list[str]:
+    """Distinct pseudo-words, most frequent first."""
+    letters = np.array(list(string.ascii_lowercase))
+    words: dict = {}
+    while len(words) < VOCABULARY:
+        word = ''.join(rng.choice(letters, size=rng.integers(4, 10)))
+        words.setdefault(word, None)
+    return list(words)
+
+
+def get_bench_sources() -> list[int]:
+    """Create (or find) one benchmark source per leaning."""
+    source_ids = []
+    with get_session() as session:
+        for n, leaning in enumerate(LEANINGS):
+            source_ids.append(session.execute(text("""
+                INSERT INTO sources (name, url, political_leaning) VALUES (:name, 'https://bench.example/rss', :leaning)
+                ON CONFLICT (name) DO UPDATE SET political_leaning = EXCLUDED.political_leaning
+                RETURNING id
+            """), {'name': f"{BENCH_SOURCE} {n}", 'leaning': leaning}).scalar_one())
+    return source_ids
+
+
+def make_authors(vocabulary: list[str]) -> list[str]:
+    """Synthetic 'First Last' author names from the rarer words."""
+    names = vocabulary[-2 * AUTHORS:]
+    return [f"{first.capitalize()} {last.capitalize()}" for first, last in zip(names[::2], names[1::2])]
+
+
+def misspell(value: str) -> str:
+    """Drop one letter from the middle of every word longer than four letters."""
+    return ' '.join(word[:len(word) // 2] + word[len(word) // 2 + 1:] if len(word) > 4 else word
+                    for word in value.split())
+
+
+def load_corpus(count: int, source_ids: list[int], days: int, vocabulary: list[str], authors: list[str],
+                rng: np.random.Generator) -> float:
+    """Insert `count` synthetic articles; return the seconds it took."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    # Zipf-like word frequencies: P(rank r) ~ 1 / r
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    words = np.array(vocabulary)
+
+    start = time.perf_counter()
+    for offset in range(0, count, LOAD_CHUNK):
+        size = min(LOAD_CHUNK, count - offset)
+        title_words = words[rng.choice(len(words), size=(size, 8), p=weights)]
+        description_words = words[rng.choice(len(words), size=(size, 25), p=weights)]
+        content_words = words[rng.choice(len(words), size=(size, 80), p=weights)]
+        ages = rng.uniform(0, days * 86400, size=size)
+        author_ids = rng.integers(0, len(authors), size=size)
+
+        rows = []
+        for i in range(size):
+            n = offset + i
+            title = ' '.join(title_words[i])
+            if n % 1000 == 0:
+                title = f"{title} {PLANTED_PHRASE}"
+            url = f"https://bench.example/search/{n}"
+            rows.append((
+                source_ids[n % len(source_ids)],
+                title.capitalize(),
+                ' '.join(description_words[i]),
+                ' '.join(content_words[i]),
+                authors[author_ids[i]],
+                now - timedelta(seconds=float(ages[i])),
+                url,
+                url_hash(url),
+            ))
+        save_article_rows(rows, method='copy')
+        print(f"  loaded {offset + size:>9} articles ({time.perf_counter() - start:.0f}s)", flush=True)
+
+    with get_session() as session:
+        session.execute(text("ANALYZE articles"))
+    return time.perf_counter() - start
+
+
+def measure(search, repeats: int, **kwargs) -> tuple[float, float, int]:
+    """Return (median ms, p95 ms, results on the page) of search_articles or lookup_articles."""
+    latencies = []
+    results = []
+    for _ in range(repeats):
+        with get_session_no_commit() as session:
+            start = time.perf_counter()
+            results = search(session, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], len(results)
+
+
+def explain(statement) -> list[str]:
+    """EXPLAIN ANALYZE of one query, parameters interpolated as on a real request."""
+    with get_session_no_commit() as session:
+        compiled = statement.compile(dialect=session.get_bind().dialect)
+        cursor = session.connection().connection.cursor()
+        cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %(threshold)s, true)",
+                       {'threshold': str(settings.fuzzy_match_threshold)})
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) " + str(compiled), compiled.params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_articles_first_page(query: str) -> tuple[float, int] | None:
+    """(rank, id) of the last result of the first 20-result page, as a cursor would carry it."""
+    with get_session_no_commit() as session:
+        page = search_articles(session, query, limit=20)
+    return (page[-1]['rank'], page[-1]['id']) if page else None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--articles', type=int, default=1000000)
+    arg_parser.add_argument('--days', type=int, default=28, help="Publish dates spread over this many days")
+    arg_parser.add_argument('--repeats', type=int, default=20)
+    arg_parser.add_argument('--keep', action='store_true', help="Don't delete the corpus afterwards")
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vocabulary = make_vocabulary(rng)
+    authors = make_authors(vocabulary)
+    source_ids = get_bench_sources()
+
+    print("=" * 78)
+    print(f"Full-text search ({args.articles} synthetic articles over {args.days} days)")
+    print("=" * 78)
+    try:
+        seconds = load_corpus(args.articles, source_ids, args.days, vocabulary, authors, rng)
+        print(f"  load: {seconds:.0f}s ({args.articles / seconds:.0f} articles/s, search_vector + GIN maintained)")
+
+        common, mid, rare = vocabulary[9], vocabulary[299], vocabulary[4999]
+        week_ago = datetime.now() - timedelta(days=7)
+        first_page = search_articles_first_page(common)
+        cases = [
+            (f"common term ({common})", {'query': common}),
+            ("common term, sort=newest", {'query': common, 'sort': 'newest'}),
+            (f"mid-frequency term ({mid})", {'query': mid}),
+            (f"rare term ({rare})", {'query': rare}),
+            (f"two terms ({vocabulary[49]} {vocabulary[199]})", {'query': f"{vocabulary[49]} {vocabulary[199]}"}),
+            (f'phrase ("{PLANTED_PHRASE}")', {'query': f'"{PLANTED_PHRASE}"'}),
+            ("common + leaning=center", {'query': common, 'political_leaning': 'center'}),
+            (f"common + source_name={BENCH_SOURCE} 0", {'query': common, 'source_name': f"{BENCH_SOURCE} 0"}),
+            ("mid + last 7 days", {'query': mid, 'published_after': week_ago}),
+            ("common, page 2 (cursor)", {'query': common, 'after': first_page}),
+        ]
+        # Title fragments of mid-frequency words, as an analyst half-remembers them
+        fragment = f"{vocabulary[299]} {vocabulary[449]}"
+        lookups = [
+            (f"title_like={fragment}", {'title_like': fragment}),
+            (f"title_like={misspell(fragment)} (misspelled)", {'title_like': misspell(fragment)}),
+            (f"title_like={misspell(PLANTED_PHRASE)}", {'title_like': misspell(PLANTED_PHRASE)}),
+            (f"author={misspell(authors[0])}", {'author': misspell(authors[0])}),
+            (f"author + source_name={BENCH_SOURCE} 0",
+             {'author': misspell(authors[0]), 'source_name': f"{BENCH_SOURCE} 0"}),
+        ]
+
+        print(f"\n  {'query':52}  {'median ms':>9}  {'p95 ms':>8}  {'page':>5}")
+        for search, name, kwargs in [(search_articles, *case) for case in cases] + \
+                                    [(lookup_articles, *case) for case in lookups]:
+            median, p95, found = measure(search, args.repeats, limit=21, **kwargs)
+            print(f"  {name[:52]:52}  {median:>9.1f}  {p95:>8.1f}  {found:>5}")
+
+        print("\n  Plan of the common-term search:")
+        for line in explain(search_articles_query(common, 21)):
+            print(f"    {line}")
+        print("\n  Plan of the misspelled title lookup:")
+        for line in explain(lookup_articles_query(misspell(fragment), None, 21)):
+            print(f"    {line}")
+    finally:
+        if not args.keep:
+            for source_id in source_ids:
+                delete_source(source_id)
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
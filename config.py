@@ -21,12 +21,60 @@ class Settings(BaseSettings):
     jwt_algorithm: str = 'HS256'
 
     jwt_expire_minutes: int = 60
+    database_replica_url: str | None = None  # Streaming replica for GET/HEAD routes (unset = primary only)
+    replica_max_lag: float = 5.0         # GET routes fall back to the primary when the replica is further behind (seconds)
+    replica_lag_check_interval: float = 1.0  # How often the replica's lag is measured (seconds)
+    replica_retry_max_interval: float = 60.0  # Longest wait between checks of a down replica (seconds)
     log_level: str = 'INFO'
     log_file: str = 'logs/kirikou.log'
     debug: bool = False
     app_name: str = "Kirikou Media Intelligence"
-    fetch_interval: int = 3600
+    fetch_interval: int = 3600       # Starting poll interval for a new source (seconds)
+    poll_min_interval: int = 300     # Busiest sources are polled at most this often
+    poll_max_interval: int = 21600   # Quiet/failing sources are polled at least this often
+    poll_target_new: float = 3.0     # Articles we aim to pick up per poll
+    poll_rate_smoothing: float = 0.3  # Weight of the newest publish-rate observation
+    scheduler_tick: int = 60         # How often beat looks for due sources (seconds)
     request_timeout: int = 10
+    fetch_concurrency: int = 16      # Feeds downloaded at the same time
+    fetch_per_host_limit: int = 2    # Max parallel downloads per host
+    http_pool_size: int = 32         # Number of hosts to keep connection pools for
+    validate_workers: int = 16       # Feed URLs validated at the same time
+    http_accept_encoding: str = 'gzip, deflate'
+    http_user_agent: str = 'Mozilla/5.0 (compatible; KirikouBot/1.0)'
+    write_batch_rows: int = 2000         # Articles buffered across sources before a write
+    write_batch_seconds: float = 5.0     # Longest a parsed source waits to be written
+    article_copy_threshold: int = 200    # Article batches this large are loaded with COPY
+    seen_filter_enabled: bool = True     # Drop already-stored URLs in-process before the DB
+    seen_filter_capacity: int = 2_000_000  # URLs the filter is sized for (rebuilt past this)
+    seen_filter_error_rate: float = 0.001  # Target false positive rate at capacity
+    seen_filter_sample_rate: float = 0.02  # Share of filter hits re-checked in the DB
+    seen_filter_warm_days: int = 30      # Warm with articles scraped this recently
+    minhash_num_perm: int = 128          # MinHash signature length (changing it needs a re-index)
+    minhash_bands: int = 32              # LSH bands (num_perm / bands rows each)
+    near_duplicate_threshold: float = 0.5  # Estimated Jaccard similarity of a near-duplicate pair
+    near_duplicate_batch: int = 2000     # Articles fingerprinted per transaction
+    near_duplicate_max_bucket: int = 100  # Articles compared per LSH bucket at most
+    near_duplicate_window_days: int = 30  # New articles are matched against this recent window
+    near_duplicate_interval: int = 300   # How often beat indexes new articles (seconds)
+    story_index_at_ingest: bool = True   # Cluster new articles into stories right after each write
+    fuzzy_match_threshold: float = 0.4   # Lowest pg_trgm word similarity of a title_like/author match
+    partition_months_ahead: int = 3      # Monthly articles partitions kept created in advance
+    article_retention_months: int = 0    # Partitions wholly older than this many months are retired (0 = keep all)
+    partition_retention_action: str = 'drop'  # 'drop', 'detach' (keep as a standalone table) or 'archive'
+    archive_dir: str = 'archive'         # Cold archive of retired months (database/archive.py)
+    archive_zstd_level: int = 10         # zstd level of the archive files (1-22)
+    archive_cache_rows: int = 100000     # Decompressed archive rows kept in memory per process
+    partition_maintenance_interval: int = 86400  # How often beat runs partition maintenance (seconds)
+    watermark_max_guids: int = 500       # Recent entry GUIDs remembered per source
+    watermark_lookback_hours: int = 24   # Grace window for out-of-order entries
+    watermark_max_skew_minutes: int = 15  # How far ahead of now the watermark may go (future-dated entries)
+    breaker_failure_threshold: int = 3   # Failures in a row that open a feed/host circuit
+    breaker_base_cooldown: int = 900     # First cooldown of an open circuit (seconds), doubles per re-trip
+    breaker_max_cooldown: int = 86400    # Longest cooldown (seconds)
+    breaker_probe_lease: int = 300       # How long one worker's claim on a half-open host's probe holds (seconds)
+    feed_parser_backend: str = 'feedparser'  # 'feedparser' or 'stream' (low-memory)
+    parse_workers: int = 0           # Processes for the parse stage (0 = parse in threads; unused by the stream backend)
     celery_broker_url: str = 'redis://localhost:6379/0'
     celery_result_backend: str = 'redis://localhost:6379/1'
 
@@ -38,6 +86,22 @@ class Settings(BaseSettings):
             raise ValueError(f"log_level must be one of {allowed}")
         return v.upper()
     
+    @field_validator("feed_parser_backend")
+    @classmethod
+    def validate_feed_parser_backend(cls, v: str) -> str:
+        allowed = {"feedparser", "stream"}
+        if v.lower() not in allowed:
+            raise ValueError(f"feed_parser_backend must be one of {allowed}")
+        return v.lower()
+    
+    @field_validator("partition_retention_action")
+    @classmethod
+    def validate_partition_retention_action(cls, v: str) -> str:
+        allowed = {"drop", "detach", "archive"}
+        if v.lower() not in allowed:
+            raise ValueError(f"partition_retention_action must be one of {allowed}")
+        return v.lower()
+    
     def setup_logging(self):
         os.makedirs('logs', exist_ok=True)
         logging.basicConfig(
@@ -3,11 +3,11 @@ Database package for Kirikou.
 
 Provides:
 - Models: Source, Article
-- Session management: get_session, engine
+- Session management: get_session, engine, get_read_session, read_engine
 - Utility functions: get_all_sources, save_articles_batch, etc.
 """
 from database.models import Base, Source, Article, User
-from database.db import engine, get_session, get_session_no_commit, get_db
+from database.db import engine, read_engine, get_session, get_session_no_commit, get_read_session
 from database.utils import (
     get_all_sources,
     get_recent_articles,
@@ -27,9 +27,10 @@ __all__ = [
     
     # Session management
     'engine',
+    'read_engine',
     'get_session',
     'get_session_no_commit',
-    'get_db',
+    'get_read_session',
     
     # Utilities
     'get_all_sources',
@@ -0,0 +1,486 @@
+"""
+Cold archive of old articles: zstd-compressed JSONL files on local disk.
+
+With partition_retention_action='archive', the months retired by
+apply_retention (database/partitions.py) are exported before they are
+dropped, one file per publish day (UTC):
+
+    {archive_dir}/articles/2025/09/2025-09-14.jsonl.zst
+
+Each line is one article, every column included, plus the source's name
+and political leaning at the time. Rows are written newest first, in
+the API's (published_at, id) order. manifest.json in archive_dir lists
+every file with its day, row count and article ID range, and the
+sources deleted since (their rows are never served again). It is
+replaced atomically after each change, so readers never see a
+half-written file.
+
+IDs follow scrape order while files follow publish days, so the files'
+ID ranges overlap widely. ids.idx maps every archived ID to its publish
+day: a sorted array of int64 keys (id << 20 | day ordinal), searched in
+place through mmap, so a lookup (or a miss) reads one day's files only.
+
+Reads fall back to the archive transparently:
+
+- get_article_by_id: an ID missing from Postgres is looked up through
+  ids.idx, in the files of its publish day
+- get_recent_articles / get_articles_by_source: a page that runs out of
+  hot rows continues with archived ones, cursor included
+
+Usage:
+    python -m database.archive           # List the archive
+    python -m database.archive 12345     # Look up one archived article
+    python -m database.archive --reindex # Rebuild ids.idx from the day files
+"""
+import argparse
+import fcntl
+import heapq
+import io
+import json
+import logging
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+import zstandard
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MANIFEST_FILE = 'manifest.json'
+ID_INDEX_FILE = 'ids.idx'
+# Low bits of an ids.idx key holding the day's ordinal (enough until year 2870)
+_DAY_BITS = 20
+_DAY_MASK = (1 << _DAY_BITS) - 1
+
+_manifest_cache: Dict = {'mtime': None, 'entries': [], 'deleted_sources': frozenset()}
+_id_index_cache: Dict = {'mtime': None, 'keys': array('q')}
+# Decompressed day files kept for repeated reads, least recently used
+# first, up to settings.archive_cache_rows rows in all. Shared by the API's
+# threadpool, so every access holds _file_cache_lock.
+_file_cache: OrderedDict = OrderedDict()
+_file_cache_rows = 0
+_file_cache_lock = threading.Lock()
+
+
+def _archive_root() -> Path:
+    return Path(settings.archive_dir)
+
+
+def load_manifest() -> List[Dict]:
+    """Manifest entries, newest day first (re-read only when the file changes)."""
+    path = _archive_root() / MANIFEST_FILE
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if _manifest_cache['mtime'] != mtime:
+        manifest = json.loads(path.read_text())
+        _manifest_cache['entries'] = sorted(manifest['files'], key=lambda entry: entry['day'], reverse=True)
+        _manifest_cache['deleted_sources'] = frozenset(manifest.get('deleted_sources', ()))
+        _manifest_cache['mtime'] = mtime
+    return _manifest_cache['entries']
+
+
+def deleted_sources() -> frozenset:
+    """IDs of the sources deleted after their articles were archived."""
+    if not load_manifest():
+        return frozenset()
+    return _manifest_cache['deleted_sources']
+
+
+def _save_manifest(entries: List[Dict], deleted: Iterable[int]) -> None:
+    root = _archive_root()
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = root / f"{MANIFEST_FILE}.tmp"
+    tmp.write_text(json.dumps({
+        'files': sorted(entries, key=lambda entry: entry['path']),
+        'deleted_sources': sorted(deleted),
+    }, indent=1))
+    os.replace(tmp, root / MANIFEST_FILE)
+
+
+@contextmanager
+def _manifest_lock() -> Iterator[None]:
+    """Serialize manifest and index updates across processes (exports, source deletions)."""
+    root = _archive_root()
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / f"{MANIFEST_FILE}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _iter_index_keys(path: Path) -> Iterator[int]:
+    """Keys of an ids.idx file, in order (streamed, never loaded whole)."""
+    try:
+        index_file = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with index_file:
+        while chunk := index_file.read(8 * 65536):
+            keys = array('q')
+            keys.frombytes(chunk)
+            yield from keys
+
+
+def _write_id_index(keys: Iterable[int], merge: bool) -> None:
+    """
+    Write ids.idx (atomically) from unsorted keys, merged into the current index or replacing it.
+
+    The current index is streamed through a merge, so only the new keys
+    are ever held in memory.
+    """
+    path = _archive_root() / ID_INDEX_FILE
+    tmp = path.with_name(path.name + '.tmp')
+    new_keys = sorted(keys)
+    current = _iter_index_keys(path) if merge else iter(())
+    buffer, last = array('q'), None
+    with open(tmp, 'wb') as out:
+        for key in heapq.merge(current, new_keys):
+            if key != last:  # A re-exported month writes the same keys again
+                buffer.append(key)
+                last = key
+            if len(buffer) >= 65536:
+                buffer.tofile(out)
+                del buffer[:]
+        buffer.tofile(out)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, path)
+
+
+def _day_keys(day: date, rows: Iterable[Dict]) -> Iterator[int]:
+    return ((row['id'] << _DAY_BITS) | day.toordinal() for row in rows)
+
+
+def reindex() -> int:
+    """
+    Rebuild ids.idx from every day file (archives written before it existed).
+
+    Returns:
+        Number of keys in the new index
+    """
+    with _manifest_lock():
+        keys = [
+            key
+            for entry in load_manifest()
+            for key in _day_keys(date.fromisoformat(entry['day']), _read_file(entry['path']))
+        ]
+        _write_id_index(keys, merge=False)
+    logger.info(f"Indexed {len(keys)} archived article IDs")
+    return len(keys)
+
+
+def _archived_days(article_id: int) -> Optional[List[str]]:
+    """
+    Publish days (ISO) whose files hold an archived ID, per ids.idx.
+
+    Returns:
+        Days, empty if the ID isn't archived, or None without an index
+    """
+    path = _archive_root() / ID_INDEX_FILE
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _id_index_cache['mtime'] != mtime:
+        with open(path, 'rb') as index_file:
+            size = os.fstat(index_file.fileno()).st_size
+            # Mapped, not read: the OS pages in the few blocks a search touches
+            keys = memoryview(mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)).cast('q') \
+                if size else array('q')
+        _id_index_cache['keys'] = keys
+        _id_index_cache['mtime'] = mtime
+
+    keys = _id_index_cache['keys']
+    days = []
+    position = bisect_left(keys, article_id << _DAY_BITS)
+    while position < len(keys) and keys[position] >> _DAY_BITS == article_id:
+        days.append(date.fromordinal(keys[position] & _DAY_MASK).isoformat())
+        position += 1
+    return days
+
+
+def forget_archived_source(source_id: int) -> None:
+    """
+    Stop serving a deleted source's archived articles.
+
+    The source is recorded in the manifest and its rows are skipped on
+    every read; the day files themselves aren't rewritten.
+    """
+    if not load_manifest():
+        return
+    with _manifest_lock():
+        entries = load_manifest()
+        _save_manifest(entries, deleted_sources() | {source_id})
+    logger.info(f"Archived articles of source_id={source_id} hidden")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _write_day(day: date, rows: List[Dict], tag: str) -> Dict:
+    """Write one day's rows to its file (atomically) and return its manifest entry."""
+    relative = Path('articles') / f"{day:%Y}" / f"{day:%m}" / f"{day.isoformat()}{tag}.jsonl.zst"
+    path = _archive_root() / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = path.with_name(path.name + '.tmp')
+    compressor = zstandard.ZstdCompressor(level=settings.archive_zstd_level)
+    with open(tmp, 'wb') as raw:
+        with compressor.stream_writer(raw, closefd=False) as writer:
+            for row in rows:
+                writer.write(json.dumps(row, default=_json_default).encode() + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+    ids = [row['id'] for row in rows]
+    return {
+        'path': relative.as_posix(),
+        'day': day.isoformat(),
+        'rows': len(rows),
+        'min_id': min(ids),
+        'max_id': max(ids),
+        'bytes': path.stat().st_size,
+        'archived_at': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec='seconds'),
+    }
+
+
+def write_archive(rows: Iterable[Dict], tag: str = '') -> List[Dict]:
+    """
+    Write articles to day files and add them to the manifest.
+
+    Args:
+        rows: Article dicts, newest first (published_at DESC, id DESC)
+        tag: File name suffix; '' for a whole exported month, whose files
+            are simply rewritten if the export runs again
+
+    Returns:
+        Manifest entries of the files written
+    """
+    written, keys = [], []
+    for day, day_rows in groupby(rows, key=lambda row: row['published_at'].date()):
+        day_rows = list(day_rows)
+        written.append(_write_day(day, day_rows, tag))
+        keys.extend(_day_keys(day, day_rows))
+    if written:
+        with _manifest_lock():
+            paths = {entry['path'] for entry in written}
+            kept = [entry for entry in load_manifest() if entry['path'] not in paths]
+            if kept and not (_archive_root() / ID_INDEX_FILE).exists():
+                # Archive from before ids.idx: index its older files as well
+                keys.extend(key for entry in kept
+                            for key in _day_keys(date.fromisoformat(entry['day']), _read_file(entry['path'])))
+            _write_id_index(keys, merge=True)
+            _save_manifest(kept + written, deleted_sources())
+    return written
+
+
+def export_articles(session: Session, table: str, where: str = 'TRUE', params: Optional[Dict] = None,
+                    tag: str = '') -> int:
+    """
+    Stream articles from a table (a detached partition) into the archive.
+
+    Args:
+        session: Database session
+        table: Table to read
+        where: Condition on its rows (alias a)
+        params: Bind parameters of the condition
+        tag: File name suffix (see write_archive)
+
+    Returns:
+        Number of articles archived
+    """
+    result = session.connection().execution_options(stream_results=True, yield_per=5000).execute(text(f"""
+        SELECT a.id, a.source_id, a.title, a.description, a.content, a.author,
+               a.published_at, a.scraped_at, a.url, a.url_hash,
+               s.name AS source_name, s.political_leaning AS source_political_leaning
+        FROM {table} a
+        LEFT JOIN sources s ON s.id = a.source_id
+        WHERE {where}
+        ORDER BY a.published_at DESC, a.id DESC
+    """), params or {})
+    written = write_archive(dict(row) for row in result.mappings())
+    archived = sum(entry['rows'] for entry in written)
+    logger.info(f"Archived {archived} articles from {table} into {len(written)} day files")
+    return archived
+
+
+def _read_file(relative: str) -> List[Dict]:
+    """All rows of one day file, newest first (LRU cache of decompressed files, bounded in rows)."""
+    global _file_cache_rows
+
+    path = _archive_root() / relative
+    key = (relative, path.stat().st_mtime_ns)
+    with _file_cache_lock:
+        if key in _file_cache:
+            _file_cache.move_to_end(key)
+            return _file_cache[key]
+
+    # Decompressed outside the lock: two threads may both read a missed file
+    with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+        rows = [json.loads(line) for line in io.TextIOWrapper(reader, encoding='utf-8')]
+    for row in rows:
+        row['published_at'] = datetime.fromisoformat(row['published_at'])
+        if row['scraped_at']:
+            row['scraped_at'] = datetime.fromisoformat(row['scraped_at'])
+
+    if len(rows) > settings.archive_cache_rows:
+        return rows
+    with _file_cache_lock:
+        if key not in _file_cache:
+            _file_cache[key] = rows
+            _file_cache_rows += len(rows)
+        while _file_cache_rows > settings.archive_cache_rows:
+            _, evicted = _file_cache.popitem(last=False)
+            _file_cache_rows -= len(evicted)
+    return rows
+
+
+def _summary(row: Dict) -> Dict:
+    """Archived row in the ArticleResponse shape."""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'url': row['url'],
+        'published_at': row['published_at'],
+        'source': {
+            'id': row['source_id'],
+            'name': row['source_name'],
+            'political_leaning': row['source_political_leaning']
+        }
+    }
+
+
+def get_archived_article(article_id: int) -> Optional[Dict]:
+    """
+    Look up one archived article (ArticleDetail shape).
+
+    Only the files of its publish day (per ids.idx) are read, so an ID
+    that isn't archived costs a search of the index, no decompression.
+    Without an index (python -m database.archive --reindex builds it),
+    every file whose ID range contains the ID is read.
+
+    Returns:
+        Article dictionary or None if it isn't archived (or its source was deleted)
+    """
+    entries = load_manifest()
+    days = _archived_days(article_id) if entries else []
+    if days is None:
+        candidates = [entry for entry in entries if entry['min_id'] <= article_id <= entry['max_id']]
+    else:
+        candidates = [entry for entry in entries if entry['day'] in days]
+
+    deleted = deleted_sources()
+    for entry in candidates:
+        for row in _read_file(entry['path']):
+            if row['id'] == article_id:
+                if row['source_id'] in deleted:
+                    return None
+                return {
+                    **_summary(row),
+                    'description': row['description'],
+                    'author': row['author'],
+                    'scraped_at': row['scraped_at']
+                }
+    return None
+
+
+def iter_archived_articles(after: tuple | None = None, since: datetime | None = None,
+                           source_name: str | None = None) -> Iterator[Dict]:
+    """
+    Archived articles newest first, in the API's keyset order.
+
+    Args:
+        after: (published_at, id) position to continue after
+        since: Stop at articles published before this
+        source_name: Only this source's articles
+
+    Yields:
+        Archived rows (every column, plus source_name and source_political_leaning)
+    """
+    last_day = after[0].date().isoformat() if after else None
+    first_day = since.date().isoformat() if since else None
+    # A day can have several files; interrupted exports may have written a row twice
+    seen = set()
+    deleted = deleted_sources()
+    for day, entries in groupby(load_manifest(), key=lambda entry: entry['day']):
+        if last_day and day > last_day:
+            continue
+        if first_day and day < first_day:
+            return
+        rows = [row for entry in entries for row in _read_file(entry['path'])]
+        rows.sort(key=lambda row: (row['published_at'], row['id']), reverse=True)
+        for row in rows:
+            if after and (row['published_at'], row['id']) >= after:
+                continue
+            if since and row['published_at'] < since:
+                return
+            if row['id'] in seen or row['source_id'] in deleted \
+                    or (source_name and row['source_name'] != source_name):
+                continue
+            seen.add(row['id'])
+            yield row
+
+
+def get_archived_articles(limit: int, after: tuple | None = None, since: datetime | None = None,
+                          source_name: str | None = None) -> List[Dict]:
+    """
+    One page of archived articles (ArticleResponse shape), newest first.
+
+    Used to continue a page of hot rows past the oldest one in Postgres.
+
+    Args:
+        limit: Maximum number of articles
+        after: (published_at, id) position to continue after
+        since: Oldest publish date to include
+        source_name: Only this source's articles
+
+    Returns:
+        List of article dictionaries
+    """
+    if limit <= 0 or not load_manifest():
+        return []
+    page = []
+    for row in iter_archived_articles(after, since, source_name):
+        page.append(_summary(row))
+        if len(page) == limit:
+            break
+    return page
+
+
+if __name__ == "__main__":
+    settings.setup_logging()
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('article_id', type=int, nargs='?', help="Print one archived article")
+    arg_parser.add_argument('--reindex', action='store_true', help="Rebuild ids.idx from the day files")
+    args = arg_parser.parse_args()
+
+    if args.reindex:
+        print(f"{reindex()} article IDs indexed")
+    elif args.article_id is not None:
+        print(get_archived_article(args.article_id))
+    else:
+        manifest = load_manifest()
+        total_rows = sum(entry['rows'] for entry in manifest)
+        total_bytes = sum(entry['bytes'] for entry in manifest)
+        print(f"{settings.archive_dir}: {len(manifest)} files, {total_rows} articles, {total_bytes / 1e6:.1f} MB")
+        for entry in manifest[:20]:
+            print(f"  {entry['day']}  {entry['rows']:>7} articles  IDs {entry['min_id']}-{entry['max_id']}  {entry['path']}")
@@ -0,0 +1,115 @@
+"""
+Backfill articles.url_hash for existing rows (second step of migration 005).
+
+Walks the articles without a hash in id order, normalizes their URL and
+stores it with its hash. A row whose normalized URL is already stored
+(e.g. the same story saved once with and once without utm_* parameters)
+is a duplicate and gets deleted; the row already holding the hash wins.
+Once every row has a hash, url_hash is made NOT NULL.
+
+Usage:
+    python -m database.backfill_url_hash
+    python -m database.backfill_url_hash --batch-size 5000
+    python -m database.backfill_url_hash --dry-run    # Only count what would change
+"""
+import argparse
+import logging
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from config import get_settings
+from database.db import get_session, get_session_no_commit
+from database.urls import normalize_url, url_hash
+
+settings = get_settings()
+settings.setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def backfill_batch(session: Session, last_id: int, batch_size: int, dry_run: bool, seen: set) -> tuple[int, int, int]:
+    """
+    Backfill one batch of articles with id > last_id.
+    
+    `seen` carries the hashes of earlier batches in a dry run, where
+    nothing is written that the next batch could conflict with.
+
+    Returns:
+        (last id seen, rows updated, duplicate rows deleted)
+    """
+    rows = session.execute(text("""
+        SELECT id, url FROM articles
+        WHERE url_hash IS NULL AND id > :last_id
+        ORDER BY id
+        LIMIT :limit
+    """), {'last_id': last_id, 'limit': batch_size}).all()
+    if not rows:
+        return last_id, 0, 0
+
+    normalized = {row.id: normalize_url(row.url) for row in rows}
+    hashes = {article_id: url_hash(url) for article_id, url in normalized.items()}
+
+    taken = seen | set(session.execute(
+        text("SELECT url_hash FROM articles WHERE url_hash = ANY(:hashes)"),
+        {'hashes': list(set(hashes.values()))}
+    ).scalars())
+
+    updates, duplicates = [], []
+    for article_id, hash_value in hashes.items():
+        if hash_value in taken:
+            duplicates.append(article_id)
+        else:
+            taken.add(hash_value)
+            updates.append({'id': article_id, 'url': normalized[article_id], 'url_hash': hash_value})
+
+    if dry_run:
+        seen.update(update['url_hash'] for update in updates)
+    else:
+        if duplicates:
+            session.execute(text("DELETE FROM articles WHERE id = ANY(:ids)"), {'ids': duplicates})
+        if updates:
+            session.execute(text("UPDATE articles SET url = :url, url_hash = :url_hash WHERE id = :id"), updates)
+
+    return rows[-1].id, len(updates), len(duplicates)
+
+
+def backfill_url_hashes(batch_size: int = 10000, dry_run: bool = False) -> dict:
+    """
+    Hash every article that has no url_hash yet, one transaction per batch.
+
+    Args:
+        batch_size: Articles per batch
+        dry_run: Count changes without writing anything
+
+    Returns:
+        Dictionary with updated and duplicates counts
+    """
+    last_id, total_updated, total_duplicates = 0, 0, 0
+    seen: set = set()
+    session_factory = get_session_no_commit if dry_run else get_session
+
+    while True:
+        with session_factory() as session:
+            new_last_id, updated, duplicates = backfill_batch(session, last_id, batch_size, dry_run, seen)
+        if new_last_id == last_id:
+            break
+        last_id = new_last_id
+        total_updated += updated
+        total_duplicates += duplicates
+        logger.info(f"Up to id {last_id}: {total_updated} hashed, {total_duplicates} duplicates")
+
+    if not dry_run:
+        with get_session() as session:
+            session.execute(text("ALTER TABLE articles ALTER COLUMN url_hash SET NOT NULL"))
+
+    return {'updated': total_updated, 'duplicates': total_duplicates}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--batch-size', type=int, default=10000)
+    arg_parser.add_argument('--dry-run', action='store_true')
+    args = arg_parser.parse_args()
+
+    counts = backfill_url_hashes(args.batch_size, args.dry_run)
+    action = "Would hash" if args.dry_run else "Hashed"
+    logger.info(f"✅ {action} {counts['updated']} articles, {counts['duplicates']} duplicates "
+                f"{'found' if args.dry_run else 'deleted'}")
@@ -3,15 +3,19 @@ Database connection and session management.
 
 Provides:
 - Engine: Connection to PostgreSQL
+- Read engine: Optional streaming replica (DATABASE_REPLICA_URL) for API reads
 - Session factory: Creates database sessions
 - get_session(): Context manager for transactions
+- get_read_session(): Read-only session on the replica while it is fresh enough
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from collections.abc import Generator
 from contextlib import contextmanager
 from sqlalchemy.orm import sessionmaker, Session
 from config import get_settings
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,39 @@ SessionLocal = sessionmaker(
     autoflush=False    # Manual flush (more control)
 )
 
+# Read engine: a streaming replica, so API reads don't compete with ingestion
+# writes on the primary. Without DATABASE_REPLICA_URL there is none and
+# every read stays on the primary.
+read_engine = create_engine(
+    settings.database_replica_url,
+    echo=False,
+    pool_size=5,
+    max_overflow=10,
+    pool_pre_ping=True,  # A restarted replica shouldn't fail the next request
+    connect_args={'connect_timeout': 5}  # An unreachable replica falls back instead of hanging
+) if settings.database_replica_url else None
+
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False) if read_engine else None
+
+# Request methods served from the replica (everything else may write)
+READ_METHODS = frozenset({'GET', 'HEAD'})
+
+# Seconds of replay lag behind the primary; NULL (unknown) when the
+# replica isn't receiving WAL, 0 when it is caught up or is a primary
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# Last measurement, and when the next one is due (time.monotonic()). The
+# lock is held by the background check in flight, if any.
+_replica_state = {'next_check': float('-inf'), 'lag': None, 'failures': 0}
+_replica_check_lock = threading.Lock()
+
 
 @contextmanager
 def get_session() -> Generator[Session]:
@@ -85,20 +122,91 @@ def get_session_no_commit() -> Generator[Session]:
         logger.debug("Session closed")
 
 
-def get_db() -> Generator[Session]:
+def replica_lag() -> float | None:
     """
-    Dependency for FastAPI routes to get a database session.
+    Measure how far the replica's replay is behind the primary.
 
-    Usage in FastAPI:
-        @app.get("/items/")
-        def read_items(db: Session = Depends(get_db)):
-            items = db.query(Item).all()
-            return items
-    Yields:
-        Session: Database session
+    Returns:
+        Lag in seconds, or None if there is no replica, it is unreachable
+        or it isn't streaming from the primary
     """
-    with get_session_no_commit() as session:
-        yield session
+    if read_engine is None:
+        return None
+    try:
+        with read_engine.connect() as connection:
+            lag = connection.execute(text(REPLICA_LAG_SQL)).scalar()
+    except Exception as e:
+        logger.warning(f"Replica lag check failed: {e}")
+        return None
+    return None if lag is None else float(lag)
 
 
+def replica_is_fresh() -> bool:
+    """
+    Whether reads may go to the replica (lag within replica_max_lag).
 
+    Never waits on the replica: when a measurement is due, it is started
+    on a background thread (one at a time) and this call answers from the
+    last one. The lag is measured every replica_lag_check_interval
+    seconds; after failed checks (replica down or not streaming) the
+    interval doubles per failure, up to replica_retry_max_interval.
+    """
+    if read_engine is None:
+        return False
+    if time.monotonic() >= _replica_state['next_check'] and _replica_check_lock.acquire(blocking=False):
+        try:
+            threading.Thread(target=_check_replica, name='replica-lag', daemon=True).start()
+        except Exception:
+            _replica_check_lock.release()
+            raise
+    return _is_fresh(_replica_state['lag'])
+
+
+def _check_replica() -> None:
+    """Measure the replica's lag and schedule the next check (holds _replica_check_lock)."""
+    try:
+        was_fresh = _is_fresh(_replica_state['lag'])
+        lag = _replica_state['lag'] = replica_lag()
+        failures = _replica_state['failures'] = 0 if lag is not None else _replica_state['failures'] + 1
+        delay = min(settings.replica_lag_check_interval * 2 ** failures, settings.replica_retry_max_interval)
+        _replica_state['next_check'] = time.monotonic() + delay
+        if _is_fresh(lag) and not was_fresh:
+            logger.info(f"Reads use the replica: lag {lag}s (max {settings.replica_max_lag}s)")
+        elif was_fresh and not _is_fresh(lag):
+            logger.warning(f"Reads fall back to the primary: replica lag {lag}s (max {settings.replica_max_lag}s)")
+    finally:
+        _replica_check_lock.release()
+
+
+def _is_fresh(lag: float | None) -> bool:
+    return lag is not None and lag <= settings.replica_max_lag
+
+
+@contextmanager
+def get_read_session() -> Generator[Session]:
+    """
+    Provide a read-only session on the replica, or on the primary when
+    there is no replica or it is too far behind.
+
+    Usage:
+        with get_read_session() as session:
+            sources = session.execute(select(Source)).all()
+
+    Yields:
+        Session: Database session (never commit through it)
+    """
+    if not replica_is_fresh():
+        with get_session_no_commit() as session:
+            yield session
+        return
+
+    session = ReadSessionLocal()
+    try:
+        yield session
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Session rollback due to error: {e}")
+        raise
+    finally:
+        session.close()
+        logger.debug("Replica session closed")
@@ -0,0 +1,10 @@
+-- Per-source fetch state (conditional GET validators)
+-- Run: psql kirikou_db < database/migrations/001_feed_state.sql
+
+CREATE TABLE IF NOT EXISTS feed_state (
+    source_id INTEGER PRIMARY KEY REFERENCES sources(id) ON DELETE CASCADE,
+    etag TEXT,
+    last_modified TEXT,
+    content_length INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
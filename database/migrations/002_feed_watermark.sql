@@ -0,0 +1,5 @@
+-- Per-source high-water mark for incremental scraping
+-- Run: psql kirikou_db < database/migrations/002_feed_watermark.sql
+
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS last_published_at TIMESTAMP;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS recent_guids TEXT[];
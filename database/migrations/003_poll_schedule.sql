@@ -0,0 +1,10 @@
+-- Adaptive per-source polling schedule
+-- Run: psql kirikou_db < database/migrations/003_poll_schedule.sql
+
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS poll_interval INTEGER;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS publish_rate DOUBLE PRECISION;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS consecutive_failures INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS last_polled_at TIMESTAMP;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS next_poll_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_feed_state_next_poll ON feed_state(next_poll_at);
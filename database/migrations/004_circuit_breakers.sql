@@ -0,0 +1,15 @@
+-- Circuit breakers for feeds (feed_state) and hosts (host_breakers)
+-- Run: psql kirikou_db < database/migrations/004_circuit_breakers.sql
+
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS breaker_state TEXT NOT NULL DEFAULT 'closed';
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS breaker_open_until TIMESTAMP;
+ALTER TABLE feed_state ADD COLUMN IF NOT EXISTS breaker_trips INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS host_breakers (
+    host TEXT PRIMARY KEY,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    breaker_state TEXT NOT NULL DEFAULT 'closed',
+    breaker_open_until TIMESTAMP,
+    breaker_trips INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,11 @@
+-- Hashed, normalized URL dedup key (articles.url_hash replaces the unique index on url)
+-- Run: psql kirikou_db < database/migrations/005_url_hash.sql
+-- Then backfill existing rows: python -m database.backfill_url_hash
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS url_hash BIGINT;
+
+-- Rows not backfilled yet are NULL, which never conflicts
+CREATE UNIQUE INDEX IF NOT EXISTS articles_url_hash_key ON articles(url_hash);
+
+-- The full-URL index is no longer used for dedup
+ALTER TABLE articles DROP CONSTRAINT IF EXISTS articles_url_key;
@@ -0,0 +1,26 @@
+-- Near-duplicate articles: MinHash signatures, LSH buckets and matched pairs
+-- Run: psql kirikou_db < database/migrations/006_near_duplicates.sql
+-- Then fingerprint existing articles: python -m database.near_duplicates
+
+-- No foreign keys to articles: the indexer only ever writes IDs it just read
+CREATE TABLE IF NOT EXISTS article_signatures (
+    article_id INTEGER PRIMARY KEY,
+    signature BYTEA,  -- num_perm little-endian uint32 values, NULL = no text
+    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS article_lsh_bands (
+    band SMALLINT NOT NULL,
+    band_hash BIGINT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (band, band_hash, article_id)  -- Bucket lookups, newest first
+);
+CREATE INDEX IF NOT EXISTS idx_article_lsh_bands_article ON article_lsh_bands(article_id);
+
+CREATE TABLE IF NOT EXISTS article_similarities (
+    article_id INTEGER NOT NULL,  -- The newer article of the pair
+    similar_id INTEGER NOT NULL,  -- The older one
+    similarity REAL NOT NULL,     -- Estimated Jaccard similarity (0-1)
+    PRIMARY KEY (article_id, similar_id)
+);
+CREATE INDEX IF NOT EXISTS idx_article_similarities_similar ON article_similarities(similar_id);
@@ -0,0 +1,22 @@
+-- Story clusters built at ingest time from near-duplicate pairs (database/stories.py)
+-- Run: psql kirikou_db < database/migrations/007_story_clusters.sql
+-- Then cluster the already indexed articles: python -m database.near_duplicates --reindex
+
+CREATE TABLE IF NOT EXISTS story_clusters (
+    id SERIAL PRIMARY KEY,
+    seed_article_id INTEGER NOT NULL,  -- Article the cluster was started from
+    title TEXT,                        -- Earliest member's title
+    article_count INTEGER NOT NULL DEFAULT 0,
+    source_count INTEGER NOT NULL DEFAULT 0,
+    first_published_at TIMESTAMP,
+    last_published_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_story_clusters_last_published ON story_clusters(last_published_at DESC);
+
+CREATE TABLE IF NOT EXISTS article_stories (
+    article_id INTEGER PRIMARY KEY,  -- An article is in at most one story
+    cluster_id INTEGER NOT NULL REFERENCES story_clusters(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_article_stories_cluster ON article_stories(cluster_id);
@@ -0,0 +1,21 @@
+-- Per-source article counts by publish hour (backs GET /articles/stats and /articles/timeline)
+-- Run: psql kirikou_db < database/migrations/008_source_daily_counts.sql
+
+CREATE TABLE IF NOT EXISTS source_daily_counts (
+    source_id INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    day DATE NOT NULL,         -- published_at::date (UTC)
+    hour SMALLINT NOT NULL,    -- 0-23 (UTC)
+    articles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source_id, day, hour)
+);
+CREATE INDEX IF NOT EXISTS idx_source_daily_counts_day ON source_daily_counts(day);
+
+-- Initial fill; the article loaders keep it current from here on
+BEGIN;
+LOCK TABLE articles IN SHARE MODE;
+TRUNCATE source_daily_counts;
+INSERT INTO source_daily_counts (source_id, day, hour, articles)
+SELECT source_id, published_at::date, EXTRACT(HOUR FROM published_at)::smallint, COUNT(*)
+FROM articles
+GROUP BY 1, 2, 3;
+COMMIT;
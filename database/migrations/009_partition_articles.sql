@@ -0,0 +1,81 @@
+-- Monthly range partitioning of articles on published_at, URL dedup moved to article_urls
+-- Run: psql kirikou_db < database/migrations/009_partition_articles.sql
+-- Rewrites the whole table inside one transaction (writers wait); stop the scrapers first
+-- Requires every articles.url_hash to be filled: run 005_url_hash.sql and
+-- python -m database.backfill_url_hash before this file (it refuses otherwise)
+
+BEGIN;
+LOCK TABLE articles IN ACCESS EXCLUSIVE MODE;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM articles WHERE url_hash IS NULL) THEN
+        RAISE EXCEPTION 'articles has rows without url_hash; run python -m database.backfill_url_hash first'
+            USING HINT = 'The partitioned table declares url_hash NOT NULL. Nothing was changed.';
+    END IF;
+END $$;
+
+ALTER TABLE articles RENAME TO articles_unpartitioned;
+-- Frees the name for the new primary key's index
+ALTER TABLE articles_unpartitioned RENAME CONSTRAINT articles_pkey TO articles_unpartitioned_pkey;
+
+CREATE TABLE articles (
+    id INTEGER NOT NULL DEFAULT nextval('articles_id_seq'),
+    source_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    content TEXT,
+    author TEXT,
+    published_at TIMESTAMP NOT NULL,
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    url TEXT NOT NULL,
+    url_hash BIGINT NOT NULL,
+    PRIMARY KEY (id, published_at),
+    FOREIGN KEY (source_id) REFERENCES sources(id)
+) PARTITION BY RANGE (published_at);
+
+-- The sequence would be dropped with the old table otherwise
+ALTER SEQUENCE articles_id_seq OWNED BY articles.id;
+
+CREATE TABLE articles_default PARTITION OF articles DEFAULT;
+
+-- One partition per month from the oldest article to 3 months ahead
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+                   date_trunc('month', LEAST(COALESCE((SELECT MIN(published_at) FROM articles_unpartitioned), now()), now())),
+                   date_trunc('month', now()) + INTERVAL '3 months',
+                   INTERVAL '1 month')::date
+    LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF articles FOR VALUES FROM (%L) TO (%L)',
+                       'articles_' || to_char(month, 'YYYY_MM'), month, (month + INTERVAL '1 month')::date);
+    END LOOP;
+END $$;
+
+INSERT INTO articles (id, source_id, title, description, content, author, published_at, scraped_at, url, url_hash)
+SELECT id, source_id, title, description, content, author, published_at, scraped_at, url, url_hash
+FROM articles_unpartitioned;
+
+CREATE TABLE IF NOT EXISTS article_urls (
+    url_hash BIGINT PRIMARY KEY,
+    published_at TIMESTAMP NOT NULL
+);
+INSERT INTO article_urls (url_hash, published_at)
+SELECT url_hash, published_at FROM articles_unpartitioned
+ON CONFLICT (url_hash) DO NOTHING;
+
+DROP TABLE articles_unpartitioned;
+
+-- Built after the load; created on every partition, present and future
+CREATE INDEX idx_articles_source_id ON articles(source_id);
+CREATE INDEX idx_articles_published_at ON articles(published_at DESC);
+CREATE INDEX idx_articles_source_date ON articles(source_id, published_at DESC);
+CREATE INDEX idx_articles_title ON articles(title);
+
+COMMIT;
+
+ANALYZE articles;
+ANALYZE article_urls;
@@ -0,0 +1,17 @@
+-- Full-text search: generated tsvector over title, description and content, GIN index
+-- Run: psql kirikou_db < database/migrations/010_article_search.sql
+-- Adding a stored generated column rewrites every articles partition (writers wait)
+
+-- Same expression as ARTICLE_SEARCH_VECTOR in database/models.py
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('english', left(coalesce(content, ''), 100000)), 'C')
+) STORED;
+
+-- GIN builds are much faster with room to sort in memory
+SET maintenance_work_mem = '1GB';
+CREATE INDEX IF NOT EXISTS idx_articles_search ON articles USING GIN (search_vector);
+RESET maintenance_work_mem;
+
+ANALYZE articles;
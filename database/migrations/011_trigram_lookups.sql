@@ -0,0 +1,15 @@
+-- Trigram GIN indexes for fuzzy title/author lookups (GET /articles?title_like=&author=)
+-- Run: psql kirikou_db < database/migrations/011_trigram_lookups.sql
+-- Builds on every articles partition; CONCURRENTLY isn't available on partitioned tables (writers wait)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Served the exact-title self-join that near-duplicate detection replaced
+DROP INDEX IF EXISTS idx_articles_title;
+
+SET maintenance_work_mem = '1GB';
+CREATE INDEX IF NOT EXISTS idx_articles_title_trgm ON articles USING GIN (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_articles_author_trgm ON articles USING GIN (author gin_trgm_ops);
+RESET maintenance_work_mem;
+
+ANALYZE articles;
@@ -0,0 +1,29 @@
+-- Near-duplicate indexer: prune LSH buckets by publish date, track a high-water mark
+-- Run: psql kirikou_db < database/migrations/012_near_duplicate_high_water_mark.sql
+
+BEGIN;
+
+ALTER TABLE article_lsh_bands ADD COLUMN IF NOT EXISTS published_at TIMESTAMP;
+UPDATE article_lsh_bands lb SET published_at = a.published_at
+FROM articles a
+WHERE a.id = lb.article_id AND lb.published_at IS NULL;
+-- Buckets of articles deleted without their fingerprints
+DELETE FROM article_lsh_bands WHERE published_at IS NULL;
+ALTER TABLE article_lsh_bands ALTER COLUMN published_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_article_lsh_bands_published ON article_lsh_bands(published_at);
+
+CREATE TABLE IF NOT EXISTS near_duplicate_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    indexed_through INTEGER NOT NULL DEFAULT 0,
+    pending_through INTEGER,
+    pending_xmax BIGINT
+);
+-- Start where the old 10,000-ID lookback window reached; articles below it
+-- were already beyond the old indexer's reach
+INSERT INTO near_duplicate_state (indexed_through)
+SELECT GREATEST(COALESCE(MAX(article_id), 0) - 10000, 0) FROM article_signatures
+ON CONFLICT (id) DO NOTHING;
+
+COMMIT;
+
+ANALYZE article_lsh_bands;
@@ -0,0 +1,11 @@
+-- Seen-URL filters: count the times stored URLs are released from article_urls
+-- Run: psql kirikou_db < database/migrations/013_url_release_generation.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS url_release_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    generation BIGINT NOT NULL DEFAULT 0
+);
+
+COMMIT;
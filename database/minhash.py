@@ -0,0 +1,198 @@
+"""
+MinHash signatures and LSH banding for near-duplicate articles.
+
+Two outlets rarely word a story identically, so exact title matching
+misses most duplicates. Instead each article's title + description is
+cut into short byte shingles and summarized by a MinHash signature: the
+share of equal positions in two signatures estimates the Jaccard
+similarity of their shingle sets.
+
+Comparing every pair of signatures is still quadratic, so signatures
+are split into `bands` bands of `num_perm / bands` rows. Articles that
+share any whole band are candidate pairs; with 32 bands of 4 rows,
+pairs above ~0.5 similarity almost always share a band and pairs below
+~0.3 rarely do. Only candidates are compared.
+
+Signatures are computed in batches with NumPy. They only stay
+comparable while num_perm, the seed and the shingle size stay the same.
+"""
+import re
+import sys
+import numpy as np
+
+MAX_HASH = np.uint32((1 << 32) - 1)
+_BYTE = np.uint64(8)
+_HIGH_WORD = 1 if sys.byteorder == 'little' else 0  # uint32 half holding bits 32-63
+MINHASH_SEED = 1
+SHINGLE_SIZE = 5
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def article_text(title: str | None, description: str | None) -> str:
+    """Text an article is fingerprinted on: title + description."""
+    return f"{title or ''} {description or ''}"
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Byte k-shingles of a text, each packed into one integer.
+
+    The text is lowercased and reduced to its words (punctuation and
+    spacing differences between outlets don't matter). With k <= 8 the k
+    UTF-8 bytes of a shingle fit in 64 bits, so no hashing is needed and
+    the whole text is shingled in a few NumPy operations.
+
+    Returns:
+        uint64 array of shingles, possibly repeated (empty for no text)
+    """
+    normalized = ' '.join(_WORD_RE.findall(text.lower())).encode('utf-8')
+    if not normalized:
+        return np.empty(0, dtype=np.uint64)
+    data = np.frombuffer(normalized, dtype=np.uint8).astype(np.uint64)
+    count = max(len(data) - k + 1, 1)
+    grams = data[:count].copy()
+    for offset in range(1, min(k, len(data))):
+        grams <<= _BYTE
+        grams |= data[offset:offset + count]
+    return grams
+
+
+def make_permutations(num_perm: int, seed: int = MINHASH_SEED) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients (a, b) of num_perm multiply-shift hash functions.
+
+    h(x) = ((a * x + b) mod 2^64) >> 32 with odd a: universal for 32-bit
+    outputs and, unlike a prime modulus, needs no division.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(
+    shingle_sets: list[np.ndarray],
+    permutations: tuple[np.ndarray, np.ndarray],
+    chunk_shingles: int = 8192,
+) -> np.ndarray:
+    """
+    MinHash signatures of many documents at once.
+
+    All shingles of a chunk of documents are hashed in one (num_perm x
+    shingles) matrix, then reduced to per-document minimums, so the
+    Python loop runs per chunk instead of per shingle.
+
+    Args:
+        shingle_sets: One shingles() array per document
+        permutations: Output of make_permutations
+        chunk_shingles: Shingles hashed per chunk; small chunks keep the
+            hashed matrix in CPU cache
+
+    Returns:
+        uint32 array of shape (documents, num_perm); an empty document
+        gets all-MAX_HASH (never index those)
+    """
+    a, b = permutations
+    count = len(shingle_sets)
+    signatures = np.full((count, len(a)), MAX_HASH, dtype=np.uint32)
+
+    start = 0
+    while start < count:
+        end, total = start, 0
+        while end < count and (end == start or total + len(shingle_sets[end]) <= chunk_shingles):
+            total += len(shingle_sets[end])
+            end += 1
+
+        lengths = np.array([len(s) for s in shingle_sets[start:end]])
+        nonempty = lengths > 0
+        if total:
+            flat = np.concatenate([s for s in shingle_sets[start:end] if len(s)])
+            # (num_perm x shingles), so each reduction runs along a contiguous row;
+            # in place, wrapping mod 2^64 on purpose
+            hashed = np.multiply(a[:, None], flat)
+            hashed += b[:, None]
+            # h(x) = high 32 bits of each product, read without a copy
+            hashed = hashed.view(np.uint32)[:, _HIGH_WORD::2]
+            offsets = np.cumsum(lengths[nonempty]) - lengths[nonempty]
+            chunk = signatures[start:end]
+            chunk[nonempty] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+
+    return signatures
+
+
+def band_hashes(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """
+    LSH band keys: one 64-bit hash per (document, band).
+
+    Returns:
+        int64 array of shape (documents, bands), ready for a BIGINT column
+    """
+    count, num_perm = signatures.shape
+    rows = num_perm // bands
+    banded = signatures[:, :bands * rows].reshape(count, bands, rows).astype(np.uint64)
+    # Random odd multipliers; the sum wraps mod 2^64
+    weights = np.random.default_rng(MINHASH_SEED + 1).integers(
+        1, 1 << 63, size=rows, dtype=np.uint64
+    ) | np.uint64(1)
+    return (banded * weights).sum(axis=2, dtype=np.uint64).view(np.int64)
+
+
+def candidate_pairs(band_keys: np.ndarray, max_bucket: int = 100) -> np.ndarray:
+    """
+    Pairs of documents that share at least one LSH band.
+
+    Each band column is sorted so equal keys become runs; two-member runs
+    (by far the most common) are paired without a Python loop.
+
+    Args:
+        band_keys: Output of band_hashes
+        max_bucket: Members of one bucket paired at most (boilerplate text
+            like "Live updates" would otherwise pair everything with everything)
+
+    Returns:
+        int64 array of shape (pairs, 2), distinct, first index < second
+    """
+    found = []
+    for column in band_keys.T:
+        order = np.argsort(column, kind='stable')
+        keys = column[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(keys)])
+
+        twos = starts[sizes == 2]
+        found.append(np.column_stack((order[twos], order[twos + 1])))
+        for start, size in zip(starts[sizes > 2], sizes[sizes > 2]):
+            members = order[start:start + min(size, max_bucket)]
+            i, j = np.triu_indices(len(members), 1)
+            found.append(np.column_stack((members[i], members[j])))
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(found).astype(np.int64), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of one signature to each row of `others`."""
+    return (others == signature).mean(axis=1)
+
+
+def pair_similarities(signatures: np.ndarray, pairs: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Estimated Jaccard similarity of each (i, j) pair of signature rows."""
+    scores = np.empty(len(pairs), dtype=np.float32)
+    for start in range(0, len(pairs), chunk):
+        i, j = pairs[start:start + chunk].T
+        scores[start:start + chunk] = (signatures[i] == signatures[j]).mean(axis=1)
+    return scores
+
+
+def to_bytes(signature: np.ndarray) -> bytes:
+    """Serialize a signature for a BYTEA column."""
+    return signature.astype('<u4').tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    """Inverse of to_bytes."""
+    return np.frombuffer(data, dtype='<u4').astype(np.uint32)
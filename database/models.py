@@ -3,14 +3,24 @@ SQLAlchemy models for Kirikou database.
 
 Defines Source and Article tables as Python classes.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Computed, Integer, SmallInteger, BigInteger, String, Text, Date, DateTime, ForeignKey, Boolean, Float, LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship, declarative_base
 from datetime import datetime
 
 
 # Base class for all models
 Base = declarative_base()
 
+# Weighted search document of an article: title A, description B, content C
+# (content capped, a tsvector holds at most 1 MB). Queries must use the
+# same text search configuration ('english')
+ARTICLE_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', left(coalesce(content, ''), 100000)), 'C')"
+)
+
 class Source(Base):
     """
     News source (BBC, CNN, etc.)
@@ -29,6 +39,7 @@ class Source(Base):
 
     # Relationships
     articles = relationship('Article', back_populates='source')
+    feed_state = relationship('FeedState', back_populates='source', uselist=False)
 
     def __repr__(self):
         return f"<Source(id={self.id}, name='{self.name}')>"
@@ -37,6 +48,9 @@ class Source(Base):
 class Article(Base):
     """
     News article.
+
+    The table is range-partitioned by month on published_at (see
+    database/partitions.py); its real primary key is (id, published_at).
     
     Relationships:
         source: Many articles belong to one source
@@ -53,6 +67,9 @@ class Article(Base):
     published_at = Column(DateTime, nullable=False)
     scraped_at = Column(DateTime, default=datetime.now)
     url = Column(String, nullable=False)
+    url_hash = Column(BigInteger, nullable=False)  # database.urls.url_hash(url), unique through article_urls
+    # Full-text search document, computed by Postgres (never loaded with the entity)
+    search_vector = deferred(Column(TSVECTOR, Computed(ARTICLE_SEARCH_VECTOR, persisted=True)))
 
 
     # Relationships
@@ -76,6 +93,99 @@ class Article(Base):
         }
     
 
+class ArticleUrl(Base):
+    """
+    Every stored article's url_hash, the deduplication key.
+
+    Unpartitioned, so its primary key is unique across all articles
+    partitions; the loaders claim a URL here before inserting the article.
+    """
+    __tablename__ = 'article_urls'
+
+    # Columns
+    url_hash = Column(BigInteger, primary_key=True)
+    published_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleUrl(url_hash={self.url_hash})>"
+
+
+class UrlReleaseState(Base):
+    """
+    How many times URLs were released from article_urls (a single row).
+
+    The scrapers' seen-URL filters (ingestion/seen_filter.py) still hold
+    the released hashes, so they are rebuilt once generation changes.
+    """
+    __tablename__ = 'url_release_state'
+
+    # Columns
+    id = Column(Boolean, primary_key=True, default=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<UrlReleaseState(generation={self.generation})>"
+
+
+class FeedState(Base):
+    """
+    Per-source fetch state, kept between scraper runs.
+
+    Stores the HTTP validators of the last successful fetch so the next
+    one can be a conditional GET, the watermark (newest publish date
+    + recent entry GUIDs) used to skip already-seen entries, the
+    adaptive polling schedule and the source's circuit breaker.
+
+    Relationships:
+        source: One state row per source
+    """
+    __tablename__ = 'feed_state'
+
+    # Columns
+    source_id = Column(Integer, ForeignKey('sources.id', ondelete='CASCADE'), primary_key=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    content_length = Column(Integer, nullable=True)
+    last_published_at = Column(DateTime, nullable=True)
+    recent_guids = Column(ARRAY(Text), nullable=True)
+    poll_interval = Column(Integer, nullable=True)
+    publish_rate = Column(Float, nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    last_polled_at = Column(DateTime, nullable=True)
+    next_poll_at = Column(DateTime, nullable=True)
+    breaker_state = Column(String, nullable=False, default='closed')
+    breaker_open_until = Column(DateTime, nullable=True)
+    breaker_trips = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now)
+
+    # Relationships
+    source = relationship('Source', back_populates='feed_state')
+
+    def __repr__(self):
+        return f"<FeedState(source_id={self.source_id}, etag='{self.etag}')>"
+
+
+class HostBreaker(Base):
+    """
+    Circuit breaker for a feed host (e.g. 'rss.nytimes.com').
+
+    Opens after repeated network-level failures so every feed on a dead
+    host is skipped, not just the one that failed.
+    """
+    __tablename__ = 'host_breakers'
+
+    # Columns
+    host = Column(String, primary_key=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    breaker_state = Column(String, nullable=False, default='closed')
+    breaker_open_until = Column(DateTime, nullable=True)
+    breaker_trips = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<HostBreaker(host='{self.host}', state='{self.breaker_state}')>"
+
+
 class User(Base):
     """
     User model for authentication.
@@ -93,3 +203,137 @@ class User(Base):
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}')>"
 
+
+class ArticleSignature(Base):
+    """
+    MinHash signature of an article's title + description (database/minhash.py).
+
+    Rows exist for every fingerprinted article, so new ones are found with
+    an anti-join; signature is NULL when the article had no text.
+    """
+    __tablename__ = 'article_signatures'
+
+    # Columns (no foreign key: article IDs are checked at indexing time)
+    article_id = Column(Integer, primary_key=True)
+    signature = Column(LargeBinary, nullable=True)
+    indexed_at = Column(DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f"<ArticleSignature(article_id={self.article_id})>"
+
+
+class ArticleLshBand(Base):
+    """LSH bucket of an article: articles sharing (band, band_hash) are compared."""
+    __tablename__ = 'article_lsh_bands'
+
+    # Columns
+    band = Column(SmallInteger, primary_key=True)
+    band_hash = Column(BigInteger, primary_key=True)
+    article_id = Column(Integer, primary_key=True, index=True)
+    published_at = Column(DateTime, nullable=False, index=True)  # The article's, for pruning
+
+    def __repr__(self):
+        return f"<ArticleLshBand(band={self.band}, article_id={self.article_id})>"
+
+
+class ArticleSimilarity(Base):
+    """
+    Near-duplicate pair, stored once with article_id > similar_id.
+
+    similarity is the estimated Jaccard similarity of the two articles'
+    shingle sets.
+    """
+    __tablename__ = 'article_similarities'
+
+    # Columns
+    article_id = Column(Integer, primary_key=True)
+    similar_id = Column(Integer, primary_key=True, index=True)
+    similarity = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ArticleSimilarity({self.article_id}~{self.similar_id}, {self.similarity:.2f})>"
+
+
+class NearDuplicateState(Base):
+    """
+    High-water mark of the near-duplicate indexer (a single row).
+
+    Every article ID up to indexed_through is fingerprinted.
+    pending_through becomes indexed_through once every transaction that
+    was running at pending_xmax has finished, so an article committed
+    late, under a lower ID, is still found above the mark.
+    """
+    __tablename__ = 'near_duplicate_state'
+
+    # Columns
+    id = Column(Boolean, primary_key=True, default=True)
+    indexed_through = Column(Integer, nullable=False, default=0)
+    pending_through = Column(Integer, nullable=True)
+    pending_xmax = Column(BigInteger, nullable=True)
+
+    def __repr__(self):
+        return f"<NearDuplicateState(indexed_through={self.indexed_through})>"
+
+
+class StoryCluster(Base):
+    """
+    One story (event) covered by one or more articles, usually from several outlets.
+
+    Summary columns are recomputed from the members whenever they change
+    (database/stories.py).
+
+    Relationships:
+        members: Article memberships of the story
+    """
+    __tablename__ = 'story_clusters'
+
+    # Columns
+    id = Column(Integer, primary_key=True)
+    seed_article_id = Column(Integer, nullable=False)
+    title = Column(Text, nullable=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    source_count = Column(Integer, nullable=False, default=0)
+    first_published_at = Column(DateTime, nullable=True)
+    last_published_at = Column(DateTime, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
+
+    # Relationships
+    members = relationship('ArticleStory', back_populates='cluster', cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f"<StoryCluster(id={self.id}, articles={self.article_count}, title='{self.title}')>"
+
+
+class ArticleStory(Base):
+    """Membership of an article in a story cluster (at most one per article)."""
+    __tablename__ = 'article_stories'
+
+    # Columns
+    article_id = Column(Integer, primary_key=True)
+    cluster_id = Column(Integer, ForeignKey('story_clusters.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Relationships
+    cluster = relationship('StoryCluster', back_populates='members')
+
+    def __repr__(self):
+        return f"<ArticleStory(article_id={self.article_id}, cluster_id={self.cluster_id})>"
+
+
+class SourceDailyCount(Base):
+    """
+    Articles per source and publish hour (UTC), kept current by the loaders.
+
+    Updated in the same statement as every article insert and cleared with
+    a source's articles, so stats never have to scan the articles table.
+    """
+    __tablename__ = 'source_daily_counts'
+
+    # Columns
+    source_id = Column(Integer, ForeignKey('sources.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    hour = Column(SmallInteger, primary_key=True)
+    articles = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SourceDailyCount(source_id={self.source_id}, {self.day} {self.hour:02d}h: {self.articles})>"
@@ -0,0 +1,363 @@
+"""
+Incremental near-duplicate indexing of articles (MinHash + LSH).
+
+Every article gets a MinHash signature (database/minhash.py) stored in
+article_signatures and one row per LSH band in article_lsh_bands. New
+articles are looked up in the buckets of their bands, compared with the
+articles found there (and with each other) and pairs at or above
+near_duplicate_threshold are stored in article_similarities and folded
+into story clusters (database/stories.py) in the same transaction.
+
+Each article is fingerprinted once, so a run only costs as much as the
+articles scraped since the previous one: it reads the IDs above a
+high-water mark (near_duplicate_state), which only moves past an ID once
+no transaction that could still commit a lower one is running. Buckets
+of articles published more than near_duplicate_window_days ago are
+pruned: a story is re-published by other outlets within days, not
+months, and the band table is the big one (minhash_bands rows per
+article).
+
+Usage:
+    python -m database.near_duplicates                   # Index everything new
+    python -m database.near_duplicates --batch-size 5000
+    python -m database.near_duplicates --reindex         # Drop everything and start over
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from config import get_settings
+from database.db import get_session
+from database.minhash import (
+    article_text,
+    band_hashes,
+    candidate_pairs,
+    from_bytes,
+    make_permutations,
+    minhash_signatures,
+    pair_similarities,
+    shingles,
+    to_bytes,
+)
+from database.stories import assign_stories, unassign_articles
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# pg_try_advisory_xact_lock key: only one indexer writes at a time
+INDEX_LOCK_KEY = 7316046
+
+
+@lru_cache(maxsize=4)
+def _permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    return make_permutations(num_perm)
+
+
+def fingerprint(texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Signatures and LSH band keys of a batch of article texts.
+
+    Returns:
+        (signatures, band keys, mask of texts that had any words)
+    """
+    shingle_sets = [shingles(t) for t in texts]
+    signatures = minhash_signatures(shingle_sets, _permutations(settings.minhash_num_perm))
+    bands = band_hashes(signatures, settings.minhash_bands)
+    has_text = np.array([len(s) > 0 for s in shingle_sets], dtype=bool)
+    return signatures, bands, has_text
+
+
+def _stored_candidates(session: Session, positions: np.ndarray, bands: np.ndarray) -> np.ndarray:
+    """
+    Stored articles sharing a bucket with the batch.
+
+    Returns:
+        Array of (position in batch, stored article ID) rows
+    """
+    count = len(positions)
+    result = session.execute(text("""
+        SELECT DISTINCT q.position, b.article_id
+        FROM unnest(CAST(:positions AS integer[]), CAST(:bands AS smallint[]), CAST(:hashes AS bigint[]))
+            AS q(position, band, band_hash)
+        CROSS JOIN LATERAL (
+            SELECT article_id FROM article_lsh_bands lb
+            WHERE lb.band = q.band AND lb.band_hash = q.band_hash
+            ORDER BY article_id DESC
+            LIMIT :max_bucket
+        ) b
+    """), {
+        'positions': np.repeat(positions, bands.shape[1]).tolist(),
+        'bands': np.tile(np.arange(bands.shape[1]), count).tolist(),
+        'hashes': bands[positions].ravel().tolist(),
+        'max_bucket': settings.near_duplicate_max_bucket,
+    }).all()
+    return np.array(result, dtype=np.int64).reshape(-1, 2)
+
+
+def _stored_signatures(session: Session, article_ids: list[int]) -> dict:
+    """Signatures of stored articles by ID (articles without text are left out)."""
+    rows = session.execute(text("""
+        SELECT article_id, signature FROM article_signatures
+        WHERE article_id = ANY(:ids) AND signature IS NOT NULL
+    """), {'ids': article_ids})
+    return {row.article_id: from_bytes(row.signature) for row in rows}
+
+
+def _match_batch(session: Session, ids: np.ndarray, signatures: np.ndarray, bands: np.ndarray,
+                 has_text: np.ndarray) -> dict:
+    """
+    Near-duplicate pairs of a batch, among itself and with stored articles.
+
+    Returns:
+        Dictionary (newer ID, older ID) -> similarity
+    """
+    threshold = settings.near_duplicate_threshold
+    positions = np.flatnonzero(has_text)
+    pairs: dict = {}
+    if not len(positions):
+        return pairs
+
+    # Within the batch
+    local = candidate_pairs(bands[positions], settings.near_duplicate_max_bucket)
+    if len(local):
+        local = positions[local]
+        scores = pair_similarities(signatures, local)
+        for (i, j), score in zip(local[scores >= threshold], scores[scores >= threshold]):
+            pairs[(int(max(ids[i], ids[j])), int(min(ids[i], ids[j])))] = float(score)
+
+    # With what is already indexed
+    candidates = _stored_candidates(session, positions, bands)
+    if len(candidates):
+        stored = _stored_signatures(session, np.unique(candidates[:, 1]).tolist())
+        candidates = candidates[[article_id in stored for article_id in candidates[:, 1]]]
+    if len(candidates):
+        others = np.stack([stored[article_id] for article_id in candidates[:, 1]])
+        scores = (signatures[candidates[:, 0]] == others).mean(axis=1)
+        for (position, other_id), score in zip(candidates[scores >= threshold], scores[scores >= threshold]):
+            article_id = int(ids[position])
+            if article_id != other_id:
+                pairs[(max(article_id, int(other_id)), min(article_id, int(other_id)))] = float(score)
+
+    return pairs
+
+
+def index_batch(session: Session, batch_size: int) -> tuple[int, int, int]:
+    """
+    Fingerprint, match and cluster one batch of articles that have no signature yet.
+
+    Returns:
+        (articles indexed, near-duplicate pairs stored, story clusters changed)
+    """
+    rows = session.execute(text("""
+        SELECT a.id, a.title, a.description, a.published_at
+        FROM articles a
+        WHERE a.id > (SELECT COALESCE(MAX(indexed_through), 0) FROM near_duplicate_state)
+          AND NOT EXISTS (SELECT 1 FROM article_signatures s WHERE s.article_id = a.id)
+        ORDER BY a.id
+        LIMIT :limit
+    """), {'limit': batch_size}).all()
+    if not rows:
+        return 0, 0, 0
+
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    signatures, bands, has_text = fingerprint([article_text(row.title, row.description) for row in rows])
+    pairs = _match_batch(session, ids, signatures, bands, has_text)
+
+    session.execute(text("""
+        INSERT INTO article_signatures (article_id, signature)
+        SELECT * FROM unnest(CAST(:ids AS integer[]), CAST(:signatures AS bytea[]))
+        ON CONFLICT (article_id) DO NOTHING
+    """), {
+        'ids': ids.tolist(),
+        'signatures': [to_bytes(sig) if ok else None for sig, ok in zip(signatures, has_text)],
+    })
+
+    positions = np.flatnonzero(has_text)
+    if len(positions):
+        num_bands = bands.shape[1]
+        published = [rows[position].published_at for position in positions]
+        session.execute(text("""
+            INSERT INTO article_lsh_bands (band, band_hash, article_id, published_at)
+            SELECT * FROM unnest(CAST(:bands AS smallint[]), CAST(:hashes AS bigint[]),
+                                 CAST(:ids AS integer[]), CAST(:published AS timestamp[]))
+            ON CONFLICT DO NOTHING
+        """), {
+            'bands': np.tile(np.arange(num_bands), len(positions)).tolist(),
+            'hashes': bands[positions].ravel().tolist(),
+            'ids': np.repeat(ids[positions], num_bands).tolist(),
+            'published': [published_at for published_at in published for _ in range(num_bands)],
+        })
+
+    if pairs:
+        session.execute(text("""
+            INSERT INTO article_similarities (article_id, similar_id, similarity)
+            SELECT * FROM unnest(CAST(:ids AS integer[]), CAST(:similar AS integer[]), CAST(:scores AS real[]))
+            ON CONFLICT (article_id, similar_id) DO NOTHING
+        """), {
+            'ids': [pair[0] for pair in pairs],
+            'similar': [pair[1] for pair in pairs],
+            'scores': list(pairs.values()),
+        })
+
+    stories = assign_stories(session, pairs)
+    return len(rows), len(pairs), len(stories)
+
+
+def prune_lsh_bands(session: Session, days: int) -> int:
+    """
+    Drop the LSH buckets of articles published more than `days` ago.
+
+    Their signatures and pairs stay; they just stop being match candidates.
+
+    Returns:
+        Number of bucket rows deleted
+    """
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    # On the band rows' own publish time: article IDs don't follow publish
+    # order (backfills, late-published entries)
+    result = session.execute(text("""
+        DELETE FROM article_lsh_bands WHERE published_at < :cutoff
+    """), {'cutoff': cutoff})
+    return result.rowcount  # type: ignore[attr-defined]
+
+
+def advance_high_water_mark(session: Session) -> int:
+    """
+    Move the indexer's high-water mark up as far as is safe.
+
+    IDs come from a sequence when a row is inserted, but become visible
+    when its transaction commits, so a long COPY can commit IDs below
+    ones already indexed. The highest indexed ID is therefore only noted
+    as pending, with the current snapshot's xmax; a later run promotes it
+    once the oldest running transaction started after that (every
+    transaction that could have held a lower ID has ended by then). A
+    pending mark is kept until it settles, so busy writers can't keep
+    pushing it out of reach.
+
+    Returns:
+        indexed_through after the update
+    """
+    state = session.execute(text("""
+        SELECT indexed_through, pending_through, pending_xmax FROM near_duplicate_state
+    """)).first()
+    indexed_through = state.indexed_through if state else 0
+    snapshot = session.execute(text("""
+        SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS xmin,
+               pg_snapshot_xmax(pg_current_snapshot())::text::bigint AS xmax
+    """)).one()
+
+    if state and state.pending_through is not None:
+        if snapshot.xmin < state.pending_xmax:
+            return indexed_through  # Not settled yet
+        indexed_through = max(indexed_through, state.pending_through)
+
+    pending_through = session.execute(text("""
+        SELECT MAX(article_id) FROM article_signatures WHERE article_id > :indexed_through
+    """), {'indexed_through': indexed_through}).scalar()
+
+    session.execute(text("""
+        INSERT INTO near_duplicate_state (id, indexed_through, pending_through, pending_xmax)
+        VALUES (TRUE, :indexed_through, :pending_through, :pending_xmax)
+        ON CONFLICT (id) DO UPDATE SET
+            indexed_through = EXCLUDED.indexed_through,
+            pending_through = EXCLUDED.pending_through,
+            pending_xmax = EXCLUDED.pending_xmax
+    """), {
+        'indexed_through': indexed_through,
+        'pending_through': pending_through,
+        'pending_xmax': snapshot.xmax if pending_through is not None else None,
+    })
+    return indexed_through
+
+
+def forget_articles(session: Session, article_ids_sql: str, params: dict | None = None) -> None:
+    """
+    Drop the fingerprints, pairs and story memberships of articles (before deleting them).
+
+    Args:
+        session: Database session
+        article_ids_sql: SELECT returning the IDs of the articles
+        params: Its bind parameters
+    """
+    unassign_articles(session, article_ids_sql, params)
+    params = params or {}
+    session.execute(text(f"""
+        DELETE FROM article_similarities
+        WHERE article_id IN ({article_ids_sql}) OR similar_id IN ({article_ids_sql})
+    """), params)
+    session.execute(text(f"DELETE FROM article_lsh_bands WHERE article_id IN ({article_ids_sql})"), params)
+    session.execute(text(f"DELETE FROM article_signatures WHERE article_id IN ({article_ids_sql})"), params)
+
+
+def forget_source(session: Session, source_id: int) -> None:
+    """Drop the fingerprints, pairs and story memberships of a source's articles (before deleting them)."""
+    forget_articles(session, "SELECT id FROM articles WHERE source_id = :source_id", {'source_id': source_id})
+
+
+def reset_index() -> None:
+    """Drop all fingerprints, pairs and story clusters (the next run re-indexes every article)."""
+    with get_session() as session:
+        session.execute(text("""
+            TRUNCATE article_signatures, article_lsh_bands, article_similarities,
+                     article_stories, story_clusters, near_duplicate_state RESTART IDENTITY
+        """))
+
+
+def index_new_articles(batch_size: int | None = None) -> dict:
+    """
+    Fingerprint and cluster every article scraped since the last run, one transaction per batch.
+
+    Skips the run if another indexer holds the lock (two would match the
+    same new articles against each other's half-written batches).
+
+    Args:
+        batch_size: Articles per batch (defaults to settings.near_duplicate_batch)
+
+    Returns:
+        Dictionary with indexed, pairs, stories and pruned counts
+    """
+    batch_size = batch_size or settings.near_duplicate_batch
+    totals = {'indexed': 0, 'pairs': 0, 'stories': 0, 'pruned': 0}
+
+    while True:
+        with get_session() as session:
+            locked = session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {'key': INDEX_LOCK_KEY}
+            ).scalar()
+            if not locked:
+                logger.info("Near-duplicate indexing already running, skipping")
+                return totals
+            indexed, pairs, stories = index_batch(session, batch_size)
+            if indexed < batch_size:
+                # Caught up: settle the high-water mark while still holding the lock
+                advance_high_water_mark(session)
+        totals['indexed'] += indexed
+        totals['pairs'] += pairs
+        totals['stories'] += stories
+        if indexed < batch_size:
+            break
+
+    if totals['indexed']:
+        with get_session() as session:
+            totals['pruned'] = prune_lsh_bands(session, settings.near_duplicate_window_days)
+        logger.info(f"Near-duplicates: {totals['indexed']} articles indexed, {totals['pairs']} pairs found, "
+                    f"{totals['stories']} stories updated, {totals['pruned']} old buckets pruned")
+    return totals
+
+
+if __name__ == "__main__":
+    settings.setup_logging()
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--batch-size', type=int, default=None)
+    arg_parser.add_argument('--reindex', action='store_true')
+    args = arg_parser.parse_args()
+
+    if args.reindex:
+        reset_index()
+
+    counts = index_new_articles(args.batch_size)
+    logger.info(f"✅ Indexed {counts['indexed']} articles, {counts['pairs']} near-duplicate pairs, "
+                f"{counts['stories']} stories")
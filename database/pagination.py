@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination for newest-first article listings.
+
+A page is ordered by (published_at DESC, id DESC); its cursor encodes
+the (published_at, id) of its last row and the next page starts strictly
+after it. Unlike OFFSET, fetching page 1000 costs the same index range
+scan as page one, and rows inserted meanwhile don't shift the pages.
+
+Cursors are opaque to clients (URL-safe base64) and returned in the
+X-Next-Cursor response header; there is no next page when it is absent.
+
+Ranked results (full-text search, fuzzy title/author lookups) are
+ordered by (score DESC, id DESC) instead and use their own cursors
+(encode_search_cursor).
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Callable
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+def encode_cursor(published_at: datetime, article_id: int) -> str:
+    """Opaque cursor pointing just past (published_at, article_id)."""
+    raw = f"{published_at.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Inverse of encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        published_at, article_id = raw.split('|')
+        return datetime.fromisoformat(published_at), int(article_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_search_cursor(rank: float, article_id: int) -> str:
+    """Opaque cursor pointing just past (rank, article_id) of a search result."""
+    # repr() round-trips the float exactly, so the next page starts at the same rank
+    raw = f"{rank!r}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Inverse of encode_search_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        rank, article_id = raw.split('|')
+        return float(rank), int(article_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_filter(published_column, id_column, after: tuple[datetime, int]):
+    """
+    WHERE clause for the rows after a cursor position, newest first.
+
+    Spelled out instead of a row comparison so the single-column
+    published_at indexes can serve the range: published_at <= p is the
+    index condition, the id tie-break only applies within one timestamp.
+    """
+    published_at, article_id = after
+    return and_(
+        published_column <= published_at,
+        or_(published_column < published_at, id_column < article_id),
+    )
+
+
+def paginate(rows: list[dict], limit: int,
+             cursor_for: Callable[[dict], str] | None = None) -> tuple[list[dict], str | None]:
+    """
+    Split a limit + 1 row fetch into the page and the next page's cursor.
+
+    Args:
+        rows: Up to limit + 1 rows with 'published_at' and 'id', newest first
+        limit: Page size
+        cursor_for: Cursor of a page's last row, for other orders (default: encode_cursor)
+
+    Returns:
+        (page rows, cursor of the next page or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    if cursor_for:
+        return page, cursor_for(page[-1])
+    return page, encode_cursor(page[-1]['published_at'], page[-1]['id'])
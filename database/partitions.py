@@ -0,0 +1,387 @@
+"""
+Monthly partitions of the articles table: creation, retention, plans.
+
+articles is range-partitioned on published_at, one partition per month
+(articles_YYYY_MM) plus articles_default for rows no month covers. Every
+read filters or sorts on published_at, so the planner skips the months a
+query can't touch, and retiring a month is a DETACH/DROP of one table
+instead of a DELETE of millions of rows.
+
+- ensure_partitions keeps partition_months_ahead months created in
+  advance, and gives months that collected rows in the default partition
+  their own partition
+- apply_retention retires the months wholly older than
+  article_retention_months: detached and renamed articles_YYYY_MM_retiring
+  in a short transaction, then their
+  fingerprints and story memberships are cleaned up and the table is
+  dropped, kept standalone (partition_retention_action='detach') or
+  exported to the cold archive first ('archive', database/archive.py)
+
+URL dedup doesn't depend on the partitions: article_urls keeps the URLs
+of retired months, so their articles aren't scraped again.
+
+Usage:
+    python -m database.partitions            # Create upcoming partitions, apply retention
+    python -m database.partitions --explain  # Show the /articles plans and the partitions they scan
+"""
+import argparse
+import logging
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from config import get_settings
+from database.archive import export_articles
+from database.db import engine, get_session, get_session_no_commit
+from database.near_duplicates import forget_articles
+from database.utils import ARTICLE_COLUMNS, articles_by_source_query, recent_articles_query
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# pg_try_advisory_lock key: only one maintenance run at a time
+PARTITION_LOCK_KEY = 7316047
+DEFAULT_PARTITION = 'articles_default'
+# Suffix of months detached by apply_retention whose cleanup isn't done yet
+RETIRING_SUFFIX = '_retiring'
+# Suffix of retired months kept with partition_retention_action='detach'
+DETACHED_SUFFIX = '_detached'
+
+_PARTITION_NAME = re.compile(r'^articles_(\d{4})_(\d{2})$')
+_RETIRING_NAME = re.compile(rf'^articles_\d{{4}}_\d{{2}}{RETIRING_SUFFIX}$')
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the month that starts on `month`."""
+    return f"articles_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """First day of a monthly partition's month (None for other tables)."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _this_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def list_partitions(session: Session) -> list[str]:
+    """Names of the monthly partitions attached to articles, oldest first."""
+    names = session.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'articles'::regclass
+    """)).scalars()
+    return sorted(name for name in names if partition_month(name))
+
+
+def _retiring_partitions(session: Session) -> list[str]:
+    """
+    Months detached by apply_retention whose cleanup hasn't finished.
+
+    Only the tables it renamed articles_YYYY_MM_retiring: a standalone
+    articles_YYYY_MM created or restored by hand is never touched.
+    """
+    names = session.execute(text("""
+        SELECT relname FROM pg_class
+        WHERE relkind = 'r' AND NOT relispartition AND pg_table_is_visible(oid)
+          AND relname LIKE 'articles%'
+    """)).scalars()
+    return sorted(name for name in names if _RETIRING_NAME.match(name))
+
+
+@contextmanager
+def _maintenance_lock() -> Iterator[bool]:
+    """
+    Hold the maintenance advisory lock for the whole block, if it is free.
+
+    Session-level, on a connection of its own: retention spans several
+    transactions, and a transaction-level lock would be released after
+    the first one.
+
+    Yields:
+        True if the lock was taken, False if another run holds it
+    """
+    with engine.connect() as connection:
+        locked = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {'key': PARTITION_LOCK_KEY}
+        ).scalar()
+        connection.commit()  # Not left idle in transaction meanwhile
+        try:
+            yield locked
+        finally:
+            if locked:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': PARTITION_LOCK_KEY})
+                connection.commit()
+
+
+def create_partition(session: Session, month: date) -> str:
+    """
+    Create the partition of one month.
+
+    Rows of that month already sitting in the default partition are moved
+    into it (Postgres refuses to create it otherwise); the default
+    partition is detached meanwhile, which is cheap as long as it stays
+    small.
+
+    Returns:
+        Name of the new partition
+    """
+    name = partition_name(month)
+    bounds = {'start': month, 'end': add_months(month, 1)}
+    create = (f"CREATE TABLE {name} PARTITION OF articles "
+              f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')")
+
+    stray = session.execute(text(f"""
+        SELECT EXISTS (
+            SELECT 1 FROM {DEFAULT_PARTITION} WHERE published_at >= :start AND published_at < :end
+        )
+    """), bounds).scalar()
+    if not stray:
+        session.execute(text(create))
+        return name
+
+    # Generated columns (search_vector) are recomputed, not copied
+    columns = ', '.join(('id', 'scraped_at') + ARTICLE_COLUMNS)
+    session.execute(text(f"ALTER TABLE articles DETACH PARTITION {DEFAULT_PARTITION}"))
+    session.execute(text(create))
+    moved = session.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE published_at >= :start AND published_at < :end
+            RETURNING {columns}
+        )
+        INSERT INTO articles ({columns}) SELECT {columns} FROM moved
+    """), bounds).rowcount  # type: ignore[attr-defined]
+    session.execute(text(f"ALTER TABLE articles ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    logger.info(f"Moved {moved} articles from {DEFAULT_PARTITION} into {name}")
+    return name
+
+
+def ensure_partitions(session: Session, months_ahead: int | None = None) -> list[str]:
+    """
+    Create the missing partitions from this month to `months_ahead` months ahead.
+
+    Past months that collected rows in the default partition (late or
+    backdated articles) get their partition too, unless retention is
+    about to retire them.
+
+    Args:
+        session: Database session
+        months_ahead: Defaults to settings.partition_months_ahead
+
+    Returns:
+        Names of the partitions created
+    """
+    months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+    this_month = _this_month()
+    wanted = {add_months(this_month, n) for n in range(months_ahead + 1)}
+
+    oldest_kept = add_months(this_month, -settings.article_retention_months) \
+        if settings.article_retention_months else date.min
+    stray_months = session.execute(text(f"""
+        SELECT DISTINCT date_trunc('month', published_at)::date FROM {DEFAULT_PARTITION}
+        WHERE published_at < :horizon
+    """), {'horizon': add_months(this_month, months_ahead + 1)}).scalars()
+    wanted.update(month for month in stray_months if month >= oldest_kept)
+
+    existing = set(list_partitions(session))
+    return [
+        create_partition(session, month)
+        for month in sorted(wanted)
+        if partition_name(month) not in existing
+    ]
+
+
+def _retire(session: Session, name: str, action: str) -> None:
+    """Clean up after a detached month, then drop it (archived first) or keep it standalone."""
+    if action == 'archive':
+        # Rewrites the month's files if an interrupted run got this far before
+        export_articles(session, name)
+    forget_articles(session, f"SELECT id FROM {name}")
+    if action in ('drop', 'archive'):
+        session.execute(text(f"DROP TABLE {name}"))
+    else:
+        kept = name.removesuffix(RETIRING_SUFFIX) + DETACHED_SUFFIX
+        session.execute(text(f"ALTER TABLE {name} RENAME TO {kept}"))
+
+
+def apply_retention(retention_months: int | None = None, action: str | None = None) -> list[str]:
+    """
+    Retire the monthly partitions wholly older than `retention_months` months.
+
+    The months are detached and renamed articles_YYYY_MM_retiring,
+    together with the removal of their source_daily_counts rows, in a
+    short transaction: detaching takes the table lock but doesn't touch
+    the rows. Their near-duplicate and story rows are then removed one
+    month per transaction, before the table is dropped or renamed to
+    articles_YYYY_MM_detached. A month left _retiring by an interrupted
+    run is picked up by the next one. Expired rows in the default
+    partition are deleted outright (archived first with 'archive').
+
+    Archived articles still count in source_daily_counts, so stats and
+    timelines keep covering them.
+
+    The maintenance lock is held until the last month is retired, so two
+    runs never retire the same table.
+
+    Args:
+        retention_months: Defaults to settings.article_retention_months (0 = keep everything)
+        action: 'drop', 'detach' or 'archive', defaults to settings.partition_retention_action
+
+    Returns:
+        Names of the partitions retired
+    """
+    with _maintenance_lock() as locked:
+        if not locked:
+            logger.info("Partition retention already running, skipping")
+            return []
+        return _apply_retention(retention_months, action)
+
+
+def _apply_retention(retention_months: int | None, action: str | None) -> list[str]:
+    """apply_retention, with the maintenance lock already held."""
+    retention_months = settings.article_retention_months if retention_months is None else retention_months
+    action = action or settings.partition_retention_action
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(_this_month(), -retention_months)
+    params = {'cutoff': cutoff}
+
+    with get_session() as session:
+        expired = [name for name in list_partitions(session) if partition_month(name) < cutoff]
+        for name in expired:
+            session.execute(text(f"ALTER TABLE articles DETACH PARTITION {name}"))
+            session.execute(text(f"ALTER TABLE {name} RENAME TO {name}{RETIRING_SUFFIX}"))
+        if action != 'archive':
+            session.execute(text("DELETE FROM source_daily_counts WHERE day < :cutoff"), params)
+
+        if action == 'archive':
+            # Day files of their own: the ones of an archived month are already complete
+            export_articles(session, DEFAULT_PARTITION, "a.published_at < :cutoff", params,
+                            tag=f".{datetime.now(timezone.utc):%Y%m%d%H%M%S}")
+        stray = f"SELECT id FROM {DEFAULT_PARTITION} WHERE published_at < :cutoff"
+        forget_articles(session, stray, params)
+        session.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE published_at < :cutoff"), params)
+
+    with get_session_no_commit() as session:
+        pending = _retiring_partitions(session)
+    retired = []
+    for name in pending:
+        with get_session() as session:
+            _retire(session, name, action)
+        retired.append(name.removesuffix(RETIRING_SUFFIX))
+        logger.info(f"Retired partition {retired[-1]} ({action})")
+    return retired
+
+
+def maintain_partitions() -> dict:
+    """
+    Create upcoming partitions and apply retention (the periodic job).
+
+    Skips the run if another one holds the lock.
+
+    Returns:
+        Dictionary with the created and retired partition names
+    """
+    with _maintenance_lock() as locked:
+        if not locked:
+            logger.info("Partition maintenance already running, skipping")
+            return {'created': [], 'retired': []}
+        with get_session() as session:
+            created = ensure_partitions(session)
+        retired = _apply_retention(None, None)
+
+    if created or retired:
+        logger.info(f"Partitions: created {created or 'none'}, retired {retired or 'none'}")
+    return {'created': created, 'retired': retired}
+
+
+def explain_article_queries(session: Session) -> dict:
+    """
+    EXPLAIN ANALYZE the queries behind GET /articles, as the API sends them.
+
+    Values are interpolated client-side by psycopg2, as on every API
+    request, so the planner sees literal dates and can prune at plan
+    time. Partitions the executor never opened show as "(never executed)".
+
+    Returns:
+        Dictionary of query name -> plan lines
+    """
+    source_name = session.execute(text("SELECT name FROM sources ORDER BY id LIMIT 1")).scalar() or ''
+    now = datetime.now()
+    queries = {
+        'GET /articles': recent_articles_query(20),
+        'GET /articles (page from 45 days ago)': recent_articles_query(20, (now - timedelta(days=45), 2 ** 31 - 1)),
+        f"GET /articles?source_name={source_name}&days=7": articles_by_source_query(source_name, 7, 500),
+    }
+
+    plans = {}
+    cursor = session.connection().connection.cursor()
+    try:
+        for name, query in queries.items():
+            compiled = query.compile(dialect=session.get_bind().dialect)
+            cursor.execute("EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY OFF) " + str(compiled), compiled.params)
+            plans[name] = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    return plans
+
+
+def scanned_partitions(plan: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Partitions a plan reads and the ones it lists but never executed.
+
+    Returns:
+        (scanned partition names, skipped partition names)
+    """
+    scanned, skipped = [], []
+    for line in plan:
+        match = re.search(r' on (articles_\w+)', line)
+        if match:
+            (skipped if 'never executed' in line else scanned).append(match[1])
+    return sorted(set(scanned)), sorted(set(skipped) - set(scanned))
+
+
+def print_plans() -> None:
+    """Print the /articles plans with a summary of the partitions each one touches."""
+    with get_session_no_commit() as session:
+        partitions = list_partitions(session)
+        plans = explain_article_queries(session)
+
+    print("=" * 70)
+    print(f"articles: {len(partitions)} monthly partitions "
+          f"({partitions[0] if partitions else '-'} .. {partitions[-1] if partitions else '-'}) + {DEFAULT_PARTITION}")
+    print("=" * 70)
+    for name, plan in plans.items():
+        scanned, skipped = scanned_partitions(plan)
+        pruned = len(partitions) + 1 - len(scanned) - len(skipped)
+        print(f"\n{name}")
+        print(f"  scanned: {', '.join(scanned) or 'none'}")
+        print(f"  never executed: {len(skipped)}, pruned at plan time: {pruned}")
+        for line in plan:
+            print(f"    {line}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    settings.setup_logging()
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--explain', action='store_true', help="Show the /articles plans instead")
+    args = arg_parser.parse_args()
+
+    if args.explain:
+        print_plans()
+    else:
+        result = maintain_partitions()
+        logger.info(f"✅ Partitions created: {len(result['created'])}, retired: {len(result['retired'])}")
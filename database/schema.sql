@@ -1,4 +1,18 @@
 -- Database schema for news article aggregation
+-- Trigram operators and index classes (fuzzy title/author lookups)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DROP TABLE IF EXISTS feed_state;
+DROP TABLE IF EXISTS host_breakers;
+DROP TABLE IF EXISTS source_daily_counts;
+DROP TABLE IF EXISTS article_stories;
+DROP TABLE IF EXISTS story_clusters;
+DROP TABLE IF EXISTS article_similarities;
+DROP TABLE IF EXISTS article_lsh_bands;
+DROP TABLE IF EXISTS near_duplicate_state;
+DROP TABLE IF EXISTS article_signatures;
+DROP TABLE IF EXISTS url_release_state;
+DROP TABLE IF EXISTS article_urls;
 DROP TABLE IF EXISTS articles;
 DROP TABLE IF EXISTS sources;
 
@@ -11,9 +25,9 @@ CREATE TABLE sources (
     political_leaning TEXT
 );
 
--- Articles table
+-- Articles table, range-partitioned by month on published_at (database/partitions.py)
 CREATE TABLE articles (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     source_id INTEGER NOT NULL,
     title TEXT NOT NULL,
     description TEXT,  -- Short summary from RSS (usually available)
@@ -21,8 +35,138 @@ CREATE TABLE articles (
     author TEXT,
     published_at TIMESTAMP NOT NULL,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,  -- Normalized (database/urls.py)
+    url_hash BIGINT NOT NULL,  -- 64-bit hash of the normalized URL (unique through article_urls)
+    search_vector TSVECTOR GENERATED ALWAYS AS (  -- Full-text search document (GET /articles/search)
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', left(coalesce(content, ''), 100000)), 'C')
+    ) STORED,
+    PRIMARY KEY (id, published_at),  -- Must contain the partition key
     FOREIGN KEY (source_id) REFERENCES sources(id)
+) PARTITION BY RANGE (published_at);
+
+-- Catches rows no monthly partition covers (far-off publish dates)
+CREATE TABLE articles_default PARTITION OF articles DEFAULT;
+
+-- Monthly partitions articles_YYYY_MM from last month to 3 months ahead;
+-- python -m database.partitions (run daily by beat) creates the next ones
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(date_trunc('month', now()) - INTERVAL '1 month',
+                               date_trunc('month', now()) + INTERVAL '3 months',
+                               INTERVAL '1 month')::date
+    LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF articles FOR VALUES FROM (%L) TO (%L)',
+                       'articles_' || to_char(month, 'YYYY_MM'), month, (month + INTERVAL '1 month')::date);
+    END LOOP;
+END $$;
+
+-- Deduplication key of every stored article. A unique index on the
+-- partitioned table would have to include published_at, so URLs are
+-- claimed here (ON CONFLICT DO NOTHING) before the article is inserted
+CREATE TABLE article_urls (
+    url_hash BIGINT PRIMARY KEY,
+    published_at TIMESTAMP NOT NULL  -- Of the article that claimed the URL
+);
+
+-- Bumped whenever URLs are released from article_urls (a source's articles
+-- deleted); the scrapers' seen-URL filters rebuild when it changes (one row)
+CREATE TABLE url_release_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    generation BIGINT NOT NULL DEFAULT 0
+);
+
+-- Feed state table (per-source fetch bookkeeping)
+CREATE TABLE feed_state (
+    source_id INTEGER PRIMARY KEY REFERENCES sources(id) ON DELETE CASCADE,
+    etag TEXT,            -- ETag validator from the last 200 response
+    last_modified TEXT,   -- Last-Modified validator from the last 200 response
+    content_length INTEGER,  -- Body size of the last 200 (bytes saved on a 304)
+    last_published_at TIMESTAMP,  -- Watermark: newest publish date seen (UTC)
+    recent_guids TEXT[],  -- Watermark: recent entry GUIDs/URLs, newest first
+    poll_interval INTEGER,  -- Current adaptive poll interval (seconds)
+    publish_rate DOUBLE PRECISION,  -- Moving average of new articles/hour
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    last_polled_at TIMESTAMP,  -- Last successful poll, UTC
+    next_poll_at TIMESTAMP,    -- UTC, NULL = due now
+    breaker_state TEXT NOT NULL DEFAULT 'closed',  -- closed / open / half_open
+    breaker_open_until TIMESTAMP,  -- UTC, end of the current cooldown
+    breaker_trips INTEGER NOT NULL DEFAULT 0,  -- Times opened in a row (cooldown doubles)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Host circuit breakers (skip every feed on a host that is down)
+CREATE TABLE host_breakers (
+    host TEXT PRIMARY KEY,  -- "rss.nytimes.com"
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    breaker_state TEXT NOT NULL DEFAULT 'closed',
+    breaker_open_until TIMESTAMP,
+    breaker_trips INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Near-duplicate detection (database/near_duplicates.py); no foreign keys
+-- to articles, the indexer only writes IDs it just read
+CREATE TABLE article_signatures (
+    article_id INTEGER PRIMARY KEY,
+    signature BYTEA,  -- MinHash signature, NULL = article had no text
+    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE article_lsh_bands (
+    band SMALLINT NOT NULL,
+    band_hash BIGINT NOT NULL,
+    article_id INTEGER NOT NULL,
+    published_at TIMESTAMP NOT NULL,  -- The article's, for pruning old buckets
+    PRIMARY KEY (band, band_hash, article_id)
+);
+
+-- Indexer high-water mark: every article ID up to indexed_through is
+-- fingerprinted; pending_through is promoted once every transaction
+-- running at pending_xmax has finished (a single row)
+CREATE TABLE near_duplicate_state (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    indexed_through INTEGER NOT NULL DEFAULT 0,
+    pending_through INTEGER,
+    pending_xmax BIGINT
+);
+
+CREATE TABLE article_similarities (
+    article_id INTEGER NOT NULL,  -- Newer article of the pair
+    similar_id INTEGER NOT NULL,  -- Older article of the pair
+    similarity REAL NOT NULL,     -- Estimated Jaccard similarity (0-1)
+    PRIMARY KEY (article_id, similar_id)
+);
+
+-- Articles per source and publish hour (UTC), maintained by the article loaders
+CREATE TABLE source_daily_counts (
+    source_id INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    hour SMALLINT NOT NULL,  -- 0-23
+    articles INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source_id, day, hour)
+);
+
+-- Story clusters: same event across outlets (database/stories.py)
+CREATE TABLE story_clusters (
+    id SERIAL PRIMARY KEY,
+    seed_article_id INTEGER NOT NULL,  -- Article the cluster was started from
+    title TEXT,                        -- Earliest member's title
+    article_count INTEGER NOT NULL DEFAULT 0,
+    source_count INTEGER NOT NULL DEFAULT 0,
+    first_published_at TIMESTAMP,
+    last_published_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE article_stories (
+    article_id INTEGER PRIMARY KEY,  -- An article is in at most one story
+    cluster_id INTEGER NOT NULL REFERENCES story_clusters(id) ON DELETE CASCADE
 );
 
 -- Users table (for future authentication/authorization)
@@ -44,6 +188,8 @@ CREATE TABLE users (
 -- INDEXES FOR QUERY OPTIMIZATION
 -- ==============================================
 
+-- Indexes 1-4 are created on every articles partition (and on new ones automatically)
+
 -- Index 1: Foreign Key - Articles to Sources relationship
 -- Used by: ALL queries that JOIN articles and sources
 -- Impact: Speeds up JOINs dramatically
@@ -61,14 +207,38 @@ CREATE INDEX idx_articles_published_at ON articles(published_at DESC);
 CREATE INDEX idx_articles_source_date ON articles(source_id, published_at DESC);
 -- Note: Column order matters! (source_id first, then published_at)
 
--- Index 4: Title - Duplicate detection and event clustering
--- Used by: Query 4 (duplicate detection), future full-text search
--- Impact: Fast grouping by title, find duplicate stories instantly
-CREATE INDEX idx_articles_title ON articles(title);
+-- Index 4: Title and author trigrams (GIN, pg_trgm)
+-- Used by: GET /articles?title_like=...&author=... (partial and misspelled lookups)
+-- Impact: Index scan on word similarity instead of a sequential scan with ILIKE
+CREATE INDEX idx_articles_title_trgm ON articles USING GIN (title gin_trgm_ops);
+CREATE INDEX idx_articles_author_trgm ON articles USING GIN (author gin_trgm_ops);
+
+-- Index 5: Due sources for the adaptive scheduler
+-- Used by: claim_due_sources (every scheduler tick)
+CREATE INDEX idx_feed_state_next_poll ON feed_state(next_poll_at);
+
+-- Index 6-7: Near-duplicate lookups
+-- Used by: pruning old LSH buckets, "articles similar to X"
+CREATE INDEX idx_article_lsh_bands_article ON article_lsh_bands(article_id);
+CREATE INDEX idx_article_lsh_bands_published ON article_lsh_bands(published_at);
+CREATE INDEX idx_article_similarities_similar ON article_similarities(similar_id);
+
+-- Index 8-9: Story clusters
+-- Used by: GET /stories (newest first), cluster membership lookups
+CREATE INDEX idx_story_clusters_last_published ON story_clusters(last_published_at DESC);
+CREATE INDEX idx_article_stories_cluster ON article_stories(cluster_id);
+
+-- Index 10: Timeline across all sources
+-- Used by: GET /articles/timeline (day range without a source)
+CREATE INDEX idx_source_daily_counts_day ON source_daily_counts(day);
+
+-- Index 11: Full-text search (GIN, one per articles partition)
+-- Used by: GET /articles/search (search_vector @@ query)
+CREATE INDEX idx_articles_search ON articles USING GIN (search_vector);
 
 -- Primary keys and UNIQUE constraints are already auto-indexed:
 -- - sources.id (PRIMARY KEY)
 -- - sources.name (UNIQUE)
--- - articles.id (PRIMARY KEY)
--- - articles.url (UNIQUE)
+-- - articles (id, published_at) (PRIMARY KEY, per partition)
+-- - article_urls.url_hash (PRIMARY KEY, dedup key: 8 bytes per row instead of the full URL)
 
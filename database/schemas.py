@@ -120,12 +120,78 @@ class ArticleDetail(ArticleResponse):
     scraped_at: datetime
 
 
+class SimilarArticle(ArticleResponse):
+    similarity: float = Field(description="Estimated Jaccard similarity of title + description (0-1)")
+
+
+class SearchResult(ArticleResponse):
+    rank: float = Field(description="Relevance to the query (0-1, higher is better)")
+
+
+class DuplicatePair(BaseModel):
+    id1: int
+    id2: int
+    title: str
+    title2: str
+    source1: str
+    source2: str
+    url1: str
+    url2: str
+    published1: datetime
+    published2: datetime
+    similarity: float
+
+
+class StorySource(SourceBrief):
+    articles: int
+
+
+class StoryResponse(BaseModel):
+    id: int
+    title: str | None
+    article_count: int
+    source_count: int
+    first_published_at: datetime | None
+    last_published_at: datetime | None
+    sources: list[StorySource]
+    leanings: dict[str, int] = Field(description="Number of covering sources per political leaning")
+
+
 class SourceStats(BaseModel):
     source_name: str
     total_articles: int
     articles_last_7d: int
 
 
+class TimelinePoint(BaseModel):
+    bucket: datetime = Field(description="Start of the hour or day (UTC)")
+    articles: int
+
+
+class SourceBulkCreate(BaseModel):
+    sources: list[SourceCreate] = Field(
+        min_length=1,
+        max_length=500,
+        description="Sources to create"
+    )
+    validate_feeds: bool = Field(
+        default=True,
+        description="Check every feed URL before inserting (invalid feeds are rejected)"
+    )
+
+
+class SourceRejected(BaseModel):
+    name: str
+    url: str
+    reason: str
+    latency_ms: int | None = None
+
+
+class SourceBulkResponse(BaseModel):
+    created: list[SourceResponse]
+    rejected: list[SourceRejected]
+
+
 class ScrapeResponse(BaseModel):
     message: str
     status: str
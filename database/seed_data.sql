@@ -1,5 +1,5 @@
 -- Clear existing data
-TRUNCATE articles, sources RESTART IDENTITY CASCADE;
+TRUNCATE articles, article_urls, sources RESTART IDENTITY CASCADE;
 
 -- Insert test sources
 INSERT INTO sources (name, url, country, political_leaning) VALUES
@@ -10,26 +10,36 @@ INSERT INTO sources (name, url, country, political_leaning) VALUES
     ('Reuters', 'https://www.reutersagency.com/feed/', 'UK', 'center');
 
 -- Insert test articles
-INSERT INTO articles (source_id, title, description, url, published_at) VALUES
+-- url_hash = database.urls.url_hash(url)
+INSERT INTO articles (source_id, title, description, url, url_hash, published_at) VALUES
     -- BBC articles
-    (1, 'Breaking: Election Results', 'Election results are in', 'https://bbc.com/election-1', NOW() - INTERVAL '1 hour'),
-    (1, 'Weather Update', 'Severe weather warning', 'https://bbc.com/weather-1', NOW() - INTERVAL '3 hours'),
-    (1, 'Tech Innovation', 'New AI breakthrough', 'https://bbc.com/tech-1', NOW() - INTERVAL '2 days'),
+    (1, 'Breaking: Election Results', 'Election results are in', 'https://bbc.com/election-1', 7136549504509431850, NOW() - INTERVAL '1 hour'),
+    (1, 'Weather Update', 'Severe weather warning', 'https://bbc.com/weather-1', 286760945136182823, NOW() - INTERVAL '3 hours'),
+    (1, 'Tech Innovation', 'New AI breakthrough', 'https://bbc.com/tech-1', 4864394386386739056, NOW() - INTERVAL '2 days'),
     
     -- CNN articles (including duplicate title)
-    (2, 'Breaking: Election Results', 'CNN coverage of election', 'https://cnn.com/election-1', NOW() - INTERVAL '2 hours'),
-    (2, 'Sports Update', 'Championship finals', 'https://cnn.com/sports-1', NOW() - INTERVAL '5 hours'),
-    (2, 'Market Analysis', 'Stock market trends', 'https://cnn.com/market-1', NOW() - INTERVAL '1 day'),
+    (2, 'Breaking: Election Results', 'CNN coverage of election', 'https://cnn.com/election-1', -4301332397410055502, NOW() - INTERVAL '2 hours'),
+    (2, 'Sports Update', 'Championship finals', 'https://cnn.com/sports-1', 1014122354836578516, NOW() - INTERVAL '5 hours'),
+    (2, 'Market Analysis', 'Stock market trends', 'https://cnn.com/market-1', 1115502836030271361, NOW() - INTERVAL '1 day'),
     
     -- Fox articles (including duplicate title)
-    (3, 'Breaking: Election Results', 'Fox perspective on election', 'https://fox.com/election-1', NOW() - INTERVAL '1.5 hours'),
-    (3, 'Political Commentary', 'Analysis of recent events', 'https://fox.com/politics-1', NOW() - INTERVAL '6 hours'),
+    (3, 'Breaking: Election Results', 'Fox perspective on election', 'https://fox.com/election-1', -6466039306466292875, NOW() - INTERVAL '1.5 hours'),
+    (3, 'Political Commentary', 'Analysis of recent events', 'https://fox.com/politics-1', 8470289169140498456, NOW() - INTERVAL '6 hours'),
     
     -- Al Jazeera articles
-    (4, 'Middle East Update', 'Regional developments', 'https://aljazeera.com/mideast-1', NOW() - INTERVAL '4 hours'),
-    (4, 'Climate Report', 'Global climate trends', 'https://aljazeera.com/climate-1', NOW() - INTERVAL '3 days'),
+    (4, 'Middle East Update', 'Regional developments', 'https://aljazeera.com/mideast-1', -7031304862355372065, NOW() - INTERVAL '4 hours'),
+    (4, 'Climate Report', 'Global climate trends', 'https://aljazeera.com/climate-1', -8218575103397575753, NOW() - INTERVAL '3 days'),
     
     -- Reuters has NO recent articles (for testing inactive sources)
-    (5, 'Old Article', 'This is old', 'https://reuters.com/old-1', NOW() - INTERVAL '2 days');
+    (5, 'Old Article', 'This is old', 'https://reuters.com/old-1', 5746953515439512561, NOW() - INTERVAL '2 days');
 
-    
\ No newline at end of file
+
+-- URL claims (the loaders write them before each article; raw inserts don't)
+INSERT INTO article_urls (url_hash, published_at)
+SELECT url_hash, published_at FROM articles;
+
+-- Article counts rollup (the loaders in database/utils.py maintain it; raw inserts don't)
+INSERT INTO source_daily_counts (source_id, day, hour, articles)
+SELECT source_id, published_at::date, EXTRACT(HOUR FROM published_at)::smallint, COUNT(*)
+FROM articles
+GROUP BY 1, 2, 3;
@@ -0,0 +1,140 @@
+"""
+Story clusters: articles from different outlets about the same event.
+
+Clusters are built from the near-duplicate pairs of the indexer
+(database/near_duplicates.py), in the same transaction, so they grow as
+articles are stored instead of being recomputed per request:
+
+- a new article similar to a clustered one joins that cluster (the
+  most similar match wins)
+- two similar articles that belong to no cluster start a new one
+- clusters are never merged, so a story's ID stays stable
+
+Candidates only come from the LSH buckets of the last
+near_duplicate_window_days, which keeps a years-old article from pulling
+today's story into its cluster.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def assign_stories(session: Session, pairs: dict) -> list[int]:
+    """
+    Put the articles of new near-duplicate pairs into story clusters.
+
+    Args:
+        session: Database session (the indexer's transaction)
+        pairs: (newer article ID, older article ID) -> similarity
+
+    Returns:
+        IDs of the clusters that changed
+    """
+    if not pairs:
+        return []
+
+    involved = sorted({article_id for pair in pairs for article_id in pair})
+    clusters = dict(session.execute(
+        text("SELECT article_id, cluster_id FROM article_stories WHERE article_id = ANY(:ids)"),
+        {'ids': involved}
+    ).all())
+
+    # New clusters are keyed ('seed', article ID) until they get their ID
+    members: dict = {}
+    for (newer, older), _ in sorted(pairs.items(), key=lambda item: -item[1]):
+        newer_cluster, older_cluster = clusters.get(newer), clusters.get(older)
+        if newer_cluster is not None and older_cluster is not None:
+            continue
+        if newer_cluster is None and older_cluster is None:
+            cluster = ('seed', older)
+            clusters[newer] = clusters[older] = members[newer] = members[older] = cluster
+        elif newer_cluster is None:
+            clusters[newer] = members[newer] = older_cluster
+        else:
+            clusters[older] = members[older] = newer_cluster
+
+    seeds = sorted({cluster[1] for cluster in members.values() if isinstance(cluster, tuple)})
+    created = {}
+    if seeds:
+        created = dict(session.execute(text("""
+            INSERT INTO story_clusters (seed_article_id)
+            SELECT * FROM unnest(CAST(:seeds AS integer[]))
+            RETURNING seed_article_id, id
+        """), {'seeds': seeds}).all())
+
+    resolved = {
+        article_id: created[cluster[1]] if isinstance(cluster, tuple) else cluster
+        for article_id, cluster in members.items()
+    }
+    if resolved:
+        session.execute(text("""
+            INSERT INTO article_stories (article_id, cluster_id)
+            SELECT * FROM unnest(CAST(:ids AS integer[]), CAST(:clusters AS integer[]))
+            ON CONFLICT (article_id) DO NOTHING
+        """), {'ids': list(resolved), 'clusters': list(resolved.values())})
+
+    touched = sorted(set(resolved.values()))
+    refresh_clusters(session, touched)
+    return touched
+
+
+def refresh_clusters(session: Session, cluster_ids: list[int]) -> None:
+    """
+    Recompute the summary columns of clusters from their members.
+
+    The title is the earliest article's; clusters left without members are deleted.
+    """
+    if not cluster_ids:
+        return
+    session.execute(text("""
+        UPDATE story_clusters c SET
+            title = m.title,
+            article_count = m.articles,
+            source_count = m.sources,
+            first_published_at = m.first_published,
+            last_published_at = m.last_published,
+            updated_at = :now
+        FROM (
+            SELECT s.cluster_id,
+                   (array_agg(a.title ORDER BY a.published_at, a.id))[1] AS title,
+                   count(*) AS articles,
+                   count(DISTINCT a.source_id) AS sources,
+                   min(a.published_at) AS first_published,
+                   max(a.published_at) AS last_published
+            FROM article_stories s
+            JOIN articles a ON a.id = s.article_id
+            WHERE s.cluster_id = ANY(:ids)
+            GROUP BY s.cluster_id
+        ) m
+        WHERE c.id = m.cluster_id
+    """), {'ids': cluster_ids, 'now': datetime.now(timezone.utc).replace(tzinfo=None)})
+    session.execute(text("""
+        DELETE FROM story_clusters c
+        WHERE c.id = ANY(:ids)
+          AND NOT EXISTS (SELECT 1 FROM article_stories s WHERE s.cluster_id = c.id)
+    """), {'ids': cluster_ids})
+
+
+def unassign_articles(session: Session, article_ids_sql: str, params: dict | None = None) -> int:
+    """
+    Take articles out of their clusters (before they are deleted).
+
+    Args:
+        session: Database session
+        article_ids_sql: SELECT returning the IDs of the articles
+        params: Its bind parameters
+
+    Returns:
+        Number of clusters that changed
+    """
+    touched = session.execute(text(f"""
+        DELETE FROM article_stories s
+        WHERE s.article_id IN ({article_ids_sql})
+        RETURNING s.cluster_id
+    """), params or {}).scalars().all()
+    touched = sorted(set(touched))
+    if touched:
+        # Their rows are gone from article_stories, so only the rest is counted
+        refresh_clusters(session, touched)
+    return len(touched)
+
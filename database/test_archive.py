@@ -0,0 +1,93 @@
+"""Test the cold archive's ID index and deleted-source filtering (local files, no database)."""
+from datetime import datetime, timedelta
+import pytest
+from database import archive
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive.settings, 'archive_dir', str(tmp_path))
+    return tmp_path
+
+
+def article(article_id, published_at, source_id=1):
+    return {
+        'id': article_id, 'source_id': source_id, 'title': f"Article {article_id}", 'description': None,
+        'content': None, 'author': None, 'published_at': published_at, 'scraped_at': None,
+        'url': f"https://a.example/{article_id}", 'url_hash': article_id,
+        'source_name': f"Source {source_id}", 'source_political_leaning': None,
+    }
+
+
+def newest_first(rows):
+    return sorted(rows, key=lambda row: (row['published_at'], row['id']), reverse=True)
+
+
+@pytest.fixture
+def interleaved():
+    # IDs follow scrape order, days follow publish dates: every file's ID range overlaps the others
+    start = datetime(2025, 9, 1, 12)
+    rows = [article(n, start + timedelta(days=n % 5)) for n in range(1, 51)]
+    archive.write_archive(newest_first(rows))
+    return rows
+
+
+def count_reads(monkeypatch):
+    reads = []
+    read_file = archive._read_file
+    monkeypatch.setattr(archive, '_read_file', lambda path: reads.append(path) or read_file(path))
+    return reads
+
+
+def test_lookup_reads_one_day(interleaved, monkeypatch):
+    reads = count_reads(monkeypatch)
+    found = archive.get_archived_article(37)
+    assert found['id'] == 37
+    assert found['published_at'] == datetime(2025, 9, 3, 12)
+    assert reads == ['articles/2025/09/2025-09-03.jsonl.zst']
+
+
+def test_miss_reads_no_file(interleaved, monkeypatch):
+    reads = count_reads(monkeypatch)
+    assert archive.get_archived_article(25_000) is None
+    assert archive.get_archived_article(0) is None
+    assert reads == []
+
+
+def test_reexport_keeps_the_index_deduplicated(interleaved):
+    archive.write_archive(newest_first(interleaved))
+    assert len(list(archive._iter_index_keys(archive._archive_root() / archive.ID_INDEX_FILE))) == 50
+    assert archive.get_archived_article(50)['id'] == 50
+
+
+def test_older_archive_is_indexed_on_next_write(interleaved, archive_dir):
+    (archive_dir / archive.ID_INDEX_FILE).unlink()
+    assert archive.get_archived_article(10)['id'] == 10          # Falls back to the ID ranges
+    archive.write_archive([article(99, datetime(2025, 8, 1, 12))])
+    assert archive._archived_days(10) == ['2025-09-01']
+    assert archive._archived_days(99) == ['2025-08-01']
+
+
+def test_reindex(interleaved, archive_dir):
+    (archive_dir / archive.ID_INDEX_FILE).unlink()
+    assert archive.reindex() == 50
+    assert archive._archived_days(37) == ['2025-09-03']
+
+
+def test_deleted_source_is_not_served(archive_dir):
+    day = datetime(2025, 9, 1, 12)
+    archive.write_archive(newest_first([article(1, day, source_id=1), article(2, day, source_id=2)]))
+    archive.forget_archived_source(2)
+
+    assert archive.get_archived_article(2) is None
+    assert archive.get_archived_article(1)['id'] == 1
+    assert [row['id'] for row in archive.iter_archived_articles()] == [1]
+    # Survives later exports
+    archive.write_archive([article(3, day - timedelta(days=1), source_id=2)])
+    assert archive.deleted_sources() == {2}
+    assert archive.get_archived_article(3) is None
+
+
+def test_forgetting_without_an_archive_creates_nothing(archive_dir):
+    archive.forget_archived_source(2)
+    assert list(archive_dir.iterdir()) == []
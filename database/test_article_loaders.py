@@ -0,0 +1,80 @@
+"""Test that the INSERT and COPY article loaders send the same values (no database needed)."""
+from datetime import datetime, timedelta, timezone
+from database.utils import ARTICLE_COLUMNS, _CopyStream, _copy_article_rows, _insert_article_rows, article_row
+
+PUBLISHED = ARTICLE_COLUMNS.index('published_at')
+
+
+class RecordingSession:
+    """
+    Session stand-in keeping what the loaders send.
+
+    Also plays the result (rowcount, all()), the SQLAlchemy and DBAPI
+    connections (session.connection().connection) and the COPY cursor.
+    """
+
+    def __init__(self):
+        self.params = []
+        self.copied = ''
+
+    def execute(self, statement, params=None):
+        if isinstance(params, list):
+            self.params.extend(params)
+        return self
+
+    @property
+    def rowcount(self):
+        return len(self.params)
+
+    def all(self):
+        return []
+
+    def connection(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def copy_expert(self, sql, stream):
+        self.copied = stream.read()
+
+    def close(self):
+        pass
+
+
+ARTICLES = [
+    {'title': 'Noon in New York', 'url': 'https://a.example/1',
+     'published_at': datetime(2026, 10, 16, 12, 0, tzinfo=timezone(timedelta(hours=-4)))},
+    {'title': 'Midnight UTC', 'url': 'https://a.example/2',
+     'published_at': datetime(2026, 10, 17, 0, 30, tzinfo=timezone.utc)},
+    {'title': 'Already naive', 'url': 'https://a.example/3',
+     'published_at': datetime(2026, 10, 16, 9, 15)},
+]
+EXPECTED = [datetime(2026, 10, 16, 16, 0), datetime(2026, 10, 17, 0, 30), datetime(2026, 10, 16, 9, 15)]
+
+
+def test_article_row_stores_naive_utc():
+    rows = [article_row(article, 1) for article in ARTICLES]
+    assert [row[PUBLISHED] for row in rows] == EXPECTED
+    assert all(row[PUBLISHED].tzinfo is None for row in rows)
+
+
+def test_insert_and_copy_send_the_same_times():
+    rows = [article_row(article, 1) for article in ARTICLES]
+
+    inserted = RecordingSession()
+    _insert_article_rows(inserted, rows)
+    copied = RecordingSession()
+    copied.connection = lambda: type('Connection', (), {'connection': copied})()
+    _copy_article_rows(copied, rows)
+
+    insert_times = [params['published_at'] for params in inserted.params]
+    copy_times = [datetime.fromisoformat(line.split('\t')[PUBLISHED]) for line in copied.copied.splitlines()]
+    assert insert_times == copy_times == EXPECTED
+    # Naive: psycopg2 sends them as TIMESTAMP, untouched by the session's TimeZone
+    assert all(value.tzinfo is None for value in insert_times)
+
+
+def test_copy_stream_renders_aware_values_as_naive_utc():
+    row = (1, 'T', None, None, None, datetime(2026, 10, 16, 12, 0, tzinfo=timezone(timedelta(hours=2))))
+    assert _CopyStream([row]).read().rstrip('\n').split('\t')[PUBLISHED] == '2026-10-16T10:00:00'
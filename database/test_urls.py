@@ -0,0 +1,72 @@
+"""Test URL normalization and the dedup hash."""
+import pytest
+from database.urls import normalize_url, url_hash
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('HTTPS://Example.COM/News/Story', 'https://example.com/News/Story'),
+    ('https://example.com:443/a', 'https://example.com/a'),
+    ('http://example.com:80/a', 'http://example.com/a'),
+    ('http://example.com:8080/a', 'http://example.com:8080/a'),
+    ('https://example.com', 'https://example.com/'),
+    ('  https://example.com/a  ', 'https://example.com/a'),
+    ('https://user:pw@Example.com/a', 'https://user:pw@example.com/a'),
+])
+def test_scheme_host_port_path(url, expected):
+    assert normalize_url(url) == expected
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('http://[::1]:8080/feed', 'http://[::1]:8080/feed'),
+    ('http://[::1]/feed', 'http://[::1]/feed'),
+    ('https://[2001:DB8::1]:443/a', 'https://[2001:db8::1]/a'),
+])
+def test_ipv6_keeps_brackets(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_ipv6_hosts_dont_collide():
+    assert url_hash('http://[::1]:8080/feed') != url_hash('http://[::1:8080]/feed')
+
+
+def test_tracking_params_dropped():
+    url = 'https://example.com/a?utm_source=x&id=5&fbclid=abc&UTM_Medium=y&gclid=z'
+    assert normalize_url(url) == 'https://example.com/a?id=5'
+
+
+def test_params_sorted_by_name():
+    assert normalize_url('https://example.com/a?b=2&a=1') == 'https://example.com/a?a=1&b=2'
+
+
+def test_repeated_params_keep_their_order():
+    assert normalize_url('https://example.com/a?tag=z&id=1&tag=a') == 'https://example.com/a?id=1&tag=z&tag=a'
+    assert url_hash('https://example.com/a?tag=z&tag=a') != url_hash('https://example.com/a?tag=a&tag=z')
+
+
+def test_percent_encoding_kept():
+    assert normalize_url('https://example.com/a?q=caf%C3%A9&x=a+b') == 'https://example.com/a?q=caf%C3%A9&x=a+b'
+
+
+def test_anchor_fragment_dropped():
+    assert normalize_url('https://example.com/a#comments') == 'https://example.com/a'
+    assert url_hash('https://example.com/a#top') == url_hash('https://example.com/a')
+
+
+@pytest.mark.parametrize('url', [
+    'https://example.com/#!/story/1',
+    'https://example.com/#/story/1',
+])
+def test_hash_route_fragment_kept(url):
+    assert normalize_url(url) == url
+    assert url_hash(url) != url_hash('https://example.com/#/story/2')
+
+
+@pytest.mark.parametrize('url', ['not a url', '/relative/path', 'http://example.com:notaport/'])
+def test_unparseable_returned_stripped(url):
+    assert normalize_url(f" {url} ") == url
+
+
+def test_hash_is_stable_signed_64_bit():
+    value = url_hash('https://example.com/a')
+    assert -2 ** 63 <= value < 2 ** 63
+    assert value == url_hash('HTTPS://EXAMPLE.com:443/a?utm_source=rss#top')
@@ -56,7 +56,7 @@ def test_duplicate_stories():
     
     if duplicates:
         for dup in duplicates:
-            print(f"\n  📰 '{dup['title']}'")
+            print(f"\n  📰 '{dup['title']}' ({dup['similarity']:.0%} similar)")
             print(f"     {dup['source1']}: {dup['url1']}")
             print(f"     {dup['source2']}: {dup['url2']}")
     else:
@@ -0,0 +1,88 @@
+"""
+Canonical article URLs and their fixed-width dedup key.
+
+The same story often reaches us under several URLs: with utm_* or other
+tracking parameters, an #anchor, an upper-case host or an explicit
+default port. normalize_url() folds those variants into one canonical
+URL, and url_hash() turns it into the signed 64-bit key stored in
+articles.url_hash, which carries the unique constraint instead of the
+full TEXT URL.
+"""
+import hashlib
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+# Query parameters that only track the click, never select the content
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'yclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'cmpid', 'ocid', 'smid', 'ito',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Fragments that route a single-page app ('#!/story/1', '#/story/1')
+# select the content and are kept; any other fragment is an in-page
+# anchor and is dropped
+ROUTE_FRAGMENT_PREFIXES = ('!', '/')
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL.
+
+    - lower-case scheme and host, default port dropped
+    - fragment dropped, unless it is a hash route ('#!...', '#/...')
+    - tracking parameters (utm_*, fbclid, ...) dropped, the rest sorted
+      by name; repeated names keep their relative order
+    - empty path becomes '/'
+
+    Args:
+        url: URL as found in the feed
+
+    Returns:
+        Normalized URL (the input, stripped, if it can't be parsed)
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname.lower()
+    if ':' in netloc:
+        netloc = f"[{netloc}]"  # IPv6 literal: hostname comes without its brackets
+    if parts.username or parts.password:
+        netloc = f"{parts.username or ''}{':' + parts.password if parts.password else ''}@{netloc}"
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+
+    # Filter and sort the raw pairs so their percent-encoding is kept as is.
+    # Sorted by name only (a stable sort): ?tag=b&tag=a may mean something
+    # else than ?tag=a&tag=b to the server
+    query = '&'.join(sorted(
+        (pair for pair in parts.query.split('&')
+         if pair and not _is_tracking(unquote_plus(pair.split('=', 1)[0]))),
+        key=lambda pair: pair.split('=', 1)[0]
+    ))
+    fragment = parts.fragment if parts.fragment.startswith(ROUTE_FRAGMENT_PREFIXES) else ''
+
+    return urlunsplit((scheme, netloc, parts.path or '/', query, fragment))
+
+
+def url_hash(url: str) -> int:
+    """
+    64-bit dedup key of a URL (normalized first), as a signed BIGINT.
+
+    blake2b is stable across processes and Python versions, unlike hash().
+    """
+    digest = hashlib.blake2b(normalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
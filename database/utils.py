@@ -1,14 +1,60 @@
 """Database utility functions using SQLAlchemy ORM."""
-from typing import List, Dict, Optional, cast
-from datetime import datetime, timedelta
-from sqlalchemy import CursorResult, func, text, case
-from sqlalchemy.orm import joinedload, Session
+from typing import Iterable, Iterator, List, Dict, Optional, cast
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import CursorResult, DateTime, Double, Select, and_, func, literal, literal_column, select, text, case, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased, Session
 import logging
-from database.models import Source, Article, User
+from config import get_settings
+from database.models import Source, Article, User, FeedState, HostBreaker, ArticleSimilarity, SourceDailyCount
+from database.archive import forget_archived_source, get_archived_article, get_archived_articles
 from database.db import get_session, get_session_no_commit
+from database.near_duplicates import forget_source
+from database.pagination import keyset_filter
+from database.urls import normalize_url, url_hash
 
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Text search configuration of articles.search_vector (see database/models.py)
+SEARCH_CONFIG = 'english'
+
+# Read helpers select only the columns their response schema needs
+# (database/schemas.py) and read row mappings, never whole ORM entities:
+# no unbounded content/description on list pages, no lazy loads
+_SOURCE_COLUMNS = (Source.id, Source.name, Source.url, Source.country, Source.political_leaning)
+_ARTICLE_SUMMARY_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.url,
+    Article.published_at,
+    Source.id.label('source_id'),
+    Source.name.label('source_name'),
+    Source.political_leaning.label('source_political_leaning'),
+)
+
+
+def _article_summary(row) -> Dict:
+    """Article dict (ArticleResponse shape) from a row of _ARTICLE_SUMMARY_COLUMNS."""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'url': row['url'],
+        'published_at': row['published_at'],
+        'source': {
+            'id': row['source_id'],
+            'name': row['source_name'],
+            'political_leaning': row['source_political_leaning']
+        }
+    }
+
+
+def _position(articles: List[Dict], after: tuple | None) -> tuple | None:
+    """Keyset position after a page of articles (where the archive takes over)."""
+    if articles:
+        return articles[-1]['published_at'], articles[-1]['id']
+    return after
 
 
 def get_all_sources_standalone() -> List[Dict]:
@@ -27,27 +73,16 @@ def get_all_sources(db: Session) -> List[Dict]:
     Returns:
         List of source dictionaries
     """
-    sources = db.query(Source).order_by(Source.name).all()
-
-    # Convert to dicts
-    return [
-        {
-            'id': s.id,
-            'name': s.name,
-            'url': s.url,
-            'country': s.country,
-            'political_leaning': s.political_leaning
-        }
-        for s in sources
-    ]
+    sources = db.execute(select(*_SOURCE_COLUMNS).order_by(Source.name)).mappings()
+    return [dict(source) for source in sources]
 
 
-def get_recent_articles_standalone(limit: int = 20) -> List[Dict]:
+def get_recent_articles_standalone(limit: int = 20, after: tuple | None = None) -> List[Dict]:
     """Standalone version for CLI scripts (creates own session)."""
     with get_session_no_commit() as session:
-        return get_recent_articles(session, limit)
+        return get_recent_articles(session, limit, after)
 
-def get_recent_articles(db: Session, limit: int = 20) -> List[Dict]:
+def get_recent_articles(db: Session, limit: int = 20, after: tuple | None = None) -> List[Dict]:
     """
     New version — uses injected session.
 
@@ -56,31 +91,23 @@ def get_recent_articles(db: Session, limit: int = 20) -> List[Dict]:
     Args:
         db: Database session
         limit: Maximum number of articles
+        after: (published_at, id) keyset position to continue after (see database/pagination.py)
         
     Returns:
-        List of article dictionaries
+        List of article dictionaries, newest first (archived ones past the oldest stored article)
     """
-    # Eager load source to avoid N+1 queries
-    articles = db.query(Article)\
-        .options(joinedload(Article.source))\
-        .order_by(Article.published_at.desc())\
-        .limit(limit)\
-        .all()
-    
-    return [
-        {
-            'id': a.id,
-            'title': a.title,
-            'url': a.url,
-            'published_at': a.published_at,
-            'source': {
-                'id': a.source.id,
-                'name': a.source.name,
-                'political_leaning': a.source.political_leaning
-            }
-        }
-        for a in articles
-    ]
+    query = recent_articles_query(limit, after)
+    articles = [_article_summary(row) for row in db.execute(query).mappings()]
+    return articles + get_archived_articles(limit - len(articles), _position(articles, after))
+
+
+def recent_articles_query(limit: int, after: tuple | None = None) -> Select:
+    """SELECT behind get_recent_articles (also explained by database/partitions.py)."""
+    # One query: source columns come from the join, not from a lazy load per row
+    query = select(*_ARTICLE_SUMMARY_COLUMNS).join(Source, Article.source_id == Source.id)
+    if after is not None:
+        query = query.where(keyset_filter(Article.published_at, Article.id, after))
+    return query.order_by(Article.published_at.desc(), Article.id.desc()).limit(limit)
 
 
 
@@ -104,34 +131,96 @@ def get_source_stats(db: Session) -> List[Dict]:
     Returns:
         List of source stats dictionaries
     """
-    seven_days_ago = datetime.now() - timedelta(days=7)
+    # Read from the rollup: cost depends on sources x hours, not on articles
+    seven_days_ago = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=7)
+    recent = or_(
+        SourceDailyCount.day > seven_days_ago.date(),
+        and_(SourceDailyCount.day == seven_days_ago.date(), SourceDailyCount.hour >= seven_days_ago.hour)
+    )
+    total = func.coalesce(func.sum(SourceDailyCount.articles), 0)
+
+    stats = db.execute(
+        select(
+            Source.name.label('source_name'),
+            total.label('total_articles'),
+            func.coalesce(func.sum(SourceDailyCount.articles).filter(recent), 0).label('articles_last_7d')
+        )
+        .outerjoin(SourceDailyCount, SourceDailyCount.source_id == Source.id)
+        .group_by(Source.id, Source.name)
+        .order_by(total.desc())
+    ).mappings()
 
-    # Query with aggregation
-    stats = db.query(
-        Source.name.label('source_name'),
-        func.count(Article.id).label('total_articles'),
-        func.sum(
-            case(
-                (Article.published_at > seven_days_ago, 1),
-                else_=0
-            )
-        ).label('articles_last_7d')
-    )\
-        .outerjoin(Article)\
-        .group_by(Source.id, Source.name)\
-        .order_by(func.count(Article.id).desc())\
-        .all()
-    
     return [
         {
-            'source_name': stat.source_name,
-            'total_articles': stat.total_articles,
-            'articles_last_7d': int(stat.articles_last_7d or 0)
+            'source_name': stat['source_name'],
+            'total_articles': int(stat['total_articles']),
+            'articles_last_7d': int(stat['articles_last_7d'])
         }
         for stat in stats
     ]
 
 
+def get_article_timeline(db: Session, granularity: str = 'day', days: int = 7,
+                         source_name: str | None = None) -> List[Dict]:
+    """
+    Articles published per hour or per day, from the source_daily_counts rollup.
+
+    Args:
+        db: Database session
+        granularity: 'hour' or 'day'
+        days: Number of days to look back
+        source_name: Only count this source (default: all sources)
+
+    Returns:
+        List of {'bucket', 'articles'} dicts, oldest first (empty buckets are left out)
+    """
+    if granularity not in ('hour', 'day'):
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    if granularity == 'hour':
+        bucket = SourceDailyCount.day + func.make_interval(0, 0, 0, 0, SourceDailyCount.hour)
+        since_filter = or_(
+            SourceDailyCount.day > since.date(),
+            and_(SourceDailyCount.day == since.date(), SourceDailyCount.hour >= since.hour)
+        )
+    else:
+        bucket = SourceDailyCount.day.cast(DateTime)
+        since_filter = SourceDailyCount.day >= since.date()
+
+    query = select(bucket.label('bucket'), func.sum(SourceDailyCount.articles).label('articles'))\
+        .where(since_filter)
+    if source_name:
+        query = query.join(Source, SourceDailyCount.source_id == Source.id).where(Source.name == source_name)
+    query = query.group_by('bucket').order_by('bucket')
+
+    return [
+        {'bucket': row['bucket'], 'articles': int(row['articles'])}
+        for row in db.execute(query).mappings()
+    ]
+
+
+def rebuild_source_daily_counts() -> int:
+    """
+    Recompute the source_daily_counts rollup from the articles table.
+
+    Only needed after articles were changed behind the loaders' back
+    (manual SQL, restores); the loaders and deletes keep it current.
+
+    Returns:
+        Number of rollup rows written
+    """
+    with get_session() as session:
+        session.execute(text("TRUNCATE source_daily_counts"))
+        result = cast(CursorResult, session.execute(text("""
+            INSERT INTO source_daily_counts (source_id, day, hour, articles)
+            SELECT source_id, published_at::date, EXTRACT(HOUR FROM published_at)::smallint, COUNT(*)
+            FROM articles
+            GROUP BY 1, 2, 3
+        """)))
+        return result.rowcount
+
+
 def get_inactive_sources(hours: int = 24) -> List[Dict]:
     """
     Find sources with no articles in the last N hours.
@@ -170,56 +259,173 @@ def get_inactive_sources(hours: int = 24) -> List[Dict]:
         ]
 
 
-def get_duplicate_stories() -> List[Dict]:
+def get_duplicate_stories(days: int = 7, min_similarity: float | None = None, limit: int = 500) -> List[Dict]:
+    """Standalone version for CLI scripts (creates own session)."""
+    with get_session_no_commit() as session:
+        return get_near_duplicate_pairs(session, days, min_similarity, limit)
+
+
+def get_near_duplicate_pairs(db: Session, days: int = 7, min_similarity: float | None = None,
+                             limit: int = 500) -> List[Dict]:
     """
-    Find articles with identical titles from different sources.
-    
+    Near-duplicate article pairs (same story, possibly worded differently).
+
+    Reads the pairs found by the MinHash/LSH indexer (database/near_duplicates.py)
+    instead of self-joining articles on their title.
+
+    Args:
+        db: Database session
+        days: Only pairs whose newer article was published in the last N days
+        min_similarity: Lowest estimated similarity (defaults to the indexing threshold)
+        limit: Maximum number of pairs
+
     Returns:
-        List of duplicate pairs
+        List of pairs, most similar first; 'title' is the older article's title
     """
-    with get_session_no_commit() as session:
-        # Self-join to find duplicates
-        a1 = session.query(Article).subquery('a1')
-        a2 = session.query(Article).subquery('a2')
-        s1 = session.query(Source).subquery('s1')
-        s2 = session.query(Source).subquery('s2')
-
-        duplicates = session.query(
-            a1.c.title,
-            s1.c.name.label('source1'),
-            s2.c.name.label('source2'),
-            a1.c.url.label('url1'),
-            a2.c.url.label('url2'),
-            a1.c.published_at.label('published1'),
-            a2.c.published_at.label('published2')
-        )\
-            .join(a2, (a1.c.title == a2.c.title) & (a1.c.id < a2.c.id))\
-            .join(s1, a1.c.source_id == s1.c.id)\
-            .join(s2, a2.c.source_id == s2.c.id)\
-            .order_by(a1.c.title)\
-            .all()
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    min_similarity = settings.near_duplicate_threshold if min_similarity is None else min_similarity
+
+    a1, a2 = aliased(Article), aliased(Article)
+    s1, s2 = aliased(Source), aliased(Source)
+    duplicates = db.query(
+        ArticleSimilarity.similarity,
+        a1.id.label('id1'),
+        a2.id.label('id2'),
+        a1.title.label('title1'),
+        a2.title.label('title2'),
+        s1.name.label('source1'),
+        s2.name.label('source2'),
+        a1.url.label('url1'),
+        a2.url.label('url2'),
+        a1.published_at.label('published1'),
+        a2.published_at.label('published2')
+    )\
+        .join(a1, a1.id == ArticleSimilarity.similar_id)\
+        .join(a2, a2.id == ArticleSimilarity.article_id)\
+        .join(s1, a1.source_id == s1.id)\
+        .join(s2, a2.source_id == s2.id)\
+        .filter(ArticleSimilarity.similarity >= min_similarity, a2.published_at >= since)\
+        .order_by(ArticleSimilarity.similarity.desc(), a2.published_at.desc())\
+        .limit(limit)\
+        .all()
 
-        return [
-            {
-                'title': dup.title,
-                'source1': dup.source1,
-                'source2': dup.source2,
-                'url1': dup.url1,
-                'url2': dup.url2,
-                'published1': dup.published1,
-                'published2': dup.published2
-            }
-            for dup in duplicates
-        ]
+    return [
+        {
+            'id1': dup.id1,
+            'id2': dup.id2,
+            'title': dup.title1,
+            'title2': dup.title2,
+            'source1': dup.source1,
+            'source2': dup.source2,
+            'url1': dup.url1,
+            'url2': dup.url2,
+            'published1': dup.published1,
+            'published2': dup.published2,
+            'similarity': round(dup.similarity, 3)
+        }
+        for dup in duplicates
+    ]
+
+
+def get_similar_articles(db: Session, article_id: int, limit: int = 20) -> List[Dict]:
+    """
+    Articles that are near-duplicates of one article.
+
+    Args:
+        db: Database session
+        article_id: ID of the article
+        limit: Maximum number of articles
+
+    Returns:
+        List of article dictionaries with a 'similarity' key, most similar first
+    """
+    other_id = case(
+        (ArticleSimilarity.article_id == article_id, ArticleSimilarity.similar_id),
+        else_=ArticleSimilarity.article_id
+    )
+    query = select(*_ARTICLE_SUMMARY_COLUMNS, ArticleSimilarity.similarity)\
+        .join(ArticleSimilarity, Article.id == other_id)\
+        .join(Source, Article.source_id == Source.id)\
+        .where(or_(ArticleSimilarity.article_id == article_id, ArticleSimilarity.similar_id == article_id))\
+        .order_by(ArticleSimilarity.similarity.desc(), Article.published_at.desc())\
+        .limit(limit)
+
+    return [
+        {**_article_summary(row), 'similarity': round(row['similarity'], 3)}
+        for row in db.execute(query).mappings()
+    ]
 
 
-def get_articles_by_source_standalone(source_name: str, days: int = 7, limit: int = 500) -> List[Dict]:
+def get_stories(db: Session, days: int = 2, min_sources: int = 2, limit: int = 50) -> List[Dict]:
+    """
+    Recent story clusters with the sources (and leanings) that covered them.
+
+    One query: the newest clusters come off idx_story_clusters_last_published,
+    their member sources are aggregated per cluster.
+
+    Args:
+        db: Database session
+        days: Only stories with an article published in the last N days
+        min_sources: Only stories covered by at least this many sources
+        limit: Maximum number of stories
+
+    Returns:
+        List of story dictionaries, most recently updated first
+    """
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    stories = db.execute(text("""
+        SELECT c.id, c.title, c.article_count, c.source_count,
+               c.first_published_at, c.last_published_at, members.sources
+        FROM story_clusters c
+        CROSS JOIN LATERAL (
+            SELECT json_agg(json_build_object(
+                       'id', s.id,
+                       'name', s.name,
+                       'political_leaning', s.political_leaning,
+                       'articles', counts.articles
+                   ) ORDER BY counts.articles DESC, s.name) AS sources
+            FROM (
+                SELECT a.source_id, count(*) AS articles
+                FROM article_stories m
+                JOIN articles a ON a.id = m.article_id
+                WHERE m.cluster_id = c.id
+                GROUP BY a.source_id
+            ) counts
+            JOIN sources s ON s.id = counts.source_id
+        ) members
+        WHERE c.last_published_at >= :since AND c.source_count >= :min_sources
+        ORDER BY c.last_published_at DESC
+        LIMIT :limit
+    """), {'since': since, 'min_sources': min_sources, 'limit': limit}).all()
+
+    results = []
+    for story in stories:
+        leanings: Dict[str, int] = {}
+        for source in story.sources:
+            leaning = source['political_leaning'] or 'unknown'
+            leanings[leaning] = leanings.get(leaning, 0) + 1
+        results.append({
+            'id': story.id,
+            'title': story.title,
+            'article_count': story.article_count,
+            'source_count': story.source_count,
+            'first_published_at': story.first_published_at,
+            'last_published_at': story.last_published_at,
+            'sources': story.sources,
+            'leanings': leanings
+        })
+    return results
+
+
+def get_articles_by_source_standalone(source_name: str, days: int = 7, limit: int = 500,
+                                     after: tuple | None = None) -> List[Dict]:
     """Standalone version for CLI scripts (creates own session)."""
     with get_session_no_commit() as session:
-        return get_articles_by_source(session, source_name, days, limit)
+        return get_articles_by_source(session, source_name, days, limit, after)
     
 
-def get_articles_by_source(db: Session, source_name: str, days: int = 7, limit: int = 500) -> List[Dict]:
+def get_articles_by_source(db: Session, source_name: str, days: int = 7, limit: int = 500,
+                           after: tuple | None = None) -> List[Dict]:
     """
     New version — uses injected session.
 
@@ -229,85 +435,670 @@ def get_articles_by_source(db: Session, source_name: str, days: int = 7, limit:
         db: Database session
         source_name: Name of the source
         days: Number of days to look back
+        limit: Maximum number of articles
+        after: (published_at, id) keyset position to continue after (see database/pagination.py)
     Returns:
-        List of articles
+        List of articles, newest first (archived ones past the oldest stored article)
     """
-    cutoff_date = datetime.now() - timedelta(days=days)
+    query = articles_by_source_query(source_name, days, limit, after)
+    articles = [_article_summary(row) for row in db.execute(query).mappings()]
+    since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    return articles + get_archived_articles(limit - len(articles), _position(articles, after), since, source_name)
 
-    articles = db.query(Article)\
-        .join(Source)\
-        .filter(
+
+def articles_by_source_query(source_name: str, days: int, limit: int, after: tuple | None = None) -> Select:
+    """SELECT behind get_articles_by_source (also explained by database/partitions.py)."""
+    cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+    query = select(*_ARTICLE_SUMMARY_COLUMNS)\
+        .join(Source, Article.source_id == Source.id)\
+        .where(
             Source.name == source_name,
             Article.published_at >= cutoff_date
-        )\
-        .order_by(Article.published_at.desc())\
-        .limit(limit)\
-        .all()
+        )
+    if after is not None:
+        query = query.where(keyset_filter(Article.published_at, Article.id, after))
+    return query.order_by(Article.published_at.desc(), Article.id.desc()).limit(limit)
+
+
+def search_articles(db: Session, query: str, limit: int = 20, after: tuple | None = None,
+                    source_name: str | None = None, political_leaning: str | None = None,
+                    published_after: datetime | None = None, published_before: datetime | None = None,
+                    sort: str = 'relevance') -> List[Dict]:
+    """
+    Full-text search over title, description and content.
+
+    Args:
+        db: Database session
+        query: Web-search syntax: words, "quoted phrases", OR, -excluded
+        limit: Maximum number of articles
+        after: Previous page's last result, (rank, id) or (published_at, id) by sort
+            (see database/pagination.py)
+        source_name: Only this source's articles
+        political_leaning: Only articles of sources with this leaning
+        published_after: Only articles published at or after this
+        published_before: Only articles published before this
+        sort: 'relevance' (best match first) or 'newest'
+
+    Returns:
+        List of article dictionaries with their 'rank' (0-1)
+    """
+    statement = search_articles_query(query, limit, after, source_name, political_leaning,
+                                      published_after, published_before, sort)
+    return [{**_article_summary(row), 'rank': row['rank']} for row in db.execute(statement).mappings()]
+
+
+def search_articles_query(query: str, limit: int, after: tuple | None = None,
+                          source_name: str | None = None, political_leaning: str | None = None,
+                          published_after: datetime | None = None,
+                          published_before: datetime | None = None, sort: str = 'relevance') -> Select:
+    """
+    SELECT behind search_articles (also explained by benchmarks/bench_search.py).
+
+    One statement: the GIN index on articles.search_vector finds the
+    matches, the date bounds prune partitions, and only the matches are
+    ranked (ts_rank_cd, normalized to 0-1 by rank / (rank + 1)). Ranking
+    has to read every match, so a term in most articles is slow by
+    relevance; by 'newest' the published_at index can stop after one page.
+    """
+    # Parsed once, as a FROM item, instead of once per row
+    ts_query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), query).column_valued('q')
+    # As double precision: a real would be rounded on its way to Python and back,
+    # and the cursor comparison would miss or repeat rows
+    rank = func.ts_rank_cd(Article.search_vector, ts_query, 32).cast(Double)
+
+    statement = select(*_ARTICLE_SUMMARY_COLUMNS, rank.label('rank'))\
+        .join(Source, Article.source_id == Source.id)\
+        .where(Article.search_vector.op('@@')(ts_query))
+    if source_name:
+        statement = statement.where(Source.name == source_name)
+    if political_leaning:
+        statement = statement.where(Source.political_leaning == political_leaning)
+    if published_after:
+        statement = statement.where(Article.published_at >= published_after)
+    if published_before:
+        statement = statement.where(Article.published_at < published_before)
+    if sort == 'newest':
+        if after is not None:
+            statement = statement.where(keyset_filter(Article.published_at, Article.id, after))
+        return statement.order_by(Article.published_at.desc(), Article.id.desc()).limit(limit)
+
+    if after is not None:
+        after_rank, after_id = after
+        statement = statement.where(or_(rank < after_rank, and_(rank == after_rank, Article.id < after_id)))
+    return statement.order_by(rank.desc(), Article.id.desc()).limit(limit)
+
+
+def lookup_articles(db: Session, title_like: str | None = None, author: str | None = None, limit: int = 20,
+                    after: tuple | None = None, source_name: str | None = None,
+                    since: datetime | None = None) -> List[Dict]:
+    """
+    Fuzzy title/author lookup: partial and misspelled input, best match first.
+
+    Args:
+        db: Database session
+        title_like: Words of the title, in any order, typos allowed
+        author: Author name, typos allowed
+        limit: Maximum number of articles
+        after: (similarity, id) of the previous page's last result (see database/pagination.py)
+        source_name: Only this source's articles
+        since: Only articles published at or after this
+
+    Returns:
+        List of article dictionaries with their 'similarity' (0-1)
+    """
+    # <% matches at this word similarity or above (for this transaction only)
+    db.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+               {'threshold': str(settings.fuzzy_match_threshold)})
+    statement = lookup_articles_query(title_like, author, limit, after, source_name, since)
+    return [{**_article_summary(row), 'similarity': row['similarity']} for row in db.execute(statement).mappings()]
+
+
+def lookup_articles_query(title_like: str | None, author: str | None, limit: int, after: tuple | None = None,
+                          source_name: str | None = None, since: datetime | None = None) -> Select:
+    """
+    SELECT behind lookup_articles (also explained by benchmarks/bench_search.py).
+
+    `input <% column` is true when the input's trigrams are found in some
+    stretch of the column (word similarity), which the pg_trgm GIN indexes
+    on title and author answer; only those matches are scored. With both
+    inputs, both have to match and the score is their mean.
+    """
+    matches, scores = [], []
+    for value, column in ((title_like, Article.title), (author, Article.author)):
+        if value:
+            matches.append(literal(value).op('<%')(column))
+            scores.append(func.word_similarity(value, column).cast(Double))
+    if not scores:
+        raise ValueError("lookup_articles needs title_like or author")
+    # Scores as double precision, like the search rank, so cursor values round-trip exactly
+    similarity = scores[0] if len(scores) == 1 else (scores[0] + scores[1]) / 2
+
+    statement = select(*_ARTICLE_SUMMARY_COLUMNS, similarity.label('similarity'))\
+        .join(Source, Article.source_id == Source.id)\
+        .where(*matches)
+    if source_name:
+        statement = statement.where(Source.name == source_name)
+    if since:
+        statement = statement.where(Article.published_at >= since)
+    if after is not None:
+        after_similarity, after_id = after
+        statement = statement.where(or_(
+            similarity < after_similarity,
+            and_(similarity == after_similarity, Article.id < after_id)
+        ))
+    return statement.order_by(similarity.desc(), Article.id.desc()).limit(limit)
+
+
+# Columns written by the article loaders, in COPY order
+ARTICLE_COLUMNS = ('source_id', 'title', 'description', 'content', 'author', 'published_at', 'url', 'url_hash')
+
+# Backslash escapes of COPY's text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (how TIMESTAMP columns store it)."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _copy_value(value) -> str:
+    """Render one value in COPY text format (NULL is \\N, timestamps as naive UTC)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return to_naive_utc(value).isoformat()
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class _CopyStream:
+    """
+    Read-only file object that renders rows for COPY FROM STDIN lazily.
     
-    return [
-        {
-            'id': a.id,
-            'title': a.title,
-            'url': a.url,
-            'published_at': a.published_at,
-            'source': {
-                'id': a.source.id,
-                'name': a.source.name,
-                'political_leaning': a.source.political_leaning
-            }
-        }
-        for a in articles
-    ]
+    psycopg2 pulls it in small chunks, so a 100k-row batch is never
+    materialized as one big string.
+    """
+
+    def __init__(self, rows: Iterable[tuple]):
+        self._lines = ('\t'.join(map(_copy_value, row)) + '\n' for row in rows)
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def article_row(article: Dict, source_id: int) -> tuple:
+    """
+    One article as a tuple in ARTICLE_COLUMNS order (URL normalized, with its hash).
+
+    published_at is converted to naive UTC here, once for both loaders:
+    psycopg2 sends an aware datetime to the INSERT as timestamptz, which
+    Postgres turns into a TIMESTAMP in the session's TimeZone, not UTC.
+    """
+    url = normalize_url(article['url'])
+    return (
+        source_id,
+        article['title'],
+        article.get('description'),
+        article.get('content'),
+        article.get('author'),
+        to_naive_utc(article['published_at']),
+        url,
+        url_hash(url),
+    )
+
+
+def _count_into_rollup(inserted_cte: str) -> str:
+    """
+    SQL adding the rows of a RETURNING source_id, published_at CTE to source_daily_counts.
+
+    Runs in the same statement as the article insert, so the rollup can't
+    drift from the articles table.
+    """
+    return f"""
+        INSERT INTO source_daily_counts (source_id, day, hour, articles)
+        SELECT source_id, published_at::date, EXTRACT(HOUR FROM published_at)::smallint, COUNT(*)
+        FROM {inserted_cte}
+        GROUP BY 1, 2, 3
+        ON CONFLICT (source_id, day, hour)
+        DO UPDATE SET articles = source_daily_counts.articles + EXCLUDED.articles
+    """
+
 
+def _insert_article_rows(session: Session, rows: List[tuple]) -> Dict[int, int]:
+    """
+    Insert article rows with a parameterized INSERT ... ON CONFLICT.
+    
+    Runs as an executemany (one statement per row): cheap for a handful
+    of rows, slow for thousands. Each statement claims the URL in
+    article_urls first and only inserts the article (and counts it into
+    source_daily_counts) if the claim succeeded.
+    
+    Returns:
+        Source ID -> number of rows inserted
+    """
+    by_source: Dict[int, List[Dict]] = {}
+    for row in rows:
+        by_source.setdefault(row[0], []).append(dict(zip(ARTICLE_COLUMNS, row)))
+
+    inserted = {}
+    for source_id, data in by_source.items():
+        # rowcount is the rollup upsert's: 1 per article actually inserted
+        result = cast(CursorResult, session.execute(text(f"""
+            WITH fresh AS (
+                INSERT INTO article_urls (url_hash, published_at)
+                VALUES (:url_hash, :published_at)
+                ON CONFLICT (url_hash) DO NOTHING
+                RETURNING url_hash
+            ), inserted AS (
+                INSERT INTO articles
+                    (source_id, title, description, content, author, published_at, url, url_hash)
+                SELECT :source_id, :title, :description, :content, :author, :published_at, :url, url_hash
+                FROM fresh
+                RETURNING source_id, published_at
+            )
+            {_count_into_rollup('inserted')}
+        """), data))
+        inserted[source_id] = result.rowcount
+    return inserted
 
 
-def save_articles_batch(articles: List[Dict], source_id: int) -> int:
+def _copy_article_rows(session: Session, rows: List[tuple]) -> Dict[int, int]:
     """
-    Save multiple articles to database.
+    Bulk-load article rows: COPY into a staging table, then merge.
     
-    Uses raw SQL for bulk insert with ON CONFLICT (most efficient).
+    The rows are streamed with COPY FROM STDIN into a temporary staging
+    table (unlogged, private to the connection, emptied on commit) and
+    merged with a single statement, so the whole batch costs a few
+    round-trips instead of one per row. That statement claims the URLs in
+    article_urls (ON CONFLICT DO NOTHING), inserts the articles whose
+    claim succeeded and adds them to source_daily_counts.
+    
+    Returns:
+        Source ID -> number of rows inserted
+    """
+    columns = ', '.join(ARTICLE_COLUMNS)
+
+    # Created once per pooled connection, reused by every later batch
+    session.execute(text("""
+        CREATE TEMP TABLE IF NOT EXISTS articles_staging (
+            source_id INTEGER,
+            title TEXT,
+            description TEXT,
+            content TEXT,
+            author TEXT,
+            published_at TIMESTAMP,
+            url TEXT,
+            url_hash BIGINT
+        ) ON COMMIT DELETE ROWS
+    """))
+
+    # Same connection (and transaction) as the session
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY articles_staging ({columns}) FROM STDIN", _CopyStream(rows))
+    finally:
+        cursor.close()
+
+    # A URL twice in one batch: only one copy may claim it and be inserted
+    inserted = dict(session.execute(text(f"""
+        WITH batch AS (
+            SELECT DISTINCT ON (url_hash) {columns} FROM articles_staging ORDER BY url_hash
+        ), fresh AS (
+            INSERT INTO article_urls (url_hash, published_at)
+            SELECT url_hash, published_at FROM batch
+            ON CONFLICT (url_hash) DO NOTHING
+            RETURNING url_hash
+        ), merged AS (
+            INSERT INTO articles ({columns})
+            SELECT {columns} FROM batch JOIN fresh USING (url_hash)
+            RETURNING source_id, published_at
+        ), counted AS (
+            {_count_into_rollup('merged')}
+        )
+        SELECT source_id, COUNT(*) FROM merged GROUP BY source_id
+    """)).all())
+
+    # Empty it now too, in case more batches share this transaction
+    session.execute(text("TRUNCATE articles_staging"))
+    return inserted
+
+
+def save_article_rows(rows: List[tuple], method: str | None = None) -> Dict[int, int]:
+    """
+    Save article rows from any number of sources in one transaction.
+    
+    Deduplicates on article_urls (url_hash primary key, ON CONFLICT DO
+    NOTHING), which unlike a unique index on the partitioned articles
+    table holds across partitions. URLs are normalized first, so
+    tracking-parameter variants collapse.
+    Batches of at least settings.article_copy_threshold rows are loaded
+    with COPY through a staging table, smaller ones with a plain INSERT.
+    
+    Args:
+        rows: Article tuples in ARTICLE_COLUMNS order
+        method: Force 'copy' or 'insert' (default: pick by batch size)
+        
+    Returns:
+        Source ID -> number of articles inserted (sources with none may be missing)
+    """
+    if not rows:
+        return {}
+
+    if method is None:
+        method = 'copy' if len(rows) >= settings.article_copy_threshold else 'insert'
+    if method not in ('copy', 'insert'):
+        raise ValueError(f"Unknown load method: {method}")
+
+    with get_session() as session:
+        if method == 'copy':
+            inserted = _copy_article_rows(session, rows)
+        else:
+            inserted = _insert_article_rows(session, rows)
+
+    logger.info(f"Saved {sum(inserted.values())} new articles ({len(rows)} rows, {method})")
+    return inserted
+
+
+def save_articles_batch(articles: List[Dict], source_id: int, method: str | None = None) -> int:
+    """
+    Save multiple articles of one source to database.
     
     Args:
         articles: List of article dicts
         source_id: ID of the source
+        method: Force 'copy' or 'insert' (default: pick by batch size)
         
     Returns:
         Number of articles inserted
     """
-    if not articles:
-        return 0
+    rows = [article_row(article, source_id) for article in articles]
+    return save_article_rows(rows, method).get(source_id, 0)
+
+
+def iter_recent_url_hashes(days: int, chunk_size: int = 50000) -> Iterator[int]:
+    """
+    Stream the url_hash of every article scraped in the last `days` days.
     
-    # For bulk inserts with deduplication, raw SQL is still best
-    with get_session() as session:
-        # Prepare data
-        data = [
-            {
-                'source_id': source_id,
-                'title': article['title'],
-                'description': article.get('description'),
-                'content': article.get('content'),
-                'author': article.get('author'),
-                'published_at': article['published_at'],
-                'url': article['url']
-            }
-            for article in articles
-        ]
+    Uses a server-side cursor, so millions of rows are never held at once.
+    
+    Args:
+        days: How far back to go
+        chunk_size: Rows fetched per round-trip
         
-        # Use raw SQL with ON CONFLICT for efficiency
-        result = cast(CursorResult, session.execute(text("""
-            INSERT INTO articles
-                (source_id, title, description, content, author, published_at, url)
-            VALUES
-                (:source_id, :title, :description, :content, :author, :published_at, :url)
-            ON CONFLICT (url) DO NOTHING
-        """), data))
+    Yields:
+        url_hash values
+    """
+    with get_session_no_commit() as session:
+        result = session.connection().execution_options(stream_results=True, yield_per=chunk_size).execute(
+            text("SELECT url_hash FROM articles WHERE scraped_at >= NOW() - make_interval(days => :days)"),
+            {'days': days}
+        )
+        for url_hash_value in result.scalars():
+            yield url_hash_value
+
+
+def get_existing_url_hashes(hashes: List[int]) -> set:
+    """
+    Return which of the given url_hash values are already stored.
+    
+    Args:
+        hashes: url_hash values to look up
+        
+    Returns:
+        Set of the stored ones
+    """
+    if not hashes:
+        return set()
+    with get_session_no_commit() as session:
+        return set(session.execute(
+            text("SELECT url_hash FROM article_urls WHERE url_hash = ANY(:hashes)"),
+            {'hashes': list(hashes)}
+        ).scalars())
+
+
+def get_url_release_generation() -> int:
+    """
+    How many times stored URLs were released from article_urls.
+
+    A seen-URL filter warmed at an older generation may hold URLs that
+    can be stored again (see _delete_source_articles).
+
+    Returns:
+        Current generation (0 if URLs were never released)
+    """
+    with get_session_no_commit() as session:
+        return session.execute(
+            text("SELECT COALESCE(MAX(generation), 0) FROM url_release_state")
+        ).scalar()
+
+
+# Columns of feed_state that the scraper is allowed to write
+FEED_STATE_FIELDS = (
+    'etag', 'last_modified', 'content_length',
+    'last_published_at', 'recent_guids',
+    'poll_interval', 'publish_rate', 'consecutive_failures',
+    'last_polled_at', 'next_poll_at',
+    'breaker_state', 'breaker_open_until', 'breaker_trips',
+)
+
+# Columns of host_breakers that the scraper is allowed to write
+HOST_BREAKER_FIELDS = (
+    'consecutive_failures', 'breaker_state', 'breaker_open_until', 'breaker_trips',
+)
+
+
+def _feed_state_to_dict(state: FeedState) -> Dict:
+    """Convert a FeedState row to a plain dict."""
+    return {field: getattr(state, field) for field in ('source_id', *FEED_STATE_FIELDS)}
+
 
-        # Get count of inserted rows
-        inserted_count = result.rowcount
+def get_feed_states_standalone() -> Dict[int, Dict]:
+    """
+    Load the fetch state of every source in one query.
+    
+    Returns:
+        Dict mapping source_id to its state dict
+    """
+    with get_session_no_commit() as session:
+        return {
+            state.source_id: _feed_state_to_dict(state)
+            for state in session.query(FeedState).all()
+        }
+
+
+def get_feed_state_standalone(source_id: int) -> Optional[Dict]:
+    """
+    Load the fetch state of a single source.
+    
+    Args:
+        source_id: ID of the source
         
-        logger.info(f"Saved {inserted_count} new articles (source_id={source_id})")
-        return inserted_count
+    Returns:
+        State dict or None if the source was never fetched
+    """
+    with get_session_no_commit() as session:
+        state = session.get(FeedState, source_id)
+        return _feed_state_to_dict(state) if state else None
+
+
+def _upsert_feed_state(session: Session, source_id: int, fields: Dict) -> None:
+    """Upsert one source's feed_state columns inside the given session."""
+    unknown = set(fields) - set(FEED_STATE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown feed_state fields: {', '.join(sorted(unknown))}")
+    if not fields:
+        return
+
+    columns = ', '.join(fields)
+    values = ', '.join(f':{name}' for name in fields)
+    updates = ', '.join(f'{name} = EXCLUDED.{name}' for name in fields)
+
+    session.execute(text(f"""
+        INSERT INTO feed_state (source_id, {columns}, updated_at)
+        VALUES (:source_id, {values}, NOW())
+        ON CONFLICT (source_id) DO UPDATE
+        SET {updates}, updated_at = NOW()
+    """), {'source_id': source_id, **fields})
+
+
+def save_feed_state(source_id: int, **fields) -> None:
+    """
+    Create or update the fetch state of a source.
     
+    Args:
+        source_id: ID of the source
+        **fields: Columns to set (must be in FEED_STATE_FIELDS)
+    """
+    with get_session() as session:
+        _upsert_feed_state(session, source_id, fields)
+
+
+def save_feed_states(states: Dict[int, Dict]) -> None:
+    """
+    Create or update the fetch state of many sources in one transaction.
+    
+    Args:
+        states: Source ID -> columns to set (must be in FEED_STATE_FIELDS)
+    """
+    if not states:
+        return
+    with get_session() as session:
+        for source_id, fields in states.items():
+            _upsert_feed_state(session, source_id, fields)
+
+
+def _host_breaker_to_dict(breaker: HostBreaker) -> Dict:
+    """Convert a HostBreaker row to a plain dict."""
+    return {field: getattr(breaker, field) for field in ('host', *HOST_BREAKER_FIELDS)}
+
+
+def get_host_breakers_standalone() -> Dict[str, Dict]:
+    """
+    Load every host circuit breaker in one query.
+    
+    Returns:
+        Dict mapping host to its breaker dict
+    """
+    with get_session_no_commit() as session:
+        return {
+            breaker.host: _host_breaker_to_dict(breaker)
+            for breaker in session.query(HostBreaker).all()
+        }
+
+
+def get_host_breaker_standalone(host: str) -> Optional[Dict]:
+    """
+    Load the circuit breaker of a single host.
+    
+    Args:
+        host: Feed host
+        
+    Returns:
+        Breaker dict or None if the host never failed
+    """
+    with get_session_no_commit() as session:
+        breaker = session.get(HostBreaker, host)
+        return _host_breaker_to_dict(breaker) if breaker else None
+
+
+def save_host_breaker(host: str, **fields) -> None:
+    """
+    Create or update the circuit breaker of a host.
+    
+    Args:
+        host: Feed host
+        **fields: Columns to set (must be in HOST_BREAKER_FIELDS)
+    """
+    unknown = set(fields) - set(HOST_BREAKER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown host_breakers fields: {', '.join(sorted(unknown))}")
+    if not fields:
+        return
+
+    columns = ', '.join(fields)
+    values = ', '.join(f':{name}' for name in fields)
+    updates = ', '.join(f'{name} = EXCLUDED.{name}' for name in fields)
+
+    with get_session() as session:
+        session.execute(text(f"""
+            INSERT INTO host_breakers (host, {columns}, updated_at)
+            VALUES (:host, {values}, NOW())
+            ON CONFLICT (host) DO UPDATE
+            SET {updates}, updated_at = NOW()
+        """), {'host': host, **fields})
+
+
+def claim_due_sources(lease_seconds: int) -> List[int]:
+    """
+    Find sources whose next poll is due and claim them.
+    
+    Claimed sources get next_poll_at pushed forward by the lease so the
+    next scheduler tick doesn't dispatch them again while their scrape
+    is still queued; the scrape then sets the real next poll time.
+    
+    Args:
+        lease_seconds: How long a claim holds
+        
+    Returns:
+        IDs of the claimed sources
+    """
+    with get_session() as session:
+        result = session.execute(text("""
+            INSERT INTO feed_state (source_id, next_poll_at)
+            SELECT s.id, (NOW() AT TIME ZONE 'UTC') + make_interval(secs => :lease)
+            FROM sources s
+            LEFT JOIN feed_state f ON f.source_id = s.id
+            WHERE f.next_poll_at IS NULL
+               OR f.next_poll_at <= (NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (source_id) DO UPDATE
+            SET next_poll_at = EXCLUDED.next_poll_at
+            RETURNING source_id
+        """), {'lease': lease_seconds})
+        return [row.source_id for row in result]
+
+
+def claim_host_probe(host: str, lease_seconds: int) -> bool:
+    """
+    Claim the probe of a half-open host breaker, across workers.
+
+    Only an open breaker whose cooldown has passed can be claimed; the
+    claim pushes breaker_open_until forward by the lease, so every other
+    worker sees the breaker open until the probe's result is recorded
+    (or the lease runs out, if the prober died).
+
+    Args:
+        host: Feed host
+        lease_seconds: How long the claim holds
+
+    Returns:
+        True if this caller got the probe
+    """
+    with get_session() as session:
+        claimed = session.execute(text("""
+            UPDATE host_breakers
+            SET breaker_open_until = (NOW() AT TIME ZONE 'UTC') + make_interval(secs => :lease),
+                updated_at = NOW()
+            WHERE host = :host
+              AND breaker_state = 'open'
+              AND (breaker_open_until IS NULL OR breaker_open_until <= (NOW() AT TIME ZONE 'UTC'))
+            RETURNING host
+        """), {'host': host, 'lease': lease_seconds}).first()
+        return claimed is not None
 
 
 def create_source_standalone(source: dict) -> Dict:
@@ -348,6 +1139,70 @@ def create_source(db: Session, source: dict) -> Dict:
         'political_leaning': new_source.political_leaning
     }
 
+def create_sources(db: Session, sources: List[dict]) -> List[Dict]:
+    """
+    Create many sources using provided session.
+    
+    Inserts them all in one statement; the caller commits (or rolls back)
+    the whole batch. A name taken in the meantime (e.g. by a concurrent
+    request) is skipped instead of failing the batch.
+    
+    Args:
+        db: Database session
+        sources: Source data dictionaries
+        
+    Returns:
+        Created source dictionaries, in input order (skipped names missing)
+    """
+    statement = pg_insert(Source).values([
+        {
+            'name': source['name'],
+            'url': source['url'],
+            'country': source.get('country'),
+            'political_leaning': source.get('political_leaning')
+        }
+        for source in sources
+    ]).on_conflict_do_nothing(index_elements=[Source.name]).returning(*_SOURCE_COLUMNS)
+
+    created = {row['name']: dict(row) for row in db.execute(statement).mappings()}
+    return [created[source['name']] for source in sources if source['name'] in created]
+
+
+def get_existing_source_names(db: Session, names: List[str]) -> set:
+    """
+    Return which of the given source names are already taken.
+    
+    Args:
+        db: Database session
+        names: Candidate source names
+        
+    Returns:
+        Set of names that already exist
+    """
+    if not names:
+        return set()
+    rows = db.query(Source.name).filter(Source.name.in_(names)).all()
+    return {row.name for row in rows}
+
+
+def get_existing_source_urls(db: Session, urls: List[str]) -> set:
+    """
+    Return which of the given feed URLs already belong to a source.
+
+    URLs are compared in their normalized form (database/urls.py), so
+    'https://Example.com/rss' matches a stored 'https://example.com/rss'.
+
+    Args:
+        db: Database session
+        urls: Candidate feed URLs
+
+    Returns:
+        Set of the given URLs that already exist
+    """
+    if not urls:
+        return set()
+    stored = {normalize_url(url) for url in db.execute(select(Source.url)).scalars()}
+    return {url for url in urls if normalize_url(url) in stored}
 
 
 def get_source_by_id_standalone(source_id: int) -> Optional[Dict]:
@@ -366,17 +1221,8 @@ def get_source_by_id(db: Session, source_id: int) -> Optional[Dict]:
     Returns:
         Source dictionary or None if not found
     """
-    source = db.query(Source).filter(Source.id == source_id).first()
-    if source:
-        return {
-            'id': source.id,
-            'name': source.name,
-            'url': source.url,
-            'country': source.country,
-            'political_leaning': source.political_leaning
-        }
-    else:
-        return None
+    source = db.execute(select(*_SOURCE_COLUMNS).where(Source.id == source_id)).mappings().first()
+    return dict(source) if source else None
 
 
 def update_source(source_id: int, source_data: dict) -> Optional[Dict]:
@@ -413,6 +1259,34 @@ def update_source(source_id: int, source_data: dict) -> Optional[Dict]:
         }
 
 
+def _delete_source_articles(session: Session, source_id: int) -> int:
+    """
+    Delete a source's articles with everything derived from them.
+
+    Their URLs are released from article_urls too, so a later scrape can
+    store them again, and the URL release generation is bumped so the
+    scrapers' seen-URL filters, which still hold them, are rebuilt.
+
+    Returns:
+        Number of articles deleted
+    """
+    params = {'source_id': source_id}
+    forget_source(session, source_id)
+    session.execute(text("DELETE FROM source_daily_counts WHERE source_id = :source_id"), params)
+    session.execute(text("""
+        DELETE FROM article_urls u USING articles a
+        WHERE a.source_id = :source_id AND a.url_hash = u.url_hash
+    """), params)
+    session.execute(text("""
+        INSERT INTO url_release_state (generation) VALUES (1)
+        ON CONFLICT (id) DO UPDATE SET generation = url_release_state.generation + 1
+    """))
+    result = cast(CursorResult, session.execute(
+        text("DELETE FROM articles WHERE source_id = :source_id"), params
+    ))
+    return result.rowcount
+
+
 def delete_articles_by_source(source_id: int) -> int:
     """
     Delete all articles from a specific source.
@@ -423,17 +1297,16 @@ def delete_articles_by_source(source_id: int) -> int:
         Number of articles deleted
     """
     with get_session() as session:
-        result = cast(CursorResult, session.execute(
-            text("DELETE FROM articles WHERE source_id = :source_id"),
-            {'source_id': source_id}
-        ))
-        deleted_count = result.rowcount
+        deleted_count = _delete_source_articles(session, source_id)
         logger.info(f"Deleted {deleted_count} articles for source_id={source_id}")
         return deleted_count
     
 def delete_source(source_id: int) -> bool:
     """
     Delete a source and its articles from the database.
+
+    Its archived articles (database/archive.py) stay on disk but are no
+    longer served.
     
     Args:
         source_id: ID of the source to delete
@@ -442,10 +1315,7 @@ def delete_source(source_id: int) -> bool:
     """
     with get_session() as session:
         # First delete articles (if not using ON DELETE CASCADE)
-        session.execute(
-            text("DELETE FROM articles WHERE source_id = :source_id"),
-            {'source_id': source_id}
-        )
+        _delete_source_articles(session, source_id)
         
         # Then delete the source
         result = cast(CursorResult, session.execute(
@@ -453,12 +1323,16 @@ def delete_source(source_id: int) -> bool:
             {'source_id': source_id}
         ))
         deleted_count = result.rowcount
-        if deleted_count > 0:
-            logger.info(f"Deleted source_id={source_id} and its articles")
-            return True
-        else:
-            logger.warning(f"Source with id={source_id} not found for deletion")
-            return False
+    if deleted_count > 0:
+        try:
+            forget_archived_source(source_id)
+        except OSError as e:
+            logger.error(f"Couldn't hide the archived articles of source_id={source_id}: {e}")
+        logger.info(f"Deleted source_id={source_id} and its articles")
+        return True
+    else:
+        logger.warning(f"Source with id={source_id} not found for deletion")
+        return False
         
 
 def get_article_by_id_standalone(article_id: int) -> Optional[Dict]:
@@ -479,26 +1353,23 @@ def get_article_by_id(db: Session, article_id: int) -> Optional[Dict]:
         article_id: ID of the article
         
     Returns:
-        Article dictionary or None if not found
+        Article dictionary or None if not found (archived articles are looked up in the archive)
     """
-    article = db.query(Article).options(joinedload(Article.source)).filter(Article.id == article_id).first()
+    # ArticleDetail has no content field, so content is never read
+    article = db.execute(
+        select(*_ARTICLE_SUMMARY_COLUMNS, Article.description, Article.author, Article.scraped_at)
+        .join(Source, Article.source_id == Source.id)
+        .where(Article.id == article_id)
+    ).mappings().first()
     if article:
         return {
-            'id': article.id,
-            'title': article.title,
-            'url': article.url,
-            'published_at': article.published_at,
-            'description': article.description,
-            'author': article.author,
-            'scraped_at': article.scraped_at,
-            'source': {
-                'id': article.source.id,
-                'name': article.source.name,
-                'political_leaning': article.source.political_leaning
-            }
+            **_article_summary(article),
+            'description': article['description'],
+            'author': article['author'],
+            'scraped_at': article['scraped_at']
         }
     else:
-        return None
+        return get_archived_article(article_id)
     
 
 def get_user_by_username_standalone(username: str) -> Optional[Dict]:
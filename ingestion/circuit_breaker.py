@@ -0,0 +1,132 @@
+"""
+Circuit breakers for feeds and hosts.
+
+A breaker stops us from paying the full request timeout, run after run,
+for a feed (or a whole host) that is down:
+
+    closed  --N consecutive failures-->  open
+    open    --cooldown elapsed-------->  half_open (one probe allowed)
+    half_open --probe succeeds-------->  closed
+    half_open --probe fails----------->  open again, cooldown doubled
+
+Breakers are plain dicts with the fields stored in the database
+(feed_state for sources, host_breakers for hosts):
+
+    breaker_state, breaker_open_until, breaker_trips, consecutive_failures
+"""
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of a URL ('' if it has none)."""
+    return (urlsplit(url).hostname or '').lower()
+
+
+def breaker_status(breaker: dict | None, now: datetime) -> str:
+    """Effective state: an open breaker whose cooldown has passed is half-open."""
+    if not breaker:
+        return CLOSED
+    state = breaker.get('breaker_state') or CLOSED
+    open_until = breaker.get('breaker_open_until')
+    if state == OPEN and (open_until is None or now >= open_until):
+        return HALF_OPEN
+    return state
+
+
+def record_success() -> dict:
+    """Breaker fields after a successful request (fully closed)."""
+    return {
+        'breaker_state': CLOSED,
+        'breaker_open_until': None,
+        'breaker_trips': 0,
+    }
+
+
+def record_failure(
+    breaker: dict | None,
+    failures: int,
+    now: datetime,
+    threshold: int,
+    base_cooldown: int,
+    max_cooldown: int,
+) -> dict:
+    """
+    Breaker fields after a failed request.
+
+    Args:
+        breaker: Current breaker fields (or None)
+        failures: Consecutive failures, including this one
+        now: Time of the failure (naive UTC)
+        threshold: Failures in a row that open the breaker
+        base_cooldown: First cooldown (seconds), doubled on every re-trip
+        max_cooldown: Upper bound for the cooldown (seconds)
+
+    Returns:
+        Dict with breaker_state, breaker_open_until and breaker_trips
+    """
+    breaker = breaker or {}
+    trips = breaker.get('breaker_trips') or 0
+
+    # A failed probe re-opens immediately; otherwise wait for the threshold
+    if breaker_status(breaker, now) == HALF_OPEN or failures >= threshold:
+        trips += 1
+        cooldown = min(base_cooldown * 2 ** (trips - 1), max_cooldown)
+        return {
+            'breaker_state': OPEN,
+            'breaker_open_until': now + timedelta(seconds=cooldown),
+            'breaker_trips': trips,
+        }
+
+    return {
+        'breaker_state': breaker.get('breaker_state') or CLOSED,
+        'breaker_open_until': breaker.get('breaker_open_until'),
+        'breaker_trips': trips,
+    }
+
+
+def blocked_until(
+    source: dict,
+    host_breakers: dict,
+    probing_hosts: set,
+    now: datetime,
+    claim_probe: Callable[[str], bool] | None = None,
+) -> datetime | None:
+    """
+    Decide whether a source may be fetched now.
+
+    Only one source per half-open host is let through as the probe;
+    `probing_hosts` collects the hosts that already have one in this run.
+    Other workers scrape concurrently, so the probe is also claimed in
+    shared state through `claim_probe` (see database.utils.claim_host_probe):
+    a host whose probe another worker holds is skipped.
+
+    Args:
+        source: Source dict (url, optional 'state' with its breaker)
+        host_breakers: Host -> breaker dict
+        probing_hosts: Hosts already probed in this run (updated in place)
+        now: Current time (naive UTC)
+        claim_probe: Function host -> True if this worker got the probe
+
+    Returns:
+        None if the source can be fetched, else when to try again
+    """
+    state = source.get('state')
+    if breaker_status(state, now) == OPEN:
+        return state['breaker_open_until']
+
+    host = host_of(source['url'])
+    host_breaker = host_breakers.get(host)
+    status = breaker_status(host_breaker, now)
+    if status == OPEN:
+        return host_breaker['breaker_open_until']
+    if status == HALF_OPEN:
+        if host in probing_hosts or (claim_probe and not claim_probe(host)):
+            return now  # Retry right after the probe settles
+        probing_hosts.add(host)
+    return None
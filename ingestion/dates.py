@@ -0,0 +1,111 @@
+"""
+Fast date parsing for feed timestamps.
+
+Almost every feed uses one of two formats:
+- RFC 822 (RSS):   'Fri, 16 Oct 2026 21:14:07 GMT' / '... +0000'
+- ISO 8601 (Atom): '2026-10-16T17:14:07-04:00' / '...Z'
+
+Both get a dedicated fast path; anything else falls back to dateutil.
+Results are memoized (feeds repeat the same timestamps run after run)
+and always returned as timezone-aware UTC datetimes.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from dateutil import parser as date_parser
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# RFC 822 named zones (offset in hours)
+_ZONES = {
+    'GMT': 0, 'UT': 0, 'UTC': 0, 'Z': 0,
+    'EST': -5, 'EDT': -4, 'CST': -6, 'CDT': -5,
+    'MST': -7, 'MDT': -6, 'PST': -8, 'PDT': -7,
+}
+
+_RFC822 = re.compile(
+    r'^\s*(?:[A-Za-z]{3},?\s+)?'                  # Optional weekday
+    r'(\d{1,2})\s+([A-Za-z]{3})[a-z]*\s+(\d{2,4})\s+'  # Day, month, year
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?'             # Time
+    r'\s*([+-]\d{4}|[A-Za-z]{1,3})?\s*$'          # Zone
+)
+
+
+def _parse_rfc822(value: str) -> datetime | None:
+    """Parse an RFC 822 timestamp, or return None if it doesn't match."""
+    match = _RFC822.match(value)
+    if not match:
+        return None
+
+    day, month, year, hour, minute, second, zone = match.groups()
+    month_num = _MONTHS.get(month.lower())
+    if month_num is None:
+        return None
+
+    year_num = int(year)
+    if year_num < 100:
+        year_num += 2000 if year_num < 50 else 1900
+
+    if not zone:
+        offset = timedelta(0)
+    elif zone[0] in '+-':
+        sign = -1 if zone[0] == '-' else 1
+        offset = sign * timedelta(hours=int(zone[1:3]), minutes=int(zone[3:5]))
+    elif zone.upper() in _ZONES:
+        offset = timedelta(hours=_ZONES[zone.upper()])
+    else:
+        return None
+
+    try:
+        dt = datetime(year_num, month_num, int(day), int(hour), int(minute), int(second or 0))
+    except ValueError:
+        return None  # e.g. '31 Feb' - let dateutil have a go
+    return (dt - offset).replace(tzinfo=timezone.utc)
+
+
+def _parse_iso8601(value: str) -> datetime | None:
+    """Parse an ISO 8601 timestamp, or return None if it doesn't look like one."""
+    # Cheap shape check before handing it to the C parser
+    if len(value) < 10 or value[4] != '-' or not value[:4].isdigit():
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _parse_fallback(value: str) -> datetime:
+    """Parse anything dateutil understands (raises ValueError otherwise)."""
+    try:
+        dt = date_parser.parse(value)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Unrecognized date: {value!r}") from e
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def parse_feed_date(value: str) -> datetime:
+    """
+    Parse a feed timestamp into an aware UTC datetime.
+
+    Tries the RFC 822 and ISO 8601 fast paths, then dateutil. Timestamps
+    without a zone are taken as UTC.
+
+    Args:
+        value: Date string from a feed entry
+
+    Returns:
+        Timezone-aware datetime in UTC
+
+    Raises:
+        ValueError: If the string can't be parsed at all
+    """
+    return _parse_iso8601(value) or _parse_rfc822(value) or _parse_fallback(value)
@@ -1,56 +1,224 @@
-import requests, feedparser, logging
+import requests, feedparser, logging, time
+from collections.abc import Iterable, Iterator
 from config import get_settings
-from datetime import datetime
-from dateutil import parser as date_parser
-from database.utils import get_all_sources_standalone, save_articles_batch, get_source_by_id_standalone
+from datetime import datetime, timezone
+from database.utils import (
+    get_all_sources_standalone,
+    save_article_rows,
+    article_row,
+    ARTICLE_COLUMNS,
+    get_source_by_id_standalone,
+    get_feed_states_standalone,
+    get_feed_state_standalone,
+    save_feed_state,
+    save_feed_states,
+    get_host_breakers_standalone,
+    get_host_breaker_standalone,
+    save_host_breaker,
+    claim_host_probe,
+    to_naive_utc,
+)
+from database.near_duplicates import index_new_articles
+from ingestion.fetch_engine import run_pipeline
+from ingestion.http_client import get_http_session
+from ingestion.dates import parse_feed_date
+from ingestion.stream_parser import CHUNK_SIZE as STREAM_CHUNK_SIZE, iter_entries
+from ingestion.scheduler import next_poll
+from ingestion.watermark import entry_key, published_cutoff, advance_watermark
+from ingestion.seen_filter import get_seen_filter
+from ingestion.circuit_breaker import CLOSED, OPEN, host_of, record_success, record_failure, blocked_until
 
 settings = get_settings()
 
+URL_HASH_INDEX = ARTICLE_COLUMNS.index('url_hash')
+
 # Setup logging
 settings.setup_logging()
 logger = logging.getLogger(__name__)
 
 
 
-def fetch_feed(url: str) -> feedparser.FeedParserDict | None:
+def _failed_download(error: str, status: int | None = None, host_error: bool = False) -> dict:
+    """Response dict for a download that failed."""
+    return {
+        'status': status,
+        'content': None,
+        'etag': None,
+        'last_modified': None,
+        'content_length': 0,
+        'error': error,
+        'host_error': host_error,
+    }
+
+
+def _stream_body(response: requests.Response, result: dict) -> Iterator[bytes]:
     """
-    Fetch URL
+    Yield a streamed response's body chunk by chunk, then close it.
+
+    Keeps result['content_length'] up to date; a read failure is recorded
+    in result (as a host error, like a failed download) and re-raised.
+    """
+    try:
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            result['content_length'] += len(chunk)
+            yield chunk
+    except requests.RequestException as e:
+        logger.error(f"Reading the body of {response.url} failed: {e}")
+        result['error'] = f"Read failed: {e}"
+        result['host_error'] = True
+        raise
+    finally:
+        response.close()
+
+
+def download_feed(url: str, state: dict | None = None, stream: bool = False) -> dict:
+    """
+    Download raw feed bytes, as a conditional GET when validators are known.
     
     Args:
         url: URL to fetch
+        state: Stored feed state (etag, last_modified, content_length) or None
+        stream: Don't read the body here: 'content' is an iterator of body
+            chunks for the stream parser, read (and the connection released)
+            as it is consumed
     
     Returns:
-        Parsed XML response or None
+        Response dict:
+        - status (int or None): 200, 304 if the feed is unchanged, HTTP error code,
+          or None if no response came back
+        - content (bytes, iterator of bytes or None): Body (None on 304 or failure)
+        - etag / last_modified (str or None): Validators to store
+        - content_length (int): Body size (on 304, size of the cached body);
+          when streaming, the bytes read so far
+        - error (str or None): Why the download failed, None on success
+        - host_error (bool): Failure points at the host (timeout, connection, 5xx/429),
+          not at this one feed
     """
+    headers = {}
+    if state:
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
 
     logger.info(f"Fetching RSS feed: {url}")
     try:
-        response = requests.get(url, timeout=settings.request_timeout)
-        response.raise_for_status()
+        response = get_http_session().get(url, headers=headers, timeout=settings.request_timeout, stream=stream)
+
+        if response.status_code == 304:
+            logger.info(f"RSS feed {url} not modified (304)")
+            response.close()
+            return {
+                'status': 304,
+                'content': None,
+                'etag': state.get('etag') if state else None,
+                'last_modified': state.get('last_modified') if state else None,
+                'content_length': (state.get('content_length') or 0) if state else 0,
+                'error': None,
+                'host_error': False,
+            }
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
         logger.info(f"Fetching RSS feed {url} successful !")
-        parsed_xml = feedparser.parse(response.content)
-        return parsed_xml
+        if stream:
+            result = {
+                'status': response.status_code,
+                'content': None,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_length': 0,
+                'error': None,
+                'host_error': False,
+            }
+            result['content'] = _stream_body(response, result)
+            return result
+        return {
+            'status': response.status_code,
+            'content': response.content,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_length': len(response.content),
+            'error': None,
+            'host_error': False,
+        }
 
     except requests.HTTPError as e:
         logger.error(f"HTTP error: {e}")
-        return None
+        status = e.response.status_code if e.response is not None else None
+        return _failed_download(f"HTTP {status}", status, host_error=status is not None and (status >= 500 or status == 429))
     except requests.ConnectionError:
         logger.error(f"Network error - couldn't connect.\nURL: {url}")
-        return None
+        return _failed_download("Connection error", host_error=True)
     except requests.Timeout:
         logger.error(f"Request timed out.\nURL: {url}")
-        return None
+        return _failed_download("Timeout", host_error=True)
     except requests.RequestException as e:
         logger.error(f"Request failed: {e}")
+        return _failed_download(f"Request failed: {e}")
+
+
+def fetch_feed(url: str) -> feedparser.FeedParserDict | None:
+    """
+    Fetch URL
+    
+    Args:
+        url: URL to fetch
+    
+    Returns:
+        Parsed XML response or None
+    """
+    response = download_feed(url)
+    if response['error']:
         return None
+    return feedparser.parse(response['content'])
+
 
+def parse_entries(content: bytes | Iterable[bytes]) -> Iterable:
+    """
+    Parse feed bytes into entries with the configured backend.
+    
+    Args:
+        content: Raw feed bytes, or body chunks from download_feed(stream=True)
+        
+    Returns:
+        Iterable of entries (dict-like, read with .get())
+        - 'feedparser': full feedparser object tree
+        - 'stream': entries streamed one at a time (see ingestion.stream_parser)
+    """
+    if settings.feed_parser_backend == 'stream':
+        return iter_entries(content)
+    return feedparser.parse(content).entries
 
-def extract_articles(feed: feedparser.FeedParserDict) -> list[dict]:
+
+def extract_articles(feed: feedparser.FeedParserDict, watermark: dict | None = None) -> list[dict]:
     """
     Extract article metadata from parsed feed.
     
     Args:
         feed: Parsed feed from feedparser
+        watermark: Source watermark (last_published_at, recent_guids) or None
+        
+    Returns:
+        List of article dicts (see extract_entries)
+    """
+    return extract_entries(feed.entries, watermark)
+
+
+def extract_entries(entries: Iterable, watermark: dict | None = None, keys: list | None = None) -> list[dict]:
+    """
+    Extract article metadata from feed entries.
+    
+    With a watermark, entries already seen (known GUID/URL) or older than
+    the watermark's lookback window are skipped before any date parsing.
+    
+    Args:
+        entries: Feed entries (feedparser entries or streamed entry dicts)
+        watermark: Source watermark (last_published_at, recent_guids) or None
+        keys: If given, the GUID/URL of every entry is appended to it
         
     Returns:
         List of article dicts with:
@@ -58,16 +226,26 @@ def extract_articles(feed: feedparser.FeedParserDict) -> list[dict]:
         - url (str)
         - description (str or None)
         - author (str or None)
-        - published_at (datetime object)
+        - published_at (datetime object, aware UTC)
+        - guid (str): Entry GUID, or its URL if the feed has none
     """
     articles = []
+    seen_guids = set(watermark.get('recent_guids') or []) if watermark else set()
+    cutoff = published_cutoff(watermark, settings.watermark_lookback_hours, settings.watermark_max_skew_minutes)
+    skipped = 0
+    total = 0
     
-    if not feed.entries:
-        logger.warning("Feed has zero entries")
-        return articles
-    
-    for entry in feed.entries:
+    for entry in entries:
+        total += 1
         try:
+            # Cheapest check first: already seen on a previous run
+            guid = entry_key(entry)
+            if keys is not None:
+                keys.append(guid)
+            if guid in seen_guids:
+                skipped += 1
+                continue
+
             # Extract title (required)
             title = entry.get('title', 'No Title')
             
@@ -87,144 +265,643 @@ def extract_articles(feed: feedparser.FeedParserDict) -> list[dict]:
             published_str = entry.get('published') or entry.get('updated')
             if published_str:
                 try:
-                    published_at = date_parser.parse(published_str)
-                except Exception as e:
+                    published_at = parse_feed_date(published_str)
+                except ValueError as e:
                     logger.warning(f"Failed to parse date '{published_str}': {e}")
-                    published_at = datetime.now()
+                    published_at = datetime.now(timezone.utc)
             else:
                 # No date provided, use current time
-                published_at = datetime.now()
+                published_at = datetime.now(timezone.utc)
+
+            # Older than the watermark: stored long ago (or never will be)
+            if cutoff and to_naive_utc(published_at) < cutoff:
+                skipped += 1
+                continue
             
             articles.append({
                 'title': title,
                 'url': url,
                 'description': description,
                 'author': author,
-                'published_at': published_at  # datetime object, not string!
+                'published_at': published_at,  # datetime object, not string!
+                'guid': guid,
             })
             
         except Exception as e:
             logger.warning(f"Failed to parse entry: {e}")
             continue
     
-    logger.info(f"Extracted {len(articles)} articles from feed")
+    if not total:
+        logger.warning("Feed has zero entries")
+    elif skipped:
+        logger.info(f"Extracted {len(articles)} articles from feed ({skipped} already seen)")
+    else:
+        logger.info(f"Extracted {len(articles)} articles from feed")
     return articles
 
 
-def scrape_all_sources():
+# Order of the compact article tuples handed back by the parse stage
+ARTICLE_FIELDS = ('title', 'url', 'description', 'author', 'published_at', 'guid')
+
+
+def parse_feed_response(source: dict, response: dict | None) -> dict | None:
     """
-    Scrape articles from all sources in database.
+    Parse/extract stage: turn a downloaded feed into compact article tuples.
     
-    This is the main entry point for the scraper.
-    Reads sources from database, fetches their feeds, and saves articles.
+    Touches neither the network nor the database, so it can run in a
+    worker process (it is top-level and only takes/returns plain data).
+    
+    Args:
+        source: Source dict; source['state'] (if present) carries the watermark
+        response: Response dict from download_feed, or None if it failed
+        
+    Returns:
+        None if there is nothing to parse (failed fetch or 304), else a dict:
+        - articles (list[tuple]): New articles, fields in ARTICLE_FIELDS order
+        - keys (list[str]): GUID/URL of every entry in the feed
     """
-    logger.info("=" * 70)
-    logger.info("Starting RSS scraper...")
-    logger.info("=" * 70)
+    if response is None or response['error'] or response['status'] == 304:
+        return None
+
+    keys: list = []
+    articles = extract_entries(parse_entries(response['content']), source.get('state'), keys)
+    return {
+        'articles': [tuple(article[field] for field in ARTICLE_FIELDS) for article in articles],
+        'keys': keys,
+    }
+
+
+def new_scrape_result(name: str, failed: bool = False) -> dict:
+    """Blank per-source result dict (JSON-serializable, counts at zero)."""
+    return {
+        'name': name,
+        'fetched': 0,
+        'inserted': 0,
+        'duplicates': 0,
+        'skipped': 0,
+        'failed': failed,
+        'not_modified': False,
+        'bytes_saved': 0,
+        'circuit_open': False,
+        'filtered': 0,
+    }
+
+
+def _check_feed_result(source: dict, response: dict | None, parsed: dict | Exception | None) -> tuple:
+    """
+    Turn a fetch/parse outcome into a result dict and the articles to store.
     
-    # Get sources from database
-    sources = get_all_sources_standalone()
-    logger.info(f"Found {len(sources)} sources to scrape\n")
+    Returns:
+        (result, articles, keys); articles is None when there is nothing
+        to store (failed fetch or parse, 304)
+    """
+    result = new_scrape_result(source['name'])
+
+    if response is None or response['error']:
+        error = response['error'] if response else 'no response'
+        logger.error(f"Failed to fetch feed for {source['name']}: {error}")
+        result['failed'] = True
+        return result, None, []
+
+    if response['status'] == 304:
+        logger.info(f"⏭️  {source['name']}: not modified\n")
+        result['not_modified'] = True
+        result['bytes_saved'] = response['content_length']
+        return result, None, []
+
+    if parsed is None or isinstance(parsed, Exception):
+        logger.error(f"Failed to parse feed for {source['name']}: {parsed}\n")
+        result['failed'] = True
+        return result, None, []
+
+    articles = [dict(zip(ARTICLE_FIELDS, row)) for row in parsed['articles']]
+    keys = parsed['keys']
+    result['fetched'] = len(articles)
+    result['skipped'] = max(len(keys) - len(articles), 0)
+    return result, articles, keys
+
+
+def _stored_feed_state(source: dict, response: dict, result: dict, articles: list[dict], keys: list, inserted: int) -> dict:
+    """
+    Record the counts of a stored feed and return the feed_state fields to advance.
+    
+    Only call this once the articles are safely stored: the validators
+    and watermark it returns make the next poll skip them.
+    """
+    result['inserted'] = inserted
+    result['duplicates'] = len(articles) - inserted
+
+    if articles:
+        logger.info(
+            f"✅ {source['name']}: "
+            f"{inserted} new, {result['duplicates']} duplicates\n"
+        )
+    elif result['skipped']:
+        logger.info(f"⏭️  {source['name']}: nothing new ({result['skipped']} already seen)\n")
+    else:
+        logger.warning(f"No articles found for {source['name']}\n")
+
+    watermark = advance_watermark(source.get('state'), keys, articles, settings.watermark_max_guids,
+                                  settings.watermark_max_skew_minutes)
+    return {
+        'etag': response['etag'],
+        'last_modified': response['last_modified'],
+        'content_length': response['content_length'],
+        **watermark,
+    }
+
+
+def save_rows_filtered(rows: list[tuple]) -> tuple[dict, dict]:
+    """
+    Save article rows, dropping the ones the seen-URL filter knows first.
+    
+    Args:
+        rows: Article rows (see database.utils.article_row)
+        
+    Returns:
+        (source ID -> articles inserted, source ID -> rows dropped by the filter)
+    """
+    seen_filter = get_seen_filter()
+    filtered: dict = {}
+    if seen_filter is not None:
+        rows, filtered = seen_filter.screen(rows, URL_HASH_INDEX)
+
+    inserted = save_article_rows(rows) if rows else {}
+
+    if seen_filter is not None:
+        seen_filter.remember(row[URL_HASH_INDEX] for row in rows)
+    return inserted, filtered
+
+
+def index_stories(inserted: dict):
+    """
+    Cluster just-stored articles into stories (near-duplicate indexing).
+
+    Best effort: the articles are already committed, and whatever is
+    skipped here (indexer busy elsewhere, or an error) is picked up by
+    the next run or the periodic index_near_duplicates task.
+    """
+    if not settings.story_index_at_ingest or not any(inserted.values()):
+        return
+    try:
+        index_new_articles()
+    except Exception as e:
+        logger.error(f"Story clustering failed, leaving it to the next run: {e}")
+
+
+def write_feed_result(source: dict, response: dict | None, parsed: dict | Exception | None) -> dict:
+    """
+    Write stage: save parsed articles and advance the source's feed state.
     
-    total_inserted = 0
-    total_fetched = 0
-    failed_sources = []
+    Args:
+        source: Source dict (id, name, url, optional 'state')
+        response: Response dict from download_feed, or None if it failed
+        parsed: Output of parse_feed_response (the exception if it raised)
+        
+    Returns:
+        Result dict with name, fetched, inserted, duplicates, skipped,
+        failed, not_modified, bytes_saved and circuit_open
+    """
+    result, articles, keys = _check_feed_result(source, response, parsed)
+    if articles is None:
+        return result
+
+    try:
+        inserted, filtered = save_rows_filtered([article_row(article, source['id']) for article in articles])
+        result['filtered'] = filtered.get(source['id'], 0)
+        save_feed_state(source['id'], **_stored_feed_state(
+            source, response, result, articles, keys, inserted.get(source['id'], 0)
+        ))
+    except Exception as e:
+        logger.error(f"Failed to scrape {source['name']}: {e}\n")
+        result['failed'] = True
+        return result
+
+    index_stories(inserted)
+    return result
+
+
+class ArticleBatchWriter:
+    """
+    Write stage that stores the articles of many sources in one transaction.
     
-    for i, source in enumerate(sources, 1):
+    Sources are buffered until `max_rows` articles are pending or the
+    oldest one has waited `max_wait` seconds. flush() then saves all
+    their articles in one transaction and their feed state (validators,
+    watermark, schedule, breaker) in a second one, and appends their
+    per-source result dicts to `results`. Feed state only advances for
+    sources whose articles were stored.
+    """
+
+    def __init__(self, host_breakers: dict | None = None, max_rows: int = 2000, max_wait: float = 5.0):
+        self.results: list[dict] = []
+        self._host_breakers = host_breakers
+        self._max_rows = max_rows
+        self._max_wait = max_wait
+        self._pending: list[tuple] = []
+        self._rows = 0
+        self._oldest: float | None = None
+
+    def write(self, source: dict, response: dict | None, parsed: dict | Exception | None):
+        """Buffer one source (same arguments as write_feed_result); flushes when a bound is hit."""
+        result, articles, keys = _check_feed_result(source, response, parsed)
+        self._pending.append((source, response, result, articles, keys))
+        self._rows += len(articles or ())
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+
+        if self._rows >= self._max_rows or time.monotonic() - self._oldest >= self._max_wait:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending, self._rows, self._oldest = [], 0, None
+
+        inserted = self._save_articles(pending)
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        states = {}
+        for source, response, result, articles, keys in pending:
+            fields = {}
+            if articles is not None and not result['failed']:
+                fields.update(_stored_feed_state(
+                    source, response, result, articles, keys, inserted.get(source['id'], 0)
+                ))
+            fields.update(poll_outcome_fields(source, result, now))
+            states[source['id']] = fields
+            if response is not None:
+                _update_host_breaker(host_of(source['url']), response, self._host_breakers, now)
+            self.results.append(result)
+
         try:
-            logger.info(f"[{i}/{len(sources)}] Scraping {source['name']}...")
-            
-            # Fetch RSS feed
-            feed = fetch_feed(source['url'])
-            
-            if not feed:
-                logger.error(f"Failed to fetch feed for {source['name']}")
-                failed_sources.append(source['name'])
+            save_feed_states(states)
+        except Exception as e:
+            logger.error(f"Failed to save feed state for {len(states)} sources: {e}")
+
+        index_stories(inserted)
+
+    def _save_articles(self, pending: list[tuple]) -> dict:
+        """Save the batch in one transaction; on failure, retry source by source."""
+        rows = [
+            article_row(article, source['id'])
+            for source, _, _, articles, _ in pending if articles
+            for article in articles
+        ]
+        if not rows:
+            return {}
+        try:
+            inserted, filtered = save_rows_filtered(rows)
+            for source, _, result, _, _ in pending:
+                result['filtered'] = filtered.get(source['id'], 0)
+            return inserted
+        except Exception as e:
+            logger.error(f"Batch write of {len(rows)} articles failed ({e}), retrying per source")
+
+        # Keep one bad source from failing the whole batch
+        inserted = {}
+        for source, _, result, articles, _ in pending:
+            if not articles:
                 continue
-            
-            # Extract articles
-            articles = extract_articles(feed)
-            total_fetched += len(articles)
-            
-            if articles:
-                # Save to database
-                inserted = save_articles_batch(articles, source['id'])
-                total_inserted += inserted
-                
-                duplicates = len(articles) - inserted
-                logger.info(
-                    f"✅ {source['name']}: "
-                    f"{inserted} new, {duplicates} duplicates\n"
+            try:
+                # Through the filter too, so these rows are remembered like the batch's
+                source_inserted, filtered = save_rows_filtered(
+                    [article_row(article, source['id']) for article in articles]
                 )
-            else:
-                logger.warning(f"No articles found for {source['name']}\n")
-                
-        except Exception as e:
-            logger.error(f"Failed to scrape {source['name']}: {e}\n")
-            failed_sources.append(source['name'])
-            continue
+                inserted[source['id']] = source_inserted.get(source['id'], 0)
+                result['filtered'] = filtered.get(source['id'], 0)
+            except Exception as e:
+                logger.error(f"Failed to scrape {source['name']}: {e}\n")
+                result['failed'] = True
+        return inserted
+
+
+def process_feed(source: dict, response: dict | None, state: dict | None = None) -> dict:
+    """
+    Parse a downloaded feed, extract its new articles and save them.
+    
+    Runs the parse and write stages inline. A 304 (not modified) response
+    skips parsing and the database entirely; entries behind the source's
+    watermark are skipped during extraction.
+    
+    Args:
+        source: Source dict (id, name, url)
+        response: Response dict from download_feed, or None if it failed
+        state: Stored feed state of the source (carries the watermark) or None
+        
+    Returns:
+        Result dict (see write_feed_result)
+    """
+    source = {**source, 'state': state}
+    try:
+        parsed = parse_feed_response(source, response)
+    except Exception as e:
+        parsed = e
+    return write_feed_result(source, response, parsed)
+
+
+def claim_probe(host: str) -> bool:
+    """
+    Claim a half-open host's single probe for this worker (see claim_host_probe).
+
+    Returns:
+        True if this worker may probe the host
+    """
+    try:
+        return claim_host_probe(host, settings.breaker_probe_lease)
+    except Exception as e:
+        # Unsure whether another worker is probing: leave it to the next run
+        logger.error(f"Failed to claim the probe of host {host}: {e}")
+        return False
+
+
+def skip_open_circuit(source: dict, until: datetime) -> dict:
+    """
+    Skip a source held back by an open breaker and push back its next poll.
+    
+    Args:
+        source: Source dict (id, name)
+        until: When the breaker lets the source through again (naive UTC)
+        
+    Returns:
+        Result dict with circuit_open set
+    """
+    logger.info(f"🔌 {source['name']}: circuit open, skipped until {until:%Y-%m-%d %H:%M} UTC")
+    try:
+        save_feed_state(source['id'], next_poll_at=until)
+    except Exception as e:
+        logger.error(f"Failed to defer {source['name']}: {e}")
+    result = new_scrape_result(source['name'])
+    result['circuit_open'] = True
+    return result
+
+
+def poll_outcome_fields(source: dict, result: dict, now: datetime) -> dict:
+    """
+    Schedule and breaker fields of feed_state after a poll.
+    
+    Args:
+        source: Source dict (name, optional 'state')
+        result: Result dict from write_feed_result
+        now: Time of the poll (naive UTC)
+        
+    Returns:
+        Dict of feed_state fields (next_poll output plus breaker fields)
+    """
+    state = source.get('state')
+    schedule = next_poll(
+        state,
+        new_articles=result['inserted'],
+        failed=result['failed'],
+        now=now,
+        default_interval=settings.fetch_interval,
+        min_interval=settings.poll_min_interval,
+        max_interval=settings.poll_max_interval,
+        target_new=settings.poll_target_new,
+        smoothing=settings.poll_rate_smoothing,
+    )
+
+    if result['failed']:
+        breaker = record_failure(
+            state, schedule['consecutive_failures'], now,
+            settings.breaker_failure_threshold,
+            settings.breaker_base_cooldown,
+            settings.breaker_max_cooldown,
+        )
+        if breaker['breaker_state'] == OPEN:
+            # Nothing to gain from polling before the breaker lets us through
+            schedule['next_poll_at'] = max(schedule['next_poll_at'], breaker['breaker_open_until'])
+            logger.warning(f"🔌 {source['name']}: circuit open until {breaker['breaker_open_until']:%Y-%m-%d %H:%M} UTC")
+    else:
+        breaker = record_success()
+
+    logger.debug(f"{source['name']}: next poll in {schedule['poll_interval']}s")
+    return {**schedule, **breaker}
+
+
+def record_poll_outcome(source: dict, response: dict | None, result: dict, host_breakers: dict | None = None):
+    """
+    Record a poll outcome: schedule the next poll and update the breakers.
+    
+    The source's breaker follows every failure of the feed. The host's
+    breaker only follows failures that point at the host (timeouts,
+    connection errors, 5xx/429); a 404 on one feed says nothing about
+    its neighbours, so it leaves the host breaker alone.
     
-    # Final summary
+    Args:
+        source: Source dict (id, name, url, optional 'state')
+        response: Response dict from download_feed, or None if it failed
+        result: Result dict from write_feed_result
+        host_breakers: Host -> breaker dict, updated in place (or None)
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        save_feed_state(source['id'], **poll_outcome_fields(source, result, now))
+    except Exception as e:
+        logger.error(f"Failed to save schedule for {source['name']}: {e}")
+
+    if response is not None:
+        _update_host_breaker(host_of(source['url']), response, host_breakers, now)
+
+
+def _update_host_breaker(host: str, response: dict, host_breakers: dict | None, now: datetime):
+    """Feed one download outcome into its host's breaker (in memory and in the database)."""
+    if host_breakers is None:
+        host_breakers = {}
+    breaker = host_breakers.get(host)
+
+    if response['error'] is None:
+        if not breaker or (breaker['breaker_state'] == CLOSED and not breaker['consecutive_failures']):
+            return  # Already healthy, skip the write
+        fields = {**record_success(), 'consecutive_failures': 0}
+    elif response['host_error']:
+        failures = ((breaker or {}).get('consecutive_failures') or 0) + 1
+        fields = {
+            **record_failure(
+                breaker, failures, now,
+                settings.breaker_failure_threshold,
+                settings.breaker_base_cooldown,
+                settings.breaker_max_cooldown,
+            ),
+            'consecutive_failures': failures,
+        }
+        if fields['breaker_state'] == OPEN:
+            logger.warning(f"🔌 Host {host}: circuit open until {fields['breaker_open_until']:%Y-%m-%d %H:%M} UTC")
+    else:
+        return  # Feed-specific error (e.g. 404), the host is fine
+
+    host_breakers[host] = {'host': host, **fields}
+    try:
+        save_host_breaker(host, **fields)
+    except Exception as e:
+        logger.error(f"Failed to save breaker for host {host}: {e}")
+
+
+def log_scrape_summary(results: list[dict], sources_count: int, filter_stats: dict | None = None):
+    """
+    Log the end-of-run summary for a scrape.
+    
+    Args:
+        results: Per-source result dicts from write_feed_result
+        sources_count: Number of sources in the run
+        filter_stats: SeenUrlFilter.stats() of the run, if it used one in this process
+    """
+    total_fetched = sum(r['fetched'] for r in results)
+    total_inserted = sum(r['inserted'] for r in results)
+    failed_sources = [r['name'] for r in results if r['failed']]
+    skipped = sum(r['skipped'] for r in results)
+    not_modified = sum(1 for r in results if r['not_modified'])
+    bytes_saved = sum(r['bytes_saved'] for r in results)
+    circuit_open = [r['name'] for r in results if r.get('circuit_open')]
+    filtered = sum(r.get('filtered', 0) for r in results)
+
     logger.info("=" * 70)
     logger.info("Scraping complete!")
     logger.info("=" * 70)
-    logger.info(f"Sources processed: {len(sources)}")
+    logger.info(f"Sources processed: {sources_count}")
     logger.info(f"Articles fetched:  {total_fetched}")
     logger.info(f"Articles inserted: {total_inserted}")
     logger.info(f"Duplicates skip:   {total_fetched - total_inserted}")
+    logger.info(f"Already seen:      {skipped} (skipped by watermark)")
+    logger.info(f"Not modified:      {not_modified} (304s, {bytes_saved / 1024:.1f} KB saved)")
+    if total_fetched:
+        logger.info(f"Seen filter:       {filtered} known URLs never sent to the DB ({filtered / total_fetched:.1%} of fetched)")
+    if filter_stats:
+        logger.info(
+            f"                   hit rate {filter_stats['hit_rate']:.1%}, "
+            f"{filter_stats['false_positives']}/{filter_stats['sampled']} sampled false positives"
+        )
+        logger.info(
+            f"                   {filter_stats['urls']} URLs in {filter_stats['memory_mb']:.1f} MB "
+            f"({filter_stats['mb_per_million']:.2f} MB per million)"
+        )
+    if circuit_open:
+        logger.warning(f"Circuit open:      {', '.join(circuit_open)}")
     if failed_sources:
         logger.warning(f"Failed sources:    {', '.join(failed_sources)}")
     logger.info("=" * 70)
+
+
+def scrape_all_sources():
+    """
+    Scrape articles from all sources in database.
+    
+    This is the main entry point for the scraper.
+    Reads sources from database and runs them through the
+    fetch -> parse -> write pipeline (see ingestion.fetch_engine):
+    downloads overlap, parsing runs on `parse_workers` processes (or, with
+    the stream backend, on the download threads as the body arrives), and
+    parsed sources are written in batches (see ArticleBatchWriter).
+    """
+    logger.info("=" * 70)
+    logger.info("Starting RSS scraper...")
+    logger.info("=" * 70)
     
-    return total_inserted
+    # Get sources from database
+    states = get_feed_states_standalone()
+    sources = [
+        {**source, 'state': states.get(source['id'])}
+        for source in get_all_sources_standalone()
+    ]
+    logger.info(f"Found {len(sources)} sources to scrape\n")
+
+    # Hold back sources whose feed or host breaker is open
+    host_breakers = get_host_breakers_standalone()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    probing_hosts: set = set()
+    runnable, skipped = [], []
+    for source in sources:
+        until = blocked_until(source, host_breakers, probing_hosts, now, claim_probe)
+        if until is None:
+            runnable.append(source)
+        else:
+            skipped.append(skip_open_circuit(source, until))
 
+    seen_filter = get_seen_filter()
+    if seen_filter is not None:
+        seen_filter.reset_stats()
 
-def scrape_source_by_id(source_id: int):
+    done = 0
+    writer = ArticleBatchWriter(host_breakers, settings.write_batch_rows, settings.write_batch_seconds)
+
+    # The stream backend parses the body as it downloads, so the parse
+    # stage runs inside the fetch (see run_pipeline's parse_in_fetch)
+    streaming = settings.feed_parser_backend == 'stream'
+
+    def fetch(source: dict) -> dict | None:
+        return download_feed(source['url'], source['state'], stream=streaming)
+
+    def write(source: dict, response: dict | None, parsed: dict | Exception | None):
+        nonlocal done
+        done += 1
+        logger.info(f"[{done}/{len(runnable)}] Queued {source['name']} for writing")
+        writer.write(source, response, parsed)
+
+    run_pipeline(
+        runnable,
+        fetch,
+        parse_feed_response,
+        write,
+        concurrency=settings.fetch_concurrency,
+        per_host=settings.fetch_per_host_limit,
+        parse_workers=settings.parse_workers,
+        flush=writer.flush,
+        flush_interval=settings.write_batch_seconds,
+        parse_in_fetch=streaming,
+    )
+    results = skipped + writer.results
+
+    log_scrape_summary(results, len(sources), seen_filter.stats() if seen_filter else None)
+    
+    return sum(r['inserted'] for r in results)
+
+
+def scrape_source(source_id: int) -> dict | None:
     """
-    Scrape articles from a single source by ID.
+    Scrape a single source and return its result dict.
     
     Args:
         source_id: ID of the source to scrape
+        
+    Returns:
+        Result dict (see write_feed_result), or None if the source doesn't exist
     """
     logger.info(f"Starting scrape for source ID {source_id}...")
-
-    
     
     # Get source from database
     source = get_source_by_id_standalone(source_id)
     
     if not source:
         logger.error(f"Source with ID {source_id} not found")
-        return 0
+        return None
     
-    try:
-        # Fetch RSS feed
-        feed = fetch_feed(source['url'])
-        
-        if not feed:
-            logger.error(f"Failed to fetch feed for {source['name']}")
-            return 0
-        
-        # Extract articles
-        articles = extract_articles(feed)
-        
-        if articles:
-            # Save to database
-            inserted = save_articles_batch(articles, source['id'])
-            duplicates = len(articles) - inserted
-            
-            logger.info(
-                f"✅ {source['name']}: "
-                f"{inserted} new, {duplicates} duplicates\n"
-            )
-            return inserted
-        else:
-            logger.warning(f"No articles found for {source['name']}\n")
-            return 0
-            
-    except Exception as e:
-        logger.error(f"Failed to scrape {source['name']}: {e}\n")
-        return 0
+    state = get_feed_state_standalone(source_id)
+    source = {**source, 'state': state}
+
+    host = host_of(source['url'])
+    host_breaker = get_host_breaker_standalone(host)
+    host_breakers = {host: host_breaker} if host_breaker else {}
+    until = blocked_until(source, host_breakers, set(), datetime.now(timezone.utc).replace(tzinfo=None), claim_probe)
+    if until is not None:
+        return skip_open_circuit(source, until)
+
+    response = download_feed(source['url'], state, stream=settings.feed_parser_backend == 'stream')
+    result = process_feed(source, response, state)
+    record_poll_outcome(source, response, result, host_breakers)
+    return result
+
+
+def scrape_source_by_id(source_id: int):
+    """
+    Scrape articles from a single source by ID.
+    
+    Args:
+        source_id: ID of the source to scrape
+    """
+    result = scrape_source(source_id)
+    return result['inserted'] if result else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+"""
+Concurrent fetch engine for the RSS scraper.
+
+Runs the scrape as three stages:
+
+    fetch  ->  parse/extract  ->  write
+
+- fetch: downloads in parallel (asyncio driving a thread pool) with a
+  global limit on in-flight downloads and a per-host limit, so one
+  outlet with several feeds can't hog every slot
+- parse/extract: CPU-bound, runs on a ProcessPoolExecutor when
+  parse_workers > 0 (raw bytes in, compact article tuples out), so it
+  scales with cores instead of fighting over the GIL. With
+  parse_in_fetch, it runs on the download thread instead, inside the
+  download's slots, for bodies that are streamed into the parser
+- write: a single consumer on its own thread, so database writes never
+  run more than one at a time and a slow write never holds a download
+  slot. A batching writer can buffer several sources and pass a
+  `flush` callback, which also runs whenever the queue has been idle for
+  `flush_interval` seconds and once at the end
+
+Stages are connected by bounded queues/semaphores: memory stays bounded
+even when downloads outpace parsing or the database.
+"""
+import asyncio
+import logging
+import multiprocessing
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+def _host(url: str) -> str:
+    """Return the lowercase host of a URL ('' if it has none)."""
+    return (urlsplit(url).hostname or '').lower()
+
+
+def _make_parse_pool(parse_workers: int) -> ProcessPoolExecutor | None:
+    """Create the parse process pool, or None to parse in threads."""
+    if parse_workers <= 0:
+        return None
+    if multiprocessing.current_process().daemon:
+        # e.g. inside a daemonic worker: not allowed to have children
+        logger.warning("Daemonic process can't start a parse pool, parsing in threads")
+        return None
+    # 'spawn' so children never inherit locks held by our download threads
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+async def _parse(
+    source: dict,
+    parse: Callable[[dict, Any], Any],
+    fetched: Any,
+    parse_executor: Executor,
+) -> Any:
+    """Run the parse stage for one source (the exception if it raised)."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(parse_executor, parse, source, fetched)
+    except Exception as e:
+        logger.error(f"Parse crashed for {source['name']}: {e}")
+        return e
+
+
+async def _process_one(
+    source: dict,
+    fetch: Callable[[dict], Any],
+    parse: Callable[[dict, Any], Any],
+    io_executor: Executor,
+    parse_executor: Executor,
+    inflight: asyncio.Semaphore,
+    global_limit: asyncio.Semaphore,
+    host_limit: asyncio.Semaphore,
+    queue: asyncio.Queue,
+    parse_in_fetch: bool,
+) -> None:
+    """Download and parse one source, then queue it for the writer."""
+    loop = asyncio.get_running_loop()
+
+    # The host's slot first: a feed queued behind a busy host must not sit
+    # on a global (or in-flight) slot meanwhile, starving the other hosts.
+    # inflight bounds raw bodies held between the fetch and parse stages,
+    # so it is kept through the parse.
+    async with host_limit:
+        await inflight.acquire()
+        try:
+            async with global_limit:
+                try:
+                    fetched = await loop.run_in_executor(io_executor, fetch, source)
+                except Exception as e:
+                    logger.error(f"Fetch crashed for {source['name']}: {e}")
+                    fetched = None
+                if parse_in_fetch:
+                    # The parse reads the body: keep it under the download limits
+                    parsed = await _parse(source, parse, fetched, io_executor)
+        except BaseException:
+            inflight.release()
+            raise
+
+    try:
+        if not parse_in_fetch:
+            parsed = await _parse(source, parse, fetched, parse_executor)
+    finally:
+        inflight.release()
+
+    # Blocks when the writer falls behind (backpressure)
+    await queue.put((source, fetched, parsed))
+
+
+async def _run(
+    sources: list[dict],
+    fetch: Callable[[dict], Any],
+    parse: Callable[[dict, Any], Any],
+    write: Callable[[dict, Any, Any], Any],
+    concurrency: int,
+    per_host: int,
+    parse_workers: int,
+    flush: Callable[[], Any] | None,
+    flush_interval: float | None,
+    parse_in_fetch: bool,
+) -> list:
+    """Run every source through fetch -> parse -> write."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    inflight = asyncio.Semaphore(concurrency * 2)
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits: defaultdict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(per_host)
+    )
+    loop = asyncio.get_running_loop()
+    results = []
+
+    parse_pool = None if parse_in_fetch else _make_parse_pool(parse_workers)
+
+    # The writer gets a thread of its own: sharing the download pool, a slow
+    # COPY would take a download slot and could wait behind the very
+    # downloads it is supposed to drain
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='fetch') as io_executor, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='write') as write_executor:
+        try:
+            parse_executor = parse_pool or io_executor
+            producers = [
+                asyncio.create_task(_process_one(
+                    source, fetch, parse, io_executor, parse_executor, inflight,
+                    global_limit, host_limits[_host(source['url'])], queue, parse_in_fetch
+                ))
+                for source in sources
+            ]
+
+            received = 0
+            while received < len(sources):
+                try:
+                    source, fetched, parsed = await asyncio.wait_for(
+                        queue.get(), flush_interval if flush else None
+                    )
+                except asyncio.TimeoutError:
+                    # Nothing new for a while: don't sit on buffered writes
+                    await loop.run_in_executor(write_executor, flush)
+                    continue
+                received += 1
+                # Writes are serialized, off the event loop so the other stages keep flowing
+                results.append(await loop.run_in_executor(write_executor, write, source, fetched, parsed))
+
+            if flush:
+                await loop.run_in_executor(write_executor, flush)
+
+            await asyncio.gather(*producers)
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
+
+    return results
+
+
+def run_pipeline(
+    sources: list[dict],
+    fetch: Callable[[dict], Any],
+    parse: Callable[[dict, Any], Any],
+    write: Callable[[dict, Any, Any], Any],
+    concurrency: int = 16,
+    per_host: int = 2,
+    parse_workers: int = 0,
+    flush: Callable[[], Any] | None = None,
+    flush_interval: float | None = None,
+    parse_in_fetch: bool = False,
+) -> list:
+    """
+    Run all sources through the fetch -> parse -> write pipeline.
+
+    Args:
+        sources: Source dicts (must contain 'name' and 'url')
+        fetch: Blocking function source -> fetched (None on failure)
+        parse: Function (source, fetched) -> parsed. Must be a picklable
+            top-level function when parse_workers > 0. If it raises, the
+            exception is passed on as `parsed`.
+        write: Blocking function (source, fetched, parsed) -> result, called serially
+        concurrency: Max downloads in flight overall
+        per_host: Max downloads in flight against the same host
+        parse_workers: Processes for the parse stage (0 = parse in threads)
+        flush: Blocking function called (on the writer's thread) after
+            `flush_interval` idle seconds and once after the last write
+        flush_interval: Idle seconds before `flush` runs (None = only at the end)
+        parse_in_fetch: Parse on the download thread, still holding the
+            source's download slots (for a fetch that hands back a streamed
+            body the parse reads). parse_workers is then ignored.
+
+    Returns:
+        List of `write` results, in completion order
+    """
+    if not sources:
+        return []
+    return asyncio.run(_run(
+        sources, fetch, parse, write,
+        max(1, concurrency), max(1, per_host), parse_workers, flush, flush_interval, parse_in_fetch
+    ))
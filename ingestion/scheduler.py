@@ -0,0 +1,81 @@
+"""
+Adaptive per-source polling schedule.
+
+Each source gets its own poll interval instead of one hourly scrape:
+- the publish rate (new articles/hour) is tracked as a moving average
+- busy sources are polled often enough to pick up ~`target_new` articles
+  per poll, quiet sources drift towards the maximum interval
+- a failed poll observed nothing, so it leaves the rate, the interval and
+  last_polled_at alone and is retried one interval later; backing off
+  from failing feeds and hosts is the circuit breakers' job
+  (ingestion/circuit_breaker.py)
+
+Intervals are always clamped to [min_interval, max_interval].
+"""
+from datetime import datetime, timedelta
+
+# Growth factor of the interval for a poll that found nothing new
+QUIET_BACKOFF = 1.5
+
+
+def next_poll(
+    state: dict | None,
+    new_articles: int,
+    failed: bool,
+    now: datetime,
+    default_interval: int,
+    min_interval: int,
+    max_interval: int,
+    target_new: float,
+    smoothing: float,
+) -> dict:
+    """
+    Compute a source's schedule after a poll.
+
+    Args:
+        state: Stored feed state (poll_interval, publish_rate,
+            last_polled_at = last successful poll, consecutive_failures) or None
+        new_articles: Articles inserted by this poll
+        failed: Whether the poll failed (network, HTTP or parse error)
+        now: Time of the poll (naive UTC)
+        default_interval: Interval for a source with no history (seconds)
+        min_interval / max_interval: Bounds for the interval (seconds)
+        target_new: Articles we aim to pick up per poll
+        smoothing: Weight of the newest observation in the moving average
+
+    Returns:
+        Dict with poll_interval, publish_rate, consecutive_failures,
+        last_polled_at and next_poll_at
+    """
+    state = state or {}
+    interval = state.get('poll_interval') or default_interval
+    rate = state.get('publish_rate')
+    failures = state.get('consecutive_failures') or 0
+
+    last_polled_at = state.get('last_polled_at')
+    if failed:
+        # Not an empty poll: what was published meanwhile is still in the
+        # feed, and the next successful poll counts it over the whole gap
+        failures += 1
+    else:
+        failures = 0
+
+        elapsed = (now - last_polled_at).total_seconds() if last_polled_at else interval
+        observed = new_articles / max(elapsed / 3600, 1 / 60)
+
+        rate = observed if rate is None else smoothing * observed + (1 - smoothing) * rate
+
+        if new_articles == 0:
+            interval = interval * QUIET_BACKOFF
+        elif rate > 0:
+            interval = 3600 * target_new / rate
+
+    interval = int(min(max(interval, min_interval), max_interval))
+
+    return {
+        'poll_interval': interval,
+        'publish_rate': rate,
+        'consecutive_failures': failures,
+        'last_polled_at': last_polled_at if failed else now,
+        'next_poll_at': now + timedelta(seconds=interval),
+    }
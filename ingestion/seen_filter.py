@@ -0,0 +1,241 @@
+"""
+In-process filter of article URLs that are already stored.
+
+On a repeat scrape almost every entry that survives the watermark is
+still already in the database, and each one costs an ON CONFLICT probe.
+A Bloom filter of stored url_hash values (see database/urls.py) lets the
+writer drop those before they reach Postgres:
+
+- "not seen" is always right, so those rows go to the database
+- "seen" is wrong with probability ~error_rate; a sampled share of the
+  "seen" rows is looked up in the database, which measures the false
+  positive rate and rescues the sampled false positives
+
+One filter per process, warmed from the database on first use (so a
+Celery child that never scrapes never pays for it) and updated after
+every write. Deleting a source's articles releases their URLs; the
+filter still holds them, so it is rebuilt when the URL release
+generation (url_release_state) has moved since it was warmed.
+"""
+import logging
+import math
+import os
+import random
+import threading
+from collections.abc import Callable, Iterable
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """Bloom filter over 64-bit integer keys (already uniformly hashed)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    # Double hashing on the two halves of the key (Kirsch-Mitzenmacher);
+    # loops are inlined because warming runs this millions of times
+
+    def add(self, key: int):
+        key &= _MASK64
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        bits, num_bits = self._bits, self.num_bits
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        key &= _MASK64
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        bits, num_bits = self._bits, self.num_bits
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class SeenUrlFilter:
+    """
+    Bloom filter of stored url_hash values, with hit statistics.
+
+    Args:
+        capacity: URLs the filter is sized for
+        error_rate: Target false positive rate at capacity
+        sample_rate: Share of "seen" rows still checked against the database
+        check_existing: Function hashes -> set of the ones stored in the database
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sample_rate: float,
+        check_existing: Callable[[list[int]], set],
+    ):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.sample_rate = sample_rate
+        self._check_existing = check_existing
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero the hit counters (the filter content is kept)."""
+        self.checked = 0
+        self.hits = 0
+        self.sampled = 0
+        self.false_positives = 0
+
+    def warm(self, hashes: Iterable[int]) -> int:
+        """Add stored url_hash values; returns how many were added."""
+        added = 0
+        for key in hashes:
+            self.bloom.add(key)
+            added += 1
+        return added
+
+    def remember(self, hashes: Iterable[int]):
+        """Add url_hash values that are now stored."""
+        for key in hashes:
+            self.bloom.add(key)
+
+    def screen(self, rows: list[tuple], hash_index: int, source_index: int = 0) -> tuple[list[tuple], dict]:
+        """
+        Drop rows whose URL is (almost certainly) already stored.
+
+        Args:
+            rows: Article rows
+            hash_index: Position of url_hash in a row
+            source_index: Position of source_id in a row
+
+        Returns:
+            (rows to write, source ID -> number of rows dropped)
+        """
+        keep, seen = [], []
+        for row in rows:
+            if row[hash_index] in self.bloom:
+                seen.append(row)
+            else:
+                keep.append(row)
+        self.checked += len(rows)
+
+        sample = {row[hash_index] for row in seen if random.random() < self.sample_rate}
+        missed: set = set()
+        if sample:
+            try:
+                missed = sample - self._check_existing(list(sample))
+            except Exception as e:
+                # Unmeasured, not false positives: the stats skip this sample
+                logger.error(f"Seen-URL sample check failed, writing the sample: {e}")
+                missed = sample
+            else:
+                self.sampled += len(sample)
+                self.false_positives += len(missed)
+
+        dropped: dict = {}
+        for row in seen:
+            if row[hash_index] in missed:
+                keep.append(row)  # False positive: it's new after all
+                continue
+            self.hits += 1
+            dropped[row[source_index]] = dropped.get(row[source_index], 0) + 1
+        return keep, dropped
+
+    def stats(self) -> dict:
+        """Filter size and hit statistics since the last reset_stats()."""
+        megabytes = self.bloom.nbytes / 1e6
+        return {
+            'urls': self.bloom.count,
+            'capacity': self.bloom.capacity,
+            'memory_mb': megabytes,
+            'mb_per_million': megabytes / self.bloom.capacity * 1e6,
+            'checked': self.checked,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.checked if self.checked else 0.0,
+            'sampled': self.sampled,
+            'false_positives': self.false_positives,
+        }
+
+
+_filter: SeenUrlFilter | None = None
+_filter_pid: int | None = None
+_filter_generation: int | None = None
+_lock = threading.Lock()
+
+
+def _build_filter() -> SeenUrlFilter:
+    """Create the filter and warm it with recently stored URLs."""
+    # Imported here: database.utils pulls in the engine, keep this module light
+    from database.utils import get_existing_url_hashes, iter_recent_url_hashes
+
+    settings = get_settings()
+    seen_filter = SeenUrlFilter(
+        settings.seen_filter_capacity,
+        settings.seen_filter_error_rate,
+        settings.seen_filter_sample_rate,
+        get_existing_url_hashes,
+    )
+    warmed = seen_filter.warm(iter_recent_url_hashes(settings.seen_filter_warm_days))
+    logger.info(
+        f"Seen-URL filter warmed with {warmed} URLs "
+        f"({seen_filter.bloom.nbytes / 1e6:.1f} MB, {seen_filter.bloom.num_hashes} hashes)"
+    )
+    return seen_filter
+
+
+def get_seen_filter() -> SeenUrlFilter | None:
+    """
+    Get the process-wide seen-URL filter (None when disabled or unavailable).
+
+    Built lazily and rebuilt after a fork, once it holds more URLs than
+    it was sized for (its false positive rate would climb past the
+    target), or once URLs it holds were released from article_urls. The
+    release generation is read on every call: one single-row lookup per
+    write batch.
+    """
+    global _filter, _filter_pid, _filter_generation
+    from database.utils import get_url_release_generation
+
+    settings = get_settings()
+    if not settings.seen_filter_enabled:
+        return None
+
+    try:
+        generation = get_url_release_generation()
+    except Exception as e:
+        # Can't tell whether it's stale: every row goes to the database
+        logger.error(f"Couldn't check the seen-URL filter's generation: {e}")
+        return None
+
+    def stale() -> bool:
+        return (_filter is None or _filter_pid != pid or _filter_generation != generation
+                or _filter.bloom.count > _filter.bloom.capacity)
+
+    pid = os.getpid()
+    if stale():
+        with _lock:
+            if stale():
+                if _filter is not None and _filter_pid == pid and _filter_generation != generation:
+                    logger.info("Stored URLs were released, rebuilding the seen-URL filter")
+                try:
+                    _filter = _build_filter()
+                except Exception as e:
+                    # Without it every row simply goes to the database
+                    logger.error(f"Couldn't warm the seen-URL filter: {e}")
+                    _filter = None
+                    return None
+                _filter_pid = pid
+                _filter_generation = generation
+    return _filter
@@ -0,0 +1,240 @@
+"""
+Streaming RSS/Atom parser.
+
+An alternative to feedparser for the scraper: the feed is fed to an
+incremental XML parser chunk by chunk, straight from the HTTP response,
+and entries are yielded one at a time, each as a plain dict with the
+fields extract_articles reads:
+
+    title, link, summary, author, published, updated, id
+
+Finished entries are detached from the tree as soon as they are yielded,
+so memory per entry stays constant no matter how many items the feed
+has, and the body itself is never held whole in memory.
+
+Entries carry the same values feedparser would give: a permalink GUID
+(or Atom id) stands in for a missing link, and HTML fields go through
+feedparser's sanitizer. Malformed XML (undefined HTML entities,
+truncated bodies...) falls back to feedparser for the rest of the feed;
+the body is spooled as it streams (to disk past SPOOL_MAX_SIZE) so the
+fallback can re-read it.
+"""
+import logging
+import tempfile
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+import feedparser
+from feedparser.mixin import _FeedParserMixin
+from feedparser.sanitizer import _sanitize_html
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_MAX_SIZE = 1024 * 1024
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+RSS1 = '{http://purl.org/rss/1.0/}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+CONTENT = '{http://purl.org/rss/1.0/modules/content/}'
+RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+
+# Tags that start a new entry (RSS 2.0, RSS 1.0/RDF, Atom)
+ENTRY_TAGS = {'item', f'{RSS1}item', f'{ATOM}entry'}
+
+# Element tag -> entry field, first match wins. 'content' only stands in
+# for a missing summary, as in feedparser.
+FIELD_TAGS = {
+    'title': ('title', f'{RSS1}title', f'{ATOM}title'),
+    'link': ('link', f'{RSS1}link'),
+    'summary': ('description', f'{RSS1}description', f'{ATOM}summary'),
+    'content': (f'{ATOM}content', f'{CONTENT}encoded'),
+    'author': ('author', f'{DC}creator'),
+    'published': ('pubDate', f'{ATOM}published'),
+    'updated': (f'{ATOM}updated', f'{DC}date'),
+    'id': ('guid', f'{ATOM}id'),
+}
+_TAG_TO_FIELD = {tag: field for field, tags in FIELD_TAGS.items() for tag in tags}
+
+# Fields feedparser sanitizes when they hold HTML
+HTML_FIELDS = {'title', 'summary', 'content'}
+
+# Atom type attribute -> MIME type (anything else is already one)
+ATOM_TYPES = {'text': 'text/plain', 'html': 'text/html', 'xhtml': 'application/xhtml+xml'}
+HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+
+
+def _text(elem: ET.Element) -> str | None:
+    """All text inside an element, stripped (None if empty)."""
+    text = ''.join(elem.itertext()).strip()
+    return text or None
+
+
+def _xhtml(elem: ET.Element) -> str | None:
+    """Markup inside an Atom type="xhtml" element's <div>, namespaces dropped."""
+    div = elem[0] if len(elem) else elem
+    for node in div.iter():
+        if isinstance(node.tag, str):
+            node.tag = node.tag.rpartition('}')[2]
+    markup = (div.text or '') + ''.join(ET.tostring(child, encoding='unicode') for child in div)
+    return markup.strip() or None
+
+
+def _content_type(elem: ET.Element, field: str) -> str:
+    """MIME type feedparser gives a field's element."""
+    if elem.tag.startswith(ATOM):
+        kind = elem.get('type', 'text').lower()
+        return ATOM_TYPES.get(kind, kind)
+    # RSS descriptions and content:encoded are HTML, titles are plain text
+    return 'text/plain' if field == 'title' else 'text/html'
+
+
+def _field_value(elem: ET.Element, field: str) -> str | None:
+    """Text of a field element, sanitized the way feedparser does."""
+    if field not in HTML_FIELDS:
+        return _text(elem)
+
+    content_type = _content_type(elem, field)
+    if content_type == 'application/xhtml+xml':
+        value = _xhtml(elem)
+    else:
+        value = _text(elem)
+        # feedparser's guess for nominally plain RSS fields that hold HTML
+        if value and content_type == 'text/plain' and not elem.tag.startswith(ATOM) \
+                and _FeedParserMixin.looks_like_html(value):
+            content_type = 'text/html'
+
+    if value and content_type in HTML_TYPES:
+        value = _sanitize_html(value, 'utf-8', content_type) or None
+    return value
+
+
+def _entry_from_element(elem: ET.Element) -> dict:
+    """Build an entry dict from a finished <item>/<entry> element."""
+    entry: dict = {}
+    guid_is_link = False
+
+    # RSS 1.0 items are identified by their rdf:about (never used as the link)
+    about = elem.get(f'{RDF}about')
+    if about:
+        entry['id'] = about
+
+    for child in elem:
+        tag = child.tag
+
+        # Atom links live in attributes; the alternate one is the article
+        if tag == f'{ATOM}link':
+            if child.get('rel', 'alternate') == 'alternate' and 'link' not in entry:
+                entry['link'] = child.get('href')
+            continue
+
+        # Atom author: <author><name>...</name></author>
+        if tag == f'{ATOM}author':
+            name = child.find(f'{ATOM}name')
+            if name is not None and 'author' not in entry:
+                entry['author'] = _text(name)
+            continue
+
+        field = _TAG_TO_FIELD.get(tag)
+        if field and field not in entry:
+            value = _field_value(child, field)
+            if value:
+                entry[field] = value
+                if field == 'id':
+                    # feedparser: a GUID is a permalink unless it says otherwise
+                    permalink = next((v for k, v in child.attrib.items() if k.lower() == 'ispermalink'), 'true')
+                    guid_is_link = permalink == 'true'
+
+    content = entry.pop('content', None)
+    if content and 'summary' not in entry:
+        entry['summary'] = content
+    if guid_is_link and not entry.get('link'):
+        entry['link'] = entry['id']
+    return entry
+
+
+def _chunks(content: bytes) -> Iterator[bytes]:
+    """Split a body into parser-sized chunks."""
+    view = memoryview(content)
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield view[start:start + CHUNK_SIZE]
+
+
+def _stream_entries(chunks: Iterable[bytes], spool: IO[bytes] | None = None) -> Iterator[dict]:
+    """
+    Yield entries as the parser finishes them (raises ET.ParseError).
+
+    Every chunk fed to the parser is also written to `spool`, if given.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack: list[ET.Element] = []
+
+    def drain() -> Iterator[dict]:
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag in ENTRY_TAGS:
+                yield _entry_from_element(elem)
+                # Detach the finished entry so the tree never grows
+                if stack:
+                    stack[-1].remove(elem)
+                elem.clear()
+
+    for chunk in chunks:
+        if spool is not None:
+            spool.write(chunk)
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def _iter_with_fallback(
+    chunks: Iterator[bytes],
+    body: Callable[[], Any],
+    spool: IO[bytes] | None = None,
+) -> Iterator[dict]:
+    """
+    Stream entries, handing the rest of the feed to feedparser if the XML is malformed.
+
+    `body` returns the whole feed (bytes or a file) for feedparser.
+    """
+    yielded = 0
+    try:
+        for entry in _stream_entries(chunks, spool):
+            yielded += 1
+            yield entry
+    except ET.ParseError as e:
+        logger.warning(f"Streaming parse failed after {yielded} entries ({e}), falling back to feedparser")
+        # feedparser keeps document order, so skip what was already yielded
+        yield from feedparser.parse(body()).entries[yielded:]
+
+
+def iter_entries(content: bytes | Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yield feed entries one at a time.
+
+    Args:
+        content: Raw feed bytes, or an iterable of body chunks (e.g. a
+            streamed response's iter_content) consumed as parsing goes
+
+    Yields:
+        Entry dicts (title, link, summary, author, published, updated, id)
+    """
+    if isinstance(content, (bytes, bytearray)):
+        yield from _iter_with_fallback(_chunks(content), lambda: content)
+        return
+
+    chunks = iter(content)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        def spooled_body() -> IO[bytes]:
+            # Whatever the XML parser never got is still in the stream
+            for chunk in chunks:
+                spool.write(chunk)
+            spool.seek(0)
+            return spool
+
+        yield from _iter_with_fallback(chunks, spooled_body, spool)
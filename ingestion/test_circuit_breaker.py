@@ -0,0 +1,100 @@
+"""Test circuit breaker transitions (open, half-open probe, cooldown doubling)."""
+from datetime import datetime, timedelta
+from ingestion.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, blocked_until, breaker_status, host_of, record_failure, record_success,
+)
+
+NOW = datetime(2026, 10, 16, 12, 0)
+LIMITS = dict(threshold=3, base_cooldown=900, max_cooldown=86400)
+
+
+def test_host_of():
+    assert host_of('https://Feeds.BBCI.co.uk/news/rss.xml') == 'feeds.bbci.co.uk'
+    assert host_of('not a url') == ''
+
+
+def test_stays_closed_below_threshold():
+    breaker = record_failure(None, 2, NOW, **LIMITS)
+    assert breaker == {'breaker_state': CLOSED, 'breaker_open_until': None, 'breaker_trips': 0}
+    assert breaker_status(breaker, NOW) == CLOSED
+
+
+def test_opens_at_threshold():
+    breaker = record_failure(None, 3, NOW, **LIMITS)
+    assert breaker['breaker_state'] == OPEN
+    assert breaker['breaker_open_until'] == NOW + timedelta(seconds=900)
+    assert breaker['breaker_trips'] == 1
+    assert breaker_status(breaker, NOW + timedelta(seconds=899)) == OPEN
+
+
+def test_half_open_after_cooldown():
+    breaker = record_failure(None, 3, NOW, **LIMITS)
+    assert breaker_status(breaker, NOW + timedelta(seconds=900)) == HALF_OPEN
+    assert breaker_status({'breaker_state': OPEN, 'breaker_open_until': None}, NOW) == HALF_OPEN
+
+
+def test_failed_probe_reopens_with_doubled_cooldown():
+    breaker = record_failure(None, 3, NOW, **LIMITS)
+    later = NOW + timedelta(seconds=900)
+    # One more failure after the cooldown re-trips at once, threshold or not
+    breaker = record_failure(breaker, 1, later, **LIMITS)
+    assert breaker['breaker_state'] == OPEN
+    assert breaker['breaker_trips'] == 2
+    assert breaker['breaker_open_until'] == later + timedelta(seconds=1800)
+
+
+def test_cooldown_capped():
+    breaker = {'breaker_state': OPEN, 'breaker_open_until': NOW, 'breaker_trips': 20}
+    breaker = record_failure(breaker, 1, NOW, **LIMITS)
+    assert breaker['breaker_open_until'] == NOW + timedelta(seconds=86400)
+
+
+def test_success_closes_and_resets_trips():
+    assert record_success() == {'breaker_state': CLOSED, 'breaker_open_until': None, 'breaker_trips': 0}
+    assert breaker_status(None, NOW) == CLOSED
+
+
+def test_blocked_by_open_source_breaker():
+    until = NOW + timedelta(minutes=5)
+    source = {'url': 'https://a.example/rss', 'state': {'breaker_state': OPEN, 'breaker_open_until': until}}
+    assert blocked_until(source, {}, set(), NOW) == until
+
+
+def test_blocked_by_open_host_breaker():
+    until = NOW + timedelta(minutes=5)
+    host_breakers = {'a.example': {'breaker_state': OPEN, 'breaker_open_until': until}}
+    assert blocked_until({'url': 'https://a.example/rss'}, host_breakers, set(), NOW) == until
+    assert blocked_until({'url': 'https://b.example/rss'}, host_breakers, set(), NOW) is None
+
+
+def test_one_probe_per_half_open_host():
+    host_breakers = {'a.example': {'breaker_state': OPEN, 'breaker_open_until': NOW}}
+    probing = set()
+    assert blocked_until({'url': 'https://a.example/one'}, host_breakers, probing, NOW) is None
+    assert probing == {'a.example'}
+    assert blocked_until({'url': 'https://a.example/two'}, host_breakers, probing, NOW) == NOW
+
+
+def test_probe_claimed_across_workers():
+    # Two workers, each with its own run-local probing set, share the claim
+    host_breakers = {'a.example': {'breaker_state': OPEN, 'breaker_open_until': NOW}}
+    claimed = set()
+
+    def claim_probe(host):
+        if host in claimed:
+            return False
+        claimed.add(host)
+        return True
+
+    first = blocked_until({'url': 'https://a.example/one'}, host_breakers, set(), NOW, claim_probe)
+    second = blocked_until({'url': 'https://a.example/two'}, host_breakers, set(), NOW, claim_probe)
+    assert first is None
+    assert second == NOW
+
+
+def test_probe_claim_only_for_half_open_hosts():
+    calls = []
+    claim_probe = lambda host: calls.append(host) or True
+    host_breakers = {'a.example': {'breaker_state': CLOSED, 'breaker_open_until': None}}
+    assert blocked_until({'url': 'https://a.example/rss'}, host_breakers, set(), NOW, claim_probe) is None
+    assert calls == []
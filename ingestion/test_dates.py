@@ -0,0 +1,70 @@
+"""Test feed date parsing (fast paths, zones, fallback)."""
+from datetime import datetime, timezone
+import pytest
+from ingestion.dates import _parse_iso8601, _parse_rfc822, parse_feed_date
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('Fri, 16 Oct 2026 21:14:07 GMT', utc(2026, 10, 16, 21, 14, 7)),
+    ('Fri, 16 Oct 2026 21:14:07 +0000', utc(2026, 10, 16, 21, 14, 7)),
+    ('Fri, 16 Oct 2026 17:14:07 -0400', utc(2026, 10, 16, 21, 14, 7)),
+    ('Sat, 17 Oct 2026 02:44:07 +0530', utc(2026, 10, 16, 21, 14, 7)),
+    ('Fri, 16 Oct 2026 14:14:07 PDT', utc(2026, 10, 16, 21, 14, 7)),
+    ('16 Oct 2026 21:14 GMT', utc(2026, 10, 16, 21, 14, 0)),        # No weekday, no seconds
+    ('Fri, 16 October 2026 21:14:07 GMT', utc(2026, 10, 16, 21, 14, 7)),
+    ('Fri, 16 Oct 26 21:14:07 GMT', utc(2026, 10, 16, 21, 14, 7)),   # Two-digit year
+    ('Thu, 16 Oct 97 21:14:07 GMT', utc(1997, 10, 16, 21, 14, 7)),
+    ('Fri, 16 Oct 2026 21:14:07', utc(2026, 10, 16, 21, 14, 7)),     # No zone: UTC
+])
+def test_rfc822_fast_path(value, expected):
+    assert _parse_rfc822(value) == expected
+    assert parse_feed_date(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-10-16T17:14:07-04:00', utc(2026, 10, 16, 21, 14, 7)),
+    ('2026-10-16T21:14:07Z', utc(2026, 10, 16, 21, 14, 7)),
+    ('2026-10-16T21:14:07.250+00:00', utc(2026, 10, 16, 21, 14, 7, 250000)),
+    ('2026-10-16T21:14:07', utc(2026, 10, 16, 21, 14, 7)),           # No zone: UTC
+    ('2026-10-16', utc(2026, 10, 16)),
+])
+def test_iso8601_fast_path(value, expected):
+    assert _parse_iso8601(value) == expected
+    assert parse_feed_date(value) == expected
+
+
+def test_fast_paths_decline_other_shapes():
+    assert _parse_iso8601('Fri, 16 Oct 2026 21:14:07 GMT') is None
+    assert _parse_rfc822('2026-10-16T21:14:07Z') is None
+    assert _parse_rfc822('Fri, 16 Foo 2026 21:14:07 GMT') is None    # Unknown month
+    assert _parse_rfc822('Fri, 16 Oct 2026 21:14:07 XYZ') is None    # Unknown zone
+    assert _parse_rfc822('Sat, 31 Feb 2026 21:14:07 GMT') is None    # Invalid day
+
+
+def test_fallback_to_dateutil():
+    assert parse_feed_date('October 16, 2026 9:14 PM') == utc(2026, 10, 16, 21, 14)
+    assert parse_feed_date('2026/10/16 17:14:07 -0400') == utc(2026, 10, 16, 21, 14, 7)
+
+
+def test_results_are_aware_utc():
+    parsed = parse_feed_date('2026-10-17T02:44:07+05:30')
+    assert parsed.tzinfo == timezone.utc
+    assert parsed == utc(2026, 10, 16, 21, 14, 7)
+
+
+def test_unparseable_raises_value_error():
+    with pytest.raises(ValueError):
+        parse_feed_date('not a date')
+    with pytest.raises(ValueError):
+        parse_feed_date('Sat, 31 Feb 2026 21:14:07 GMT')
+
+
+def test_memoized():
+    parse_feed_date.cache_clear()
+    parse_feed_date('Fri, 16 Oct 2026 21:14:07 GMT')
+    parse_feed_date('Fri, 16 Oct 2026 21:14:07 GMT')
+    assert parse_feed_date.cache_info().hits == 1
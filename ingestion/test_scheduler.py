@@ -0,0 +1,81 @@
+"""Test the adaptive poll schedule (rate smoothing, backoff, clamping)."""
+from datetime import datetime, timedelta
+import pytest
+from ingestion.scheduler import QUIET_BACKOFF, next_poll
+
+NOW = datetime(2026, 10, 16, 12, 0)
+BOUNDS = dict(default_interval=3600, min_interval=300, max_interval=21600, target_new=3.0, smoothing=0.3)
+
+
+def poll(state, new_articles=0, failed=False, **overrides):
+    return next_poll(state, new_articles, failed, NOW, **{**BOUNDS, **overrides})
+
+
+def test_new_source_starts_from_observed_rate():
+    # No history: the default interval is taken as the elapsed time
+    result = poll(None, new_articles=6)
+    assert result['publish_rate'] == pytest.approx(6.0)
+    assert result['poll_interval'] == 1800      # 3 articles at 6/hour
+    assert result['consecutive_failures'] == 0
+    assert result['last_polled_at'] == NOW
+    assert result['next_poll_at'] == NOW + timedelta(seconds=1800)
+
+
+def test_rate_is_smoothed():
+    state = {'poll_interval': 3600, 'publish_rate': 2.0, 'last_polled_at': NOW - timedelta(hours=2)}
+    result = poll(state, new_articles=20)       # Observed 10/hour
+    assert result['publish_rate'] == pytest.approx(0.3 * 10 + 0.7 * 2.0)
+    assert result['poll_interval'] == int(3600 * 3.0 / result['publish_rate'])
+
+
+def test_quiet_poll_backs_off():
+    state = {'poll_interval': 3600, 'publish_rate': 1.0, 'last_polled_at': NOW - timedelta(hours=1)}
+    result = poll(state, new_articles=0)
+    assert result['poll_interval'] == int(3600 * QUIET_BACKOFF)
+    assert result['publish_rate'] == pytest.approx(0.7)
+
+
+def test_failure_leaves_rate_state_alone():
+    last_success = NOW - timedelta(minutes=20)
+    state = {'poll_interval': 1200, 'publish_rate': 4.0, 'consecutive_failures': 1, 'last_polled_at': last_success}
+    result = poll(state, failed=True)
+    # Retried one interval later; backing off is the breakers' job
+    assert result['poll_interval'] == 1200
+    assert result['next_poll_at'] == NOW + timedelta(seconds=1200)
+    assert result['publish_rate'] == 4.0
+    assert result['last_polled_at'] == last_success
+    assert result['consecutive_failures'] == 2
+
+
+def test_success_after_failures_counts_the_whole_gap():
+    # Two hours since the last success, the failed polls in between don't shorten it
+    state = {'poll_interval': 3600, 'publish_rate': 2.0, 'last_polled_at': NOW - timedelta(hours=2)}
+    for _ in range(2):
+        state = poll(state, failed=True)
+    result = poll(state, new_articles=4)
+    assert result['publish_rate'] == pytest.approx(0.3 * 2.0 + 0.7 * 2.0)
+    assert result['last_polled_at'] == NOW
+
+
+def test_success_resets_failures():
+    state = {'poll_interval': 4800, 'publish_rate': 4.0, 'consecutive_failures': 3,
+             'last_polled_at': NOW - timedelta(hours=1)}
+    assert poll(state, new_articles=4)['consecutive_failures'] == 0
+
+
+def test_clamped_to_min_interval():
+    state = {'poll_interval': 600, 'publish_rate': 500.0, 'last_polled_at': NOW - timedelta(minutes=10)}
+    assert poll(state, new_articles=100)['poll_interval'] == 300
+
+
+def test_clamped_to_max_interval():
+    state = {'poll_interval': 20000, 'publish_rate': 0.01, 'last_polled_at': NOW - timedelta(hours=6)}
+    assert poll(state, new_articles=0)['poll_interval'] == 21600
+    state['poll_interval'] = 30000            # Stored before max_interval was lowered
+    assert poll(state, failed=True)['poll_interval'] == 21600
+
+
+def test_very_short_elapsed_time_is_bounded():
+    # Two polls a second apart don't turn 1 article into 3600/hour
+    state = {'poll_interval': 300, 'publish_rate': None, 'last_polled_at': NOW - timedelta(seconds=1)}
+    assert poll(state, new_articles=1)['publish_rate'] == pytest.approx(60.0)
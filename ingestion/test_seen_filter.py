@@ -0,0 +1,136 @@
+"""Test the seen-URL Bloom filter (sizing, false positive rate, screening)."""
+import math
+import random
+import pytest
+from ingestion.seen_filter import BloomFilter, SeenUrlFilter
+
+
+def random_keys(count: int, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) - 2 ** 63 for _ in range(count)]  # Signed, like url_hash
+
+
+@pytest.mark.parametrize('capacity, error_rate', [(1000, 0.01), (100_000, 0.001), (2_000_000, 0.001)])
+def test_sizing(capacity, error_rate):
+    bloom = BloomFilter(capacity, error_rate)
+    # Optimal m = -n ln p / (ln 2)^2 and k = m/n ln 2
+    assert bloom.num_bits == math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    assert bloom.num_hashes == round(bloom.num_bits / capacity * math.log(2))
+    assert bloom.nbytes == (bloom.num_bits + 7) // 8
+    # ~1.8 MB per million URLs at 0.1%
+    if error_rate == 0.001:
+        assert bloom.nbytes / capacity * 1e6 == pytest.approx(1.8e6, rel=0.01)
+
+
+def test_tiny_filter_has_a_floor():
+    bloom = BloomFilter(1, 0.5)
+    assert bloom.num_bits >= 64
+    assert bloom.num_hashes >= 1
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(10_000, 0.01)
+    keys = random_keys(10_000, seed=1)
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 10_000
+
+
+def test_false_positive_rate_at_capacity():
+    bloom = BloomFilter(20_000, 0.01)
+    for key in random_keys(20_000, seed=2):
+        bloom.add(key)
+    probes = random_keys(50_000, seed=3)
+    rate = sum(key in bloom for key in probes) / len(probes)
+    assert rate < 0.015
+
+
+def make_filter(stored: set, sample_rate: float = 1.0, check=None) -> SeenUrlFilter:
+    seen_filter = SeenUrlFilter(1000, 0.01, sample_rate, check or (lambda hashes: set(hashes) & stored))
+    seen_filter.warm(stored)
+    return seen_filter
+
+
+def test_screen_drops_stored_rows():
+    seen_filter = make_filter({101, 102}, sample_rate=0.0)
+    rows = [(1, 'a', 101), (1, 'b', 102), (2, 'c', 103)]
+    keep, dropped = seen_filter.screen(rows, hash_index=2)
+    assert keep == [(2, 'c', 103)]
+    assert dropped == {1: 2}
+    stats = seen_filter.stats()
+    assert (stats['checked'], stats['hits'], stats['hit_rate']) == (3, 2, pytest.approx(2 / 3))
+
+
+def test_sampled_false_positive_is_written():
+    seen_filter = make_filter({101})
+    seen_filter.remember([102])             # In the filter, not in the database
+    keep, dropped = seen_filter.screen([(1, 'a', 101), (1, 'b', 102)], hash_index=2)
+    assert keep == [(1, 'b', 102)]
+    assert dropped == {1: 1}
+    assert (seen_filter.sampled, seen_filter.false_positives) == (2, 1)
+
+
+def test_failed_sample_check_is_not_counted():
+    def broken(hashes):
+        raise ConnectionError("database down")
+
+    seen_filter = make_filter({101, 102}, check=broken)
+    keep, dropped = seen_filter.screen([(1, 'a', 101), (1, 'b', 102)], hash_index=2)
+    # The sample is written (nothing is lost), but not reported as false positives
+    assert sorted(keep) == [(1, 'a', 101), (1, 'b', 102)]
+    assert dropped == {}
+    assert (seen_filter.sampled, seen_filter.false_positives) == (0, 0)
+
+
+def test_reset_stats_keeps_content():
+    seen_filter = make_filter({101}, sample_rate=0.0)
+    seen_filter.screen([(1, 'a', 101)], hash_index=2)
+    seen_filter.reset_stats()
+    assert seen_filter.stats()['checked'] == 0
+    assert 101 in seen_filter.bloom
+
+
+@pytest.fixture
+def stored_urls(monkeypatch):
+    """Stand-in article_urls and url_release_state for get_seen_filter()."""
+    import database.utils
+    from ingestion import seen_filter as module
+
+    db = {'urls': {101, 102}, 'generation': 0}
+    monkeypatch.setattr(database.utils, 'iter_recent_url_hashes', lambda days: iter(sorted(db['urls'])))
+    monkeypatch.setattr(database.utils, 'get_existing_url_hashes', lambda hashes: set(hashes) & db['urls'])
+    monkeypatch.setattr(database.utils, 'get_url_release_generation', lambda: db['generation'])
+    monkeypatch.setattr(module.get_settings(), 'seen_filter_enabled', True)
+    monkeypatch.setattr(module.get_settings(), 'seen_filter_sample_rate', 0.0)
+    monkeypatch.setattr(module, '_filter', None)
+    return db
+
+
+def test_filter_is_reused_while_no_url_is_released(stored_urls):
+    from ingestion.seen_filter import get_seen_filter
+    assert get_seen_filter() is get_seen_filter()
+
+
+def test_released_urls_rebuild_the_filter(stored_urls):
+    from ingestion.seen_filter import get_seen_filter
+    rows = [(1, 'a', 101), (1, 'b', 102)]
+    assert get_seen_filter().screen(rows, hash_index=2)[0] == []
+
+    # The source's articles are deleted, then it is added back and scraped
+    stored_urls['urls'].clear()
+    stored_urls['generation'] += 1
+    keep, dropped = get_seen_filter().screen(rows, hash_index=2)
+    assert keep == rows
+    assert dropped == {}
+
+
+def test_generation_check_failure_disables_the_filter(stored_urls, monkeypatch):
+    import database.utils
+    from ingestion.seen_filter import get_seen_filter
+
+    def broken():
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(database.utils, 'get_url_release_generation', broken)
+    assert get_seen_filter() is None
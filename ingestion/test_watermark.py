@@ -0,0 +1,57 @@
+"""Test the incremental-scrape watermark (advance, GUID memory, clock cap)."""
+from datetime import datetime, timedelta, timezone
+from ingestion.watermark import advance_watermark, published_cutoff
+
+NOW = datetime(2026, 10, 16, 12, 0)
+SKEW = 15
+
+
+def article(published_at):
+    return {'published_at': published_at}
+
+
+def test_advances_to_newest_article_in_naive_utc():
+    articles = [article(datetime(2026, 10, 16, 9, 0, tzinfo=timezone.utc)),
+                article(datetime(2026, 10, 16, 7, 30, tzinfo=timezone(timedelta(hours=-4))))]   # 11:30 UTC
+    watermark = advance_watermark(None, ['b', 'a'], articles, 10, SKEW, now=NOW)
+    assert watermark['last_published_at'] == datetime(2026, 10, 16, 11, 30)
+    assert watermark['recent_guids'] == ['b', 'a']
+
+
+def test_never_moves_back():
+    previous = {'last_published_at': datetime(2026, 10, 16, 11, 0), 'recent_guids': ['a']}
+    watermark = advance_watermark(previous, ['b'], [article(datetime(2026, 10, 15))], 10, SKEW, now=NOW)
+    assert watermark['last_published_at'] == datetime(2026, 10, 16, 11, 0)
+    assert watermark['recent_guids'] == ['b', 'a']
+
+
+def test_guids_are_deduplicated_and_bounded():
+    previous = {'last_published_at': None, 'recent_guids': ['c', 'b', 'a']}
+    watermark = advance_watermark(previous, ['d', 'c', None], [], 3, SKEW, now=NOW)
+    assert watermark['recent_guids'] == ['d', 'c', 'b']
+
+
+def test_future_dated_entry_is_capped_at_now_plus_skew():
+    future = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)     # Three days ahead
+    watermark = advance_watermark(None, ['x'], [article(future)], 10, SKEW, now=NOW)
+    assert watermark['last_published_at'] == NOW + timedelta(minutes=SKEW)
+
+    # The next poll still extracts an entry published an hour ago
+    assert published_cutoff(watermark, 24, SKEW, now=NOW) < NOW - timedelta(hours=1)
+
+
+def test_entry_within_skew_is_kept():
+    ahead = NOW + timedelta(minutes=5)
+    assert advance_watermark(None, [], [article(ahead)], 10, SKEW, now=NOW)['last_published_at'] == ahead
+
+
+def test_watermark_stored_ahead_is_capped_when_read():
+    # Stored before the cap existed: three days ahead of the clock
+    stored = {'last_published_at': datetime(2026, 10, 19, 12, 0), 'recent_guids': []}
+    assert published_cutoff(stored, 24, SKEW, now=NOW) == NOW + timedelta(minutes=SKEW) - timedelta(hours=24)
+    assert advance_watermark(stored, [], [], 10, SKEW, now=NOW)['last_published_at'] == NOW + timedelta(minutes=SKEW)
+
+
+def test_no_watermark_no_cutoff():
+    assert published_cutoff(None, 24, SKEW) is None
+    assert published_cutoff({'last_published_at': None}, 24, SKEW) is None
@@ -2,7 +2,13 @@
 import requests
 import feedparser
 import logging
-from typing import Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from config import get_settings
+from ingestion.http_client import get_http_session
+
+settings = get_settings()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -118,11 +124,8 @@ def validate_feed_url(url: str, timeout: int = 10) -> tuple[bool, str, int]:
         - item_count: Number of items in feed (0 if invalid)
     """
     try:
-        # Fetch with requests (with User-Agent to avoid blocks)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; KirikouBot/1.0)'
-        }
-        response = requests.get(url, headers=headers, timeout=timeout)
+        # Fetch through the pooled session (sends the KirikouBot User-Agent)
+        response = get_http_session().get(url, timeout=timeout)
         
         # Check HTTP status
         if response.status_code != 200:
@@ -159,12 +162,60 @@ def validate_feed_url(url: str, timeout: int = 10) -> tuple[bool, str, int]:
         return False, f"Error: {str(e)[:50]}", 0
 
 
-def validate_all_feeds(feeds_dict: Dict) -> Dict:
+def check_feed(url: str, timeout: int = 10) -> Dict:
+    """
+    Validate one feed URL and time the check.
+    
+    Args:
+        url: Feed URL to validate
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Dictionary with url, valid, reason, item_count and latency_ms
+    """
+    start = time.perf_counter()
+    is_valid, reason, item_count = validate_feed_url(url, timeout)
+    return {
+        'url': url,
+        'valid': is_valid,
+        'reason': reason,
+        'item_count': item_count,
+        'latency_ms': round((time.perf_counter() - start) * 1000),
+    }
+
+
+def check_feeds(urls: List[str], timeout: int = 10, max_workers: int | None = None) -> List[Dict]:
+    """
+    Validate many feed URLs concurrently.
+    
+    Checks run on a bounded thread pool, so the total time is roughly
+    that of the slowest batch instead of the sum of every check.
+    
+    Args:
+        urls: Feed URLs to validate
+        timeout: Request timeout per feed in seconds
+        max_workers: Checks in flight at once (default: settings.validate_workers)
+        
+    Returns:
+        List of check_feed() results, in the same order as `urls`
+    """
+    if not urls:
+        return []
+    workers = max(1, min(max_workers or settings.validate_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='validate') as executor:
+        return list(executor.map(lambda url: check_feed(url, timeout), urls))
+
+
+def validate_all_feeds(feeds_dict: Dict, max_workers: int | None = None) -> Dict:
     """
     Validate all feeds in dictionary and return only valid ones.
     
+    Feeds are checked concurrently (see check_feeds); valid ones get
+    validated_item_count and validated_latency_ms added.
+    
     Args:
         feeds_dict: Dictionary of feeds to validate
+        max_workers: Checks in flight at once (default: settings.validate_workers)
         
     Returns:
         Dictionary containing only valid feeds
@@ -176,22 +227,22 @@ def validate_all_feeds(feeds_dict: Dict) -> Dict:
     logger.info(f"🔍 Validating {total} RSS Feeds")
     logger.info(f"{'='*70}\n")
     
-    for i, (domain, feed_info) in enumerate(feeds_dict.items(), 1):
-        name = feed_info['name']
-        url = feed_info['url']
-        
-        logger.info(f"[{i}/{total}] Testing {name}...")
-        logger.info(f"       URL: {url}")
-        
-        is_valid, reason, item_count = validate_feed_url(url)
+    start = time.perf_counter()
+    checks = check_feeds([info['url'] for info in feeds_dict.values()], max_workers=max_workers)
+    
+    for i, ((domain, feed_info), check) in enumerate(zip(feeds_dict.items(), checks), 1):
+        logger.info(f"[{i}/{total}] {feed_info['name']} ({check['latency_ms']} ms)")
+        logger.info(f"       URL: {check['url']}")
         
-        if is_valid:
-            logger.info(f"       ✅ VALID - {reason}\n")
+        if check['valid']:
+            logger.info(f"       ✅ VALID - {check['reason']}\n")
             valid_feeds[domain] = feed_info
-            valid_feeds[domain]['validated_item_count'] = item_count
+            valid_feeds[domain]['validated_item_count'] = check['item_count']
+            valid_feeds[domain]['validated_latency_ms'] = check['latency_ms']
         else:
-            logger.info(f"       ❌ INVALID - {reason}\n")
+            logger.info(f"       ❌ INVALID - {check['reason']}\n")
     
+    logger.info(f"Checked {total} feeds in {time.perf_counter() - start:.1f}s")
     return valid_feeds
 
 
@@ -214,7 +265,8 @@ def print_summary(original_count: int, valid_feeds: Dict):
         logger.info("-" * 70)
         for domain, info in valid_feeds.items():
             item_count = info.get('validated_item_count', '?')
-            logger.info(f"  • {info['name']} ({domain})")
+            latency = info.get('validated_latency_ms', '?')
+            logger.info(f"  • {info['name']} ({domain}, {latency} ms)")
             logger.info(f"    {info['url']}")
             logger.info(f"    Articles: {item_count} | Country: {info['country']} | "
                        f"Leaning: {info['political_leaning']}\n")
@@ -241,8 +293,8 @@ if __name__ == "__main__":
         
         print("VALID_FEEDS = {")
         for domain, info in valid_feeds.items():
-            # Remove the validated_item_count field for clean output
-            clean_info = {k: v for k, v in info.items() if k != 'validated_item_count'}
+            # Remove the validated_* fields for clean output
+            clean_info = {k: v for k, v in info.items() if not k.startswith('validated_')}
             
             print(f"    '{domain}': {{")
             for key, value in clean_info.items():
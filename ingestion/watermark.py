@@ -0,0 +1,86 @@
+"""
+Per-source high-water mark for incremental scraping.
+
+A watermark remembers, for one source:
+- last_published_at: newest publication time seen so far (naive UTC)
+- recent_guids: bounded list of recent entry GUIDs/URLs, newest first
+
+Entries whose GUID is already known, or that are older than the
+watermark minus a lookback window, are skipped before they are turned
+into article dicts, so only genuinely new entries reach the database.
+
+The watermark never runs ahead of the clock by more than a small skew
+allowance: one future-dated entry (or a mis-parsed offset) would
+otherwise make every genuinely new entry look old until real time
+caught up.
+"""
+from datetime import datetime, timedelta, timezone
+from database.utils import to_naive_utc
+
+
+def entry_key(entry) -> str | None:
+    """Stable identity of a feed entry: its GUID, falling back to its link."""
+    return entry.get('id') or entry.get('link')
+
+
+def latest_plausible(max_skew_minutes: int, now: datetime | None = None) -> datetime:
+    """Latest publication time a watermark may hold (naive UTC): now plus the skew allowance."""
+    now = to_naive_utc(now or datetime.now(timezone.utc))
+    return now + timedelta(minutes=max_skew_minutes)
+
+
+def published_cutoff(watermark: dict | None, lookback_hours: int, max_skew_minutes: int,
+                     now: datetime | None = None) -> datetime | None:
+    """
+    Oldest publication time still worth extracting.
+
+    The lookback window tolerates feeds that publish slightly out of order.
+    A watermark stored ahead of the clock (before it was capped) counts as
+    now plus the skew allowance.
+    """
+    if not watermark or not watermark.get('last_published_at'):
+        return None
+    last_published_at = min(to_naive_utc(watermark['last_published_at']), latest_plausible(max_skew_minutes, now))
+    return last_published_at - timedelta(hours=lookback_hours)
+
+
+def advance_watermark(watermark: dict | None, keys: list, articles: list[dict], max_guids: int,
+                      max_skew_minutes: int, now: datetime | None = None) -> dict:
+    """
+    Compute the watermark to store after a successful scrape.
+
+    Args:
+        watermark: Previous watermark (or None)
+        keys: entry_key() of every entry in the feed that was just parsed
+        articles: Articles extracted from it
+        max_guids: Maximum number of GUIDs to remember
+        max_skew_minutes: How far ahead of now last_published_at may go
+        now: Current time (defaults to the clock)
+
+    Returns:
+        Dict with last_published_at and recent_guids
+    """
+    previous = watermark or {}
+
+    last_published_at = previous.get('last_published_at')
+    if last_published_at is not None:
+        last_published_at = to_naive_utc(last_published_at)
+    for article in articles:
+        published_at = to_naive_utc(article['published_at'])
+        if last_published_at is None or published_at > last_published_at:
+            last_published_at = published_at
+    if last_published_at is not None:
+        last_published_at = min(last_published_at, latest_plausible(max_skew_minutes, now))
+
+    # Current feed first (newest), then what we remembered before
+    recent_guids = []
+    seen = set()
+    for key in list(keys) + list(previous.get('recent_guids') or []):
+        if key and key not in seen:
+            seen.add(key)
+            recent_guids.append(key)
+
+    return {
+        'last_published_at': last_published_at,
+        'recent_guids': recent_guids[:max_guids],
+    }
@@ -1,5 +1,7 @@
 from celery import Celery
+from celery.signals import worker_process_shutdown
 from config import get_settings
+from ingestion.http_client import close_http_session
 
 settings = get_settings()
 
@@ -18,14 +20,33 @@ celery_app.conf.update(
     include=["worker.tasks"],
 )
 
-# Optional: Define periodic tasks (e.g., for regular RSS fetching)
+# Periodic tasks: each source is polled on its own adaptive interval
+# (see ingestion/scheduler.py); beat only looks for sources that are due
 celery_app.conf.beat_schedule = {
-    'scrape-every-hour': {
-        'task': 'scrape_all_sources',  # This should match the actual task name
-        'schedule': 3600,  # Every hour
+    'schedule-due-sources': {
+        'task': 'schedule_due_sources',  # This should match the actual task name
+        'schedule': settings.scheduler_tick,
+    },
+    # Fingerprint new articles, match near-duplicates and cluster stories
+    # (database/near_duplicates.py); scrapes also do this right after writing
+    'index-near-duplicates': {
+        'task': 'index_near_duplicates',
+        'schedule': settings.near_duplicate_interval,
+    },
+    # Create upcoming monthly articles partitions and retire expired ones
+    # (database/partitions.py)
+    'maintain-article-partitions': {
+        'task': 'maintain_article_partitions',
+        'schedule': settings.partition_maintenance_interval,
     },
 }
 
+@worker_process_shutdown.connect
+def _close_http_pool(**kwargs):
+    """Drop the worker process' pooled keep-alive connections on shutdown."""
+    close_http_session()
+
+
 if __name__ == "__main__":
     settings.setup_logging()  # Set up logging before starting the worker
     celery_app.start()
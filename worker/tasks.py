@@ -1,14 +1,84 @@
+from celery import chord
 from worker.celery_app import celery_app
-from ingestion.feed_parser import scrape_all_sources, scrape_source_by_id
+from config import get_settings
+from database.near_duplicates import index_new_articles
+from database.partitions import maintain_partitions
+from database.utils import claim_due_sources, get_all_sources_standalone
+from ingestion.feed_parser import (
+    scrape_source,
+    scrape_source_by_id,
+    log_scrape_summary,
+    new_scrape_result,
+)
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 @celery_app.task(name="scrape_all_sources")
 def scrape_all_sources_task():
-    """Celery task to scrape all sources."""
-    return scrape_all_sources()
+    """
+    Celery task to scrape all sources.
+
+    Fans out one `scrape_source` subtask per source (a group, so every
+    worker node takes a share) and aggregates their results in a chord
+    callback that logs the usual run summary.
+    """
+    source_ids = [source['id'] for source in get_all_sources_standalone()]
+    if not source_ids:
+        logger.warning("No sources to scrape")
+        return {'sources': 0, 'chord_id': None}
+
+    result = chord(
+        scrape_source_task.s(source_id) for source_id in source_ids
+    )(aggregate_scrape_results_task.s())
+    return {'sources': len(source_ids), 'chord_id': result.id}
+
+
+@celery_app.task(name="scrape_source")
+def scrape_source_task(source_id):
+    """Celery subtask: scrape one source and return its result dict."""
+    try:
+        return scrape_source(source_id)
+    except Exception as e:
+        # Never fail the chord: report the source as failed instead
+        logger.error(f"Scrape crashed for source ID {source_id}: {e}")
+        return new_scrape_result(f"source {source_id}", failed=True)
+
+
+@celery_app.task(name="aggregate_scrape_results")
+def aggregate_scrape_results_task(results):
+    """Chord callback: log the run summary and return the inserted total."""
+    results = [result for result in results if result]  # Sources deleted mid-run
+    log_scrape_summary(results, len(results))
+    return sum(result['inserted'] for result in results)
+
 
 @celery_app.task(name="scrape_source_by_id")
 def scrape_source_by_id_task(source_id):
     """Celery task to scrape a specific source by ID."""
     return scrape_source_by_id(source_id)
 
+
+@celery_app.task(name="schedule_due_sources")
+def schedule_due_sources_task():
+    """Celery task to dispatch a scrape for every source whose poll is due."""
+    # Hold the claim long enough for the queued scrape to run
+    lease = max(settings.scheduler_tick * 5, settings.request_timeout * 3)
+    source_ids = claim_due_sources(lease)
+    for source_id in source_ids:
+        scrape_source_by_id_task.delay(source_id)
+    return len(source_ids)
+
+
+@celery_app.task(name="index_near_duplicates")
+def index_near_duplicates_task():
+    """Celery task to fingerprint new articles and cluster them into stories (catches up on ingest-time runs)."""
+    return index_new_articles()
+
+
+@celery_app.task(name="maintain_article_partitions")
+def maintain_article_partitions_task():
+    """Celery task to create upcoming articles partitions and apply retention."""
+    return maintain_partitions()